@@ -1,71 +1,79 @@
 # scripts/0.2_dependency_analysis.py
 
+import sys
 import pandas as pd
 import networkx as nx
-import matplotlib.pyplot as plt
+from call_graph import app_dependencies, load_call_graph
+from dependency_graph import CondensedGraph, ReachabilityIndex
+from inventory_snapshot import load_inventory
 
-df = pd.read_csv('/mnt/user-data/uploads/AS400_Inventory_Detailed.csv')
+df = load_inventory()
+# Dependencies pre-split (and trimmed) at ingest, see inventory_snapshot.py
+dependency_lists = load_inventory(['Dependencies_List'])['Dependencies_List']
+
+# Extracted call graph (python call_graph.py) replaces the declared Dependencies of every
+# app whose source was scanned; apps without exported source keep the inventory column
+edges = load_call_graph(columns=['App_ID', 'Target', 'Target_Type', 'Edge_Type', 'Count'])
+scanned = set() if edges is None else set(edges['App_ID'])
 
 # Build dependency graph
 G = nx.DiGraph()
 
-for _, row in df.iterrows():
+for (_, row), deps in zip(df.iterrows(), dependency_lists):
     app_id = row['App_ID']
     G.add_node(app_id, **row.to_dict())
     
-    deps = row['Dependencies']
-    if deps and deps != '*ALL*':
-        for dep in deps.split(','):
-            G.add_edge(dep.strip(), app_id)
-
-# Check for cycles
-try:
-    cycles = list(nx.simple_cycles(G))
-    if cycles:
-        print(f"[ERROR] Circular dependencies detected: {cycles}")
-        exit(1)
-    else:
-        print("[OK] No circular dependencies")
-except:
-    pass
-
-# Topological sort (migration order)
-try:
-    topo_order = list(nx.topological_sort(G))
-    print("\n[Migration Order (dependencies first)]:")
-    for i, app in enumerate(topo_order, 1):
-        print(f"{i:2d}. {app}")
-except:
-    print("[ERROR] Graph contains cycles, cannot determine order")
-
-# Critical path (longest chain)
-longest_path = nx.dag_longest_path(G)
-print(f"\n[Critical Path]: {' -> '.join(longest_path)}")
-print(f"[Critical Path Length]: {len(longest_path)} applications")
+    if app_id not in scanned and deps is not None and list(deps) != ['*ALL*']:
+        for dep in deps:
+            G.add_edge(dep, app_id)
+
+if edges is not None:
+    extracted = app_dependencies(edges, load_inventory(['App_ID', 'DB2_Objects_List']))
+    for app_id, dep, edge_types in zip(extracted['App_ID'], extracted['Depends_On'], extracted['Edge_Types']):
+        G.add_edge(dep, app_id, edge_types=edge_types)
+    print(f"[Dependency Source]: call graph for {len(scanned)} apps ({len(extracted)} edges), "
+          f"inventory Dependencies for {(~df['App_ID'].isin(scanned)).sum()}\n")
+
+# Collapse circular dependencies into SCC super-nodes (linear time, see dependency_graph.py)
+cg = CondensedGraph(G)
+
+# Check for cycles (reported as SCC membership, not enumerated cycles)
+cycles = cg.cycles()
+if cycles:
+    print(f"[WARNING] {len(cycles)} circular dependency groups detected (migrate each group as one unit):")
+    for i, members in enumerate(cycles, 1):
+        print(f"  SCC {i} ({len(members)} apps): {', '.join(members)}")
+else:
+    print("[OK] No circular dependencies")
+
+# Topological sort (migration order) on the condensed DAG
+topo_order = cg.topological_order()
+print("\n[Migration Order (dependencies first)]:")
+for i, scc in enumerate(topo_order, 1):
+    print(f"{i:2d}. {cg.label(scc)}")
+
+# Critical path (longest chain, SCCs weighted by member count)
+longest_path = cg.critical_path()
+print(f"\n[Critical Path]: {' -> '.join(cg.label(scc) for scc in longest_path)}")
+print(f"[Critical Path Length]: {sum(len(cg.members(scc)) for scc in longest_path)} applications")
 
 # Wave assignment (group independent apps)
-waves = []
-remaining = set(G.nodes())
-
-wave_num = 1
-while remaining:
-    wave = []
-    for node in list(remaining):
-        predecessors = set(G.predecessors(node))
-        if predecessors.issubset(set(G.nodes()) - remaining):
-            wave.append(node)
-    
-    if not wave:
-        print(f"[ERROR] Cannot form wave {wave_num}, dependency issue")
-        break
-    
-    waves.append((wave_num, wave))
-    remaining -= set(wave)
-    wave_num += 1
+waves = cg.waves()
 
 print(f"\n[Migration Waves]: {len(waves)} waves identified")
-for wave_num, apps in waves:
-    print(f"Wave {wave_num}: {', '.join(apps)}")
+for wave_num, sccs in waves:
+    print(f"Wave {wave_num}: {', '.join(cg.label(scc) for scc in sccs)}")
+
+# Blast radius (transitive closure index - "if X slips, which apps are blocked?")
+reach = ReachabilityIndex(G)
+blocked = pd.Series(reach.blast_radius_sizes(), name='Apps_Blocked').sort_values(ascending=False)
+print("\n[Blast Radius (top 10 - apps blocked if this app slips)]")
+print(blocked.head(10).rename_axis('App_ID').reset_index().to_markdown(index=False))
+
+# Optional render: python 0.2_dependency_analysis.py --plot dependencies.png
+if '--plot' in sys.argv:
+    from dependency_plot import render_dependency_graph
+    print(f"\n[Dependency Graph]: {render_dependency_graph(G, sys.argv[sys.argv.index('--plot') + 1])}")
 
 # **Expected Critical Path:**
 
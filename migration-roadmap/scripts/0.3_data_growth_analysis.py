@@ -1,25 +1,21 @@
 # scripts/0.3_data_growth_analysis.py
-import pandas as pd
-import numpy as np
+import glob
 
-df = pd.read_csv('/mnt/user-data/uploads/AS400_Inventory_Detailed.csv')
+from inventory_snapshot import load_inventory
+from pipeline import upstream
+from disk_history import DISK_HISTORY_GLOB, app_growth, fit_history
+from growth_simulation import (DEFAULT_GROWTH_RATE, GROWTH_RATE_RANGES, Q4_SPIKE, expected_projection,
+                               growth_quantiles, rate_bounds, simulate_totals)
 
-# Synthetic historical growth (placeholder - requires actual disk usage logs)
-# Assumption: Linear growth scaled by business criticality + seasonal 15% spike Q4
-np.random.seed(42)
+df = load_inventory()
 
-growth_rates = {
-    'daily': np.random.uniform(0.08, 0.15, len(df)),    # 8-15% annual
-    'weekly': np.random.uniform(0.04, 0.08, len(df)),   # 4-8% annual
-    'monthly': np.random.uniform(0.02, 0.05, len(df))   # 2-5% annual
-}
-
-df['Annual_Growth_Rate'] = df['Usage_Frequency'].map(
-    lambda x: np.random.choice(growth_rates.get(x, [0.05]))
-)
-
-# 24-month projection
-df['Projected_Data_GB_24mo'] = df['Data_Volume_GB'] * (1 + df['Annual_Growth_Rate']) ** 2
+# Growth rates fitted from daily disk-usage exports (DSPFD / RTVDSKINF outfiles) where present,
+# see disk_history.py: per-object log-linear trend + annual seasonality, rolled up via DB2_Objects.
+# Apps without history fall back to synthetic growth scaled by usage frequency
+# (daily 8-15%, weekly 4-8%, monthly 2-5% annual) + seasonal 15% spike Q4.
+# Monte Carlo over growth paths, see growth_simulation.py
+N_SIMULATIONS = 100_000
+HORIZON_MONTHS = 24
 
 # Data temperature classification
 def classify_temperature(row):
@@ -40,30 +36,86 @@ storage_class_map = {
 }
 df['GCS_Storage_Class'] = df['Data_Temperature'].map(storage_class_map)
 
+# Central 24-month projection per app (mid-range annual rate, Q4 seasonality)
+df['Annual_Growth_Rate'] = df['Usage_Frequency'].map(
+    lambda x: sum(GROWTH_RATE_RANGES.get(x, (DEFAULT_GROWTH_RATE,) * 2)) / 2
+)
+df['Projected_Data_GB_24mo'] = expected_projection(df['Data_Volume_GB'], df['Usage_Frequency'], HORIZON_MONTHS)
+df['Growth_Source'] = 'SYNTHETIC'
+bounds = rate_bounds(df['Usage_Frequency'])
+q4_spike = Q4_SPIKE
+simulated_volume = df['Data_Volume_GB']
+
+# Fitted apps: trend + seasonality from history replace the synthetic rates; the Monte Carlo
+# draws their trend within its 95% CI and takes seasonality from the fit (no synthetic Q4 spike)
+history_files = sorted(glob.glob(DISK_HISTORY_GLOB))
+if history_files:
+    object_fits = fit_history(history_files)
+    fitted = app_growth(object_fits, load_inventory(['App_ID', 'DB2_Objects_List']), HORIZON_MONTHS)
+    fitted = fitted.reindex(df['App_ID']).set_axis(df.index)
+    has_history = fitted['Growth_Factor'].notna()
+    df.loc[has_history, 'Growth_Source'] = 'FITTED'
+    df.loc[has_history, 'Annual_Growth_Rate'] = fitted['Annual_Growth_Rate']
+    df.loc[has_history, 'Projected_Data_GB_24mo'] = df['Data_Volume_GB'] * fitted['Growth_Factor']
+    bounds = (fitted['Growth_Rate_Low'].where(has_history, bounds[0]),
+              fitted['Growth_Rate_High'].where(has_history, bounds[1]))
+    q4_spike = Q4_SPIKE * ~has_history
+    simulated_volume = df['Data_Volume_GB'] * fitted['Seasonal_Factor'].where(has_history, 1.0)
+
+# Monte Carlo: N_SIMULATIONS × apps × months growth paths → storage percentiles per tier
+tiers, totals = simulate_totals(
+    simulated_volume, df['Usage_Frequency'], df['Data_Temperature'],
+    n_sims=N_SIMULATIONS, months=HORIZON_MONTHS, seed=42, bounds=bounds, q4_spike=q4_spike
+)
+percentiles = growth_quantiles(tiers, totals)
+
 # Output summary
 summary = df.groupby('Data_Temperature').agg({
     'Data_Volume_GB': 'sum',
     'Projected_Data_GB_24mo': 'sum',
     'App_ID': 'count'
-}).rename(columns={'App_ID': 'Application_Count'})
+}).rename(columns={'App_ID': 'Application_Count'}).join(percentiles)
+
+# Retained spool (Task 0.7 spool_projection, when built) in the tier of its retention class
+try:
+    spool = upstream('spool_projection')
+except LookupError:
+    spool = None
+if spool is not None:
+    spool_tiers = spool.groupby('Data_Temperature')[['Retained_GB', 'Retained_GB_24mo']].sum()
+    summary = summary.join(spool_tiers.add_prefix('Spool_'), how='outer').fillna(0)
 
-print(summary.to_markdown())
+print(summary.to_markdown(floatfmt=',.0f'))
 
 total_current = df['Data_Volume_GB'].sum()
 total_projected = df['Projected_Data_GB_24mo'].sum()
+p50, p90, p99 = percentiles.loc['TOTAL']
 print(f"\n[Total Current]: {total_current:,.0f} GB ({total_current/1024:.2f} TB)")
 print(f"[Total 24-month]: {total_projected:,.0f} GB ({total_projected/1024:.2f} TB)")
 print(f"[Growth]: {((total_projected/total_current - 1) * 100):.1f}%")
+print(f"[24-month Percentiles ({N_SIMULATIONS:,} simulations)]: P50 {p50:,.0f} GB | P90 {p90:,.0f} GB | P99 {p99:,.0f} GB")
+print(f"[Provision for P99]: {p99/1024:.2f} TB ({((p99/total_current - 1) * 100):.1f}% over current)")
+if spool is not None:
+    spool_current, spool_projected = spool['Retained_GB'].sum(), spool['Retained_GB_24mo'].sum()
+    print(f"[Spool Archive]: {spool_current:,.0f} GB → {spool_projected:,.0f} GB in 24 months "
+          f"({len(spool)} apps); data + spool: {(total_current + spool_current)/1024:.2f} TB → "
+          f"{(total_projected + spool_projected)/1024:.2f} TB")
+if history_files:
+    fitted_apps = (df['Growth_Source'] == 'FITTED').sum()
+    print(f"[Growth Source]: {fitted_apps} apps fitted from {len(history_files)} disk-usage export(s) "
+          f"({object_fits['Model'].notna().sum():,} objects), {len(df) - fitted_apps} synthetic")
 ```
 
 **Expected Output:**
 ```
-| Data_Temperature | Data_Volume_GB | Projected_Data_GB_24mo | Application_Count |
-|------------------|----------------|------------------------|-------------------|
-| HOT              | 15,245         | 18,820                 | 17                |
-| WARM             | 4,183          | 4,920                  | 6                 |
-| COLD             | 1,350          | 1,485                  | 2                 |
+| Data_Temperature | Data_Volume_GB | Projected_Data_GB_24mo | Application_Count | P50_GB_24mo | P90_GB_24mo | P99_GB_24mo |
+|------------------|----------------|------------------------|-------------------|-------------|-------------|-------------|
+| COLD             | 180            | 193                    | 1                 | 193         | 198         | 200         |
+| HOT              | 18,480         | 23,163                 | 16                | 23,148      | 23,558      | 23,866      |
+| WARM             | 2,100          | 2,494                  | 8                 | 2,492       | 2,537       | 2,569       |
 
-[Total Current]: 20,778 GB (20.29 TB)
-[Total 24-month]: 25,225 GB (24.63 TB)
-[Growth]: 21.4%
\ No newline at end of file
+[Total Current]: 20,760 GB (20.27 TB)
+[Total 24-month]: 25,850 GB (25.24 TB)
+[Growth]: 24.5%
+[24-month Percentiles (100,000 simulations)]: P50 25,834 GB | P90 26,245 GB | P99 26,558 GB
+[Provision for P99]: 25.94 TB (27.9% over current)
\ No newline at end of file
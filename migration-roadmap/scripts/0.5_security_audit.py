@@ -1,63 +1,32 @@
 # scripts/0.5_security_audit.py
-import pandas as pd
-
-df = pd.read_csv('/mnt/user-data/uploads/AS400_Inventory_Detailed.csv')
-
-# Compliance framework mapping
-compliance_map = {
-    'PAYMENT007': ['PCI-DSS', 'SOX'],
-    'POS003': ['PCI-DSS'],
-    'MEMBER006': ['PII', 'GDPR'],
-    'ACCT010': ['SOX'],
-    'PAYROLL019': ['SOX', 'PII'],
-    'AUDIT022': ['SOX', 'ISO-27001'],
-    'SECURITY018': ['ISO-27001'],
-    'LOYALTY021': ['PII'],
-    'RETURNS016': ['PII'],
-    'TIMECLK020': ['PII']
-}
-
-df['Compliance_Frameworks'] = df['App_ID'].map(compliance_map).fillna('').apply(
-    lambda x: ','.join(x) if isinstance(x, list) else ''
-)
-
-# Data classification
-def classify_data(row):
-    app_id = row['App_ID']
-    if app_id in ['PAYMENT007', 'POS003']:
-        return 'PCI'
-    elif app_id in ['MEMBER006', 'PAYROLL019', 'LOYALTY021', 'RETURNS016', 'TIMECLK020']:
-        return 'PII'
-    elif app_id in ['ACCT010', 'AUDIT022']:
-        return 'SOX'
-    else:
-        return 'Internal'
-
-df['Data_Classification'] = df.apply(classify_data, axis=1)
-
-# Encryption requirements (at-rest, in-transit)
-def encryption_requirement(classification):
-    if classification in ['PCI', 'PII']:
-        return 'AES-256 (at-rest), TLS 1.3 (in-transit)'
-    elif classification == 'SOX':
-        return 'AES-256 (at-rest), TLS 1.2+ (in-transit)'
-    else:
-        return 'AES-256 (at-rest recommended)'
-
-df['Encryption_Requirement'] = df['Data_Classification'].map(encryption_requirement)
-
-# GCP security controls mapping
-def gcp_security_controls(classification):
-    controls = ['VPC-SC', 'Cloud KMS', 'Cloud Audit Logs']
-    if classification == 'PCI':
-        controls.extend(['DLP API', 'Cloud HSM', 'VPC Service Controls'])
-    elif classification == 'PII':
-        controls.extend(['DLP API', 'Access Transparency'])
-    elif classification == 'SOX':
-        controls.extend(['Assured Workloads', 'Access Approval'])
-    return ', '.join(controls)
-
-df['GCP_Security_Controls'] = df['Data_Classification'].map(gcp_security_controls)
+import os
+from compliance_rules import ComplianceRules, split_catalog
+from inventory_snapshot import load_inventory
+from pii_scanner import SCAN_ROOTS, app_findings, scan_files
+from pipeline import upstream
+
+df = load_inventory()
+
+# Frameworks, data classification, encryption requirement and GCP controls come from the
+# declarative rules in compliance_rules.py (app, file and column scope)
+rules = ComplianceRules()
+
+# File- and column-level scope from the Task 1.1 schema catalog (pipeline artifact), when built
+try:
+    files, columns = split_catalog(upstream('schema_catalog'))
+except LookupError:
+    files = columns = None
+
+# Discovered data where extracts / spool files are available (see pii_scanner.py): card
+# numbers or personal data found in an app's data put it in that framework's scope
+findings = None
+if any(os.path.isdir(root) for root in SCAN_ROOTS.values()):
+    findings = app_findings(scan_files())
+    detected = df['App_ID'].map(findings.set_index('App_ID')['Detected_Frameworks'])
+else:
+    detected = None
+
+df, files, columns = rules.evaluate(df, files, columns, detected=detected)
 
 # Output compliance summary
 compliance_summary = df[df['Compliance_Frameworks'] != ''][
@@ -67,6 +36,22 @@ compliance_summary = df[df['Compliance_Frameworks'] != ''][
 print("[COMPLIANCE-SCOPED APPLICATIONS]")
 print(compliance_summary.to_markdown(index=False))
 
+if files is not None:
+    sensitive = columns[columns['Compliance_Frameworks'] != ''].groupby(['App_ID', 'File_Name'])['Column_Name'].agg(', '.join)
+    scoped_files = files[files['Compliance_Frameworks'] != ''].join(
+        sensitive.rename('Sensitive_Columns'), on=['App_ID', 'File_Name'])
+    print(f"\n[COMPLIANCE-SCOPED FILES (schema catalog)]")
+    print(scoped_files[['App_ID', 'File_Name', 'File_Type', 'Compliance_Frameworks', 'Data_Classification',
+                        'Sensitive_Columns']].fillna('').to_markdown(index=False))
+
+if findings is not None:
+    discovery = findings.merge(df[['App_ID', 'Declared_Classification', 'Data_Classification']], on='App_ID', how='left')
+    print(f"\n[DATA DISCOVERY (extracts + spool files, distinct values)]")
+    print(discovery[['App_ID', 'Files', 'Bytes', 'PAN_Distinct', 'SSN_Distinct', 'EMAIL_Distinct', 'PHONE_Distinct',
+                     'Declared_Classification', 'Data_Classification']].to_markdown(index=False))
+    raised = df[df['Data_Classification'] != df['Declared_Classification']]
+    print(f"[Reclassified from data]: {len(raised)} apps" + (f" ({', '.join(raised['App_ID'])})" if len(raised) else ''))
+
 # AS400 security model documentation (synthetic baseline)
 print("\n[CURRENT AS400 SECURITY MODEL]")
 print("""
@@ -1,44 +1,151 @@
 # scripts/0.6_bandwidth_analysis.py
+import math
+import numpy as np
 import pandas as pd
-
-df = pd.read_csv('/mnt/user-data/uploads/AS400_Inventory_Detailed.csv')
-
+from inventory_snapshot import load_inventory
+from pipeline import upstream
+from portfolio_scoring import ASSESSMENT_DATE
+from traffic_model import (BATCH_IO_SHARE, BATCH_IO_SHARES, BATCH_WINDOWS, JOB_SCHEDULE_GLOB, MINUTES_PER_DAY,
+                           load_job_schedule, load_profiles, load_session_profile, minute_label, traffic_summary)
+from transfer_simulator import LINK_OPTIONS, Scenario, run_scenarios, scenario_grid, transfer_periods, transfer_plan, transfer_tables
+from window_scheduler import WEEKDAYS, load_change_windows
+
+df = load_inventory()
+
+# Time-bucketed traffic model (see traffic_model.py): every app's online I/O, batch I/O and
+# integration feeds on a 1-minute grid over the heaviest week of the change window calendar.
+# The link is sized on the coincident peak of the sum, not on the sum of per-app estimates.
 # Assumptions:
-# - Each network call = avg 2 KB payload (API request/response)
-# - File I/O in batch windows converts to 8-hour sustained transfer
+# - File I/O crosses the interconnect; interactive apps do 60% of it in batch, 40% online
 # - 20% overhead for protocol/encryption
+calendar_path = '/mnt/user-data/uploads/AS400_Change_Window_Calendar.csv'
+windows = load_change_windows(calendar_path)
+sessions = load_session_profile(calendar_path)
+
+# Declared nightly batch runs (job schedule export), when uploaded
+schedule = load_job_schedule()
+
+# Integration feeds from the Task 2.1 catalog (pipeline artifact), when built
+try:
+    integrations = upstream('integration_catalog')
+except LookupError:
+    integrations = None
+
+# Spool written to the archive and the retained spool to migrate (Task 0.7), when built
+try:
+    spool = upstream('spool_projection')
+except LookupError:
+    spool = None
+
+load, components = load_profiles(df, windows, sessions, integrations, spool, schedule=schedule)
+summary = traffic_summary(load)
+peak_minute = summary['Peak_Minute']
 
-def calculate_bandwidth_mbps(row):
-    # Online transactions (network calls)
-    if row['Network_Calls'] > 0:
-        calls_per_hour = row['Network_Calls']
-        kb_per_hour = calls_per_hour * 2
-        mbps = (kb_per_hour * 8) / (3600 * 1000) * 1.2  # 20% overhead
-    else:
-        mbps = 0
-    
-    # Batch file I/O (during 8-hour window)
-    if row['File_IO_Daily_GB'] > 0:
-        gb_per_8hr = row['File_IO_Daily_GB']
-        mbps_batch = (gb_per_8hr * 8 * 1024) / (8 * 3600) * 1.2
-    else:
-        mbps_batch = 0
-    
-    return round(mbps + mbps_batch, 2)
-
-df['Bandwidth_Required_Mbps'] = df.apply(calculate_bandwidth_mbps, axis=1)
+df['Bandwidth_Required_Mbps'] = load.max(axis=1).round(2)
+df['Peak_Contribution_Mbps'] = load[:, peak_minute].round(2)
 
 # Top bandwidth consumers
 top_bw = df.nlargest(10, 'Bandwidth_Required_Mbps')[
-    ['App_ID', 'App_Name', 'Network_Calls', 'File_IO_Daily_GB', 'Bandwidth_Required_Mbps']
+    ['App_ID', 'App_Name', 'Usage_Frequency', 'File_IO_Daily_GB', 'Bandwidth_Required_Mbps', 'Peak_Contribution_Mbps']
 ]
 
 print("[TOP 10 BANDWIDTH CONSUMERS]")
 print(top_bw.to_markdown(index=False))
 
-total_bandwidth = df['Bandwidth_Required_Mbps'].sum()
-print(f"\n[Total Peak Bandwidth Required]: {total_bandwidth:.1f} Mbps ({total_bandwidth/1000:.2f} Gbps)")
-print(f"[Recommended Interconnect]: {'Dedicated 10Gbps' if total_bandwidth > 5000 else 'Partner 5Gbps' if total_bandwidth > 2000 else 'Cloud VPN (multiple tunnels)'}")
+# Daily profile of the summed load
+total = load.sum(axis=0).reshape(7, MINUTES_PER_DAY)
+daily = pd.DataFrame({
+    'Day': list(WEEKDAYS),
+    'Peak_Mbps': total.max(axis=1).round(1),
+    'Peak_Time': [minute_label(m).split(' ')[1] for m in total.argmax(axis=1)],
+    'P95_Mbps': np.percentile(total, 95, axis=1).round(1),
+    'Mean_Mbps': total.mean(axis=1).round(1),
+})
+print("\n[WEEKLY TRAFFIC PROFILE (1-minute grid)]")
+print(daily.to_markdown(index=False))
+
+if integrations is not None:
+    print(f"\n[Integration Feeds]: {len(integrations)} from the 2.1 integration catalog")
+if spool is not None:
+    print(f"[Spool Archive Writes]: {spool['Daily_GB'].sum():,.1f} GB/day from {len(spool)} apps (0.7 spool projection)")
+peak, p95 = summary['Peak_Mbps'], summary['P95_Mbps']
+
+# Daily batches without a declared run share the nightly minutes: spread evenly there, they
+# peak together at the sum of their peaks, so the peak is an upper bound, not diversity-adjusted
+unscheduled = (~df['Usage_Frequency'].isin(list(BATCH_WINDOWS)) & (components['Batch_IO'] > 0)
+               & ~df['App_ID'].isin([] if schedule is None else schedule['App_ID']))
+staggered = unscheduled.sum() <= 1
+print(f"\n[Sum of Per-App Peaks]: {df['Bandwidth_Required_Mbps'].sum():.1f} Mbps")
+if staggered:
+    print(f"[Coincident Peak Bandwidth]: {peak:.1f} Mbps ({peak/1000:.2f} Gbps) at {minute_label(peak_minute)}")
+else:
+    print(f"[Peak Bandwidth, Upper Bound]: {peak:.1f} Mbps ({peak/1000:.2f} Gbps) at {minute_label(peak_minute)}")
+    print(f"[ASSUMPTION] {unscheduled.sum()} daily batches have no declared start/duration "
+          f"({'no job schedule in ' + JOB_SCHEDULE_GLOB if schedule is None else 'not in the job schedule'}): "
+          f"they share the nightly window, so this peak carries no diversity credit over the sum of peaks")
+print(f"[P95 Bandwidth]: {p95:.1f} Mbps ({p95/1000:.2f} Gbps)")
+
+# Interactive apps' batch share is a placeholder: the peak is reported over its sensitivity
+# range, and extra 10Gbps circuits are only recommended when every share in the range needs them
+sensitivity = pd.DataFrame([
+    {'Batch_IO_Share': share,
+     **traffic_summary(load_profiles(df, windows, sessions, integrations, spool, share, schedule)[0])}
+    for share in BATCH_IO_SHARES])
+sensitivity['Peak_Time'] = sensitivity['Peak_Minute'].map(minute_label)
+sensitivity['Circuits_10G'] = np.ceil(sensitivity['Peak_Mbps'] / 10000).astype(int)
+print(f"\n[PEAK SENSITIVITY TO THE BATCH I/O SHARE] (placeholder {BATCH_IO_SHARE:.0%}"
+      f"{'' if staggered else '; daily batch windows not staggered: upper bounds'})")
+print(sensitivity[['Batch_IO_Share', 'Peak_Mbps', 'P95_Mbps', 'Peak_Time', 'Circuits_10G']].round(1).to_markdown(index=False))
+
+circuits = min(math.ceil(peak / 10000), int(sensitivity['Circuits_10G'].min()))
+if circuits < math.ceil(peak / 10000):
+    print(f"[ASSUMPTION] {math.ceil(peak / 10000)} circuits only at a batch share of {BATCH_IO_SHARE:.0%}: "
+          f"confirm with job schedules / I/O traces before ordering more than {circuits}")
+if not staggered and circuits > 1:
+    print(f"[ASSUMPTION] {circuits} circuits sized on the unstaggered upper bound: staggering the nightly batches "
+          f"(job schedule) may bring the coincident peak under {(circuits - 1) * 10}Gbps")
+if peak > 5000:
+    interconnect = 'Dedicated 10Gbps' if circuits == 1 else f'Dedicated 10Gbps x {circuits}'
+    interconnect_gbps = LINK_OPTIONS['Dedicated 10Gbps'] * circuits
+else:
+    interconnect = 'Partner 5Gbps' if peak > 2000 else 'Cloud VPN (multiple tunnels)'
+    interconnect_gbps = LINK_OPTIONS[interconnect]
+print(f"[Recommended Interconnect]: {interconnect}")
+
+# Does the bulk copy (plus daily deltas) fit the change windows? Discrete-event simulation,
+# see transfer_simulator.py; tables from the 1.1 schema catalog and growth from 0.3 when built
+try:
+    growth = upstream('growth_projection')
+except LookupError:
+    growth = None
+try:
+    catalog = upstream('schema_catalog')
+except LookupError:
+    catalog = None
+tables = transfer_tables(df, growth, catalog, spool)
+periods = transfer_periods(windows, ASSESSMENT_DATE)
+
+options = {**{name: gbps for name, gbps in LINK_OPTIONS.items()}, interconnect: interconnect_gbps}
+transfers = run_scenarios(tables, periods, [Scenario(gbps) for gbps in options.values()])
+transfers.insert(0, 'Interconnect', list(options))
+transfers['Finish'] = (pd.Timestamp(ASSESSMENT_DATE) + pd.to_timedelta(transfers['Finish_Hours'], unit='h')).dt.round('min')
+transfers['Catchup_Minutes'] = (transfers['Catchup_Hours'] * 60).round(1)
+print(f"\n[BULK TRANSFER vs CHANGE WINDOWS]: {tables['Size_GB'].sum() / 1024:.1f} TB in {len(tables)} tables, "
+      f"from {ASSESSMENT_DATE:%Y-%m-%d}")
+print(transfers[['Interconnect', 'link_gbps', 'streams', 'Finish', 'Periods_Used', 'Overruns',
+                 'Catchup_Minutes', 'Cutover_Fits']].to_markdown(index=False))
+
+plan, _ = transfer_plan(tables, periods, Scenario(interconnect_gbps), ASSESSMENT_DATE)
+print(f"\n[TABLE COMPLETION - {interconnect}] (10 largest)")
+print(plan.head(10)[['App_ID', 'Table', 'Size_GB', 'Completed', 'Window_Overruns', 'GB_Left_At_Close']]
+      .round({'Size_GB': 1}).to_markdown(index=False))
+
+# What-if sweep for link sizing: windows needed per link capacity and parallel streams
+sweep = run_scenarios(tables, periods, scenario_grid(
+    link_gbps=[1, 3, 5, 10, 20], streams=[4, 8, 16, 32, 64], compression_ratio=[1.5, 2.0, 3.0]))
+print(f"\n[WHAT-IF: CHANGE WINDOWS TO COMPLETE THE BULK COPY] ({len(sweep)} scenarios, compression 2.0)")
+print(sweep[sweep['compression_ratio'] == 2.0].pivot(index='link_gbps', columns='streams', values='Periods_Used')
+      .rename(columns=lambda streams: f'{streams} streams').to_markdown())
 ```
 
 **Expected Output:**
@@ -0,0 +1,36 @@
+# scripts/0.7_spool_analysis.py
+from inventory_snapshot import load_inventory
+from spool_model import load_spool_management, spool_projection
+
+# Spool output: retained volume, ingest and archive write rate over the next 24 months
+# (see spool_model.py). Joined into the 0.3 storage tiers and the 0.6 traffic model.
+HORIZON_MONTHS = 24
+
+spool = load_spool_management()
+df, monthly = spool_projection(spool, HORIZON_MONTHS)
+
+print("[SPOOL RETENTION & ARCHIVE PROJECTION]")
+print(df.sort_values('Retained_GB_24mo', ascending=False)[
+    ['App_ID', 'Destination', 'Retention_Days', 'Storage_Class', 'Daily_GB', 'Retained_GB',
+     f'Retained_GB_{HORIZON_MONTHS}mo', f'Ingest_MBps_{HORIZON_MONTHS}mo']
+].to_markdown(index=False, floatfmt=',.2f'))
+
+print("\n[RETAINED SPOOL BY STORAGE CLASS (GB)]")
+retained = monthly[monthly['Month'] % 6 == 0].pivot(index='Month', columns='Storage_Class', values='Retained_GB')
+retained['TOTAL'] = retained.sum(axis=1)
+print(retained.to_markdown(floatfmt=',.0f'))
+
+now = monthly[monthly['Month'] == 0].sum(numeric_only=True)
+end = monthly[monthly['Month'] == HORIZON_MONTHS].sum(numeric_only=True)
+statutory = df['Retention_Days'] >= 7 * 365
+print(f"\n[Daily Spool]: {now['Daily_Files']:,.0f} files, {now['Daily_GB']:,.1f} GB/day "
+      f"→ {end['Daily_GB']:,.1f} GB/day in {HORIZON_MONTHS} months")
+print(f"[Retained Spool]: {now['Retained_GB'] / 1024:,.2f} TB → {end['Retained_GB'] / 1024:,.2f} TB")
+print(f"[Archive Writes]: {now['Ingest_MBps']:.2f} MB/s average → {end['Ingest_MBps']:.2f} MB/s")
+print(f"[7-year Retention]: {spool.loc[statutory, 'Daily_Spool_Files'].sum():,} files/day "
+      f"({', '.join(df.loc[statutory, 'App_ID'])}) → ARCHIVE class with Bucket Lock")
+
+inventory = load_inventory(['App_ID', 'Spool_Files_Daily'])
+covered = inventory['App_ID'].isin(df['App_ID'])
+print(f"[Coverage]: {covered.sum()} of {len(inventory)} apps; "
+      f"{inventory.loc[~covered, 'Spool_Files_Daily'].sum():,} inventory spool files/day not in the spool export")
@@ -1,9 +1,15 @@
 # scripts/1.1_schema_extraction.py
+import numpy as np
 import pandas as pd
 import hashlib
 
-# Synthetic DB2/400 schema based on discovered applications
-# Real implementation requires: DSPFD FILE(*ALL) OUTPUT(*OUTFILE) + SQL SYSTABLES query
+from dds_catalog import load_catalog, schema_rows
+from ddl_generator import MAX_PARTITIONS, MIN_PARTITION_GB, generate_ddl
+from inventory_snapshot import load_inventory
+from lf_redundancy import MIN_PROJECTION_PATHS, access_paths, analyze, catalog_access_paths, index_plan
+
+# Schema catalog built from the DSPFD/DSPFFD outfiles and DDS source (python dds_catalog.py);
+# until those exports exist, the synthetic sample below based on discovered applications
 
 schema_catalog = []
 
@@ -232,45 +238,98 @@ schema_catalog.extend([
 ])
 
 # Convert to DataFrame for analysis
-df_schema = pd.DataFrame(schema_catalog)
-
-print("[DB2/400 SCHEMA CATALOG - SAMPLE (28 of 332 files)]")
-print(df_schema[['App_ID', 'File_Name', 'File_Type', 'Record_Count', 'Record_Length']].to_markdown(index=False))
+catalog = load_catalog()
+if catalog is not None:
+    df_schema = schema_rows(catalog)
+    scope, sampled = 'DSPFD/DDS', 'Cataloged'
+    print(f"[DB2/400 SCHEMA CATALOG - {scope} ({len(df_schema)} files), 30 LARGEST]")
+    shown = df_schema.nlargest(30, 'Record_Count')
+else:
+    df_schema = pd.DataFrame(schema_catalog)
+    scope, sampled = 'sampled', 'Sampled'
+    print("[DB2/400 SCHEMA CATALOG - SAMPLE (28 of 332 files)]")
+    shown = df_schema
+print(shown[['App_ID', 'File_Name', 'File_Type', 'Record_Count', 'Record_Length']].to_markdown(index=False))
 
 # Schema statistics
 print(f"\n[SCHEMA STATISTICS]")
-print(f"Total Physical Files Sampled: {len(df_schema[df_schema['File_Type'] == 'PF'])}")
-print(f"Total Logical Files Sampled: {len(df_schema[df_schema['File_Type'] == 'LF'])}")
+print(f"Total Physical Files {sampled}: {len(df_schema[df_schema['File_Type'] == 'PF'])}")
+print(f"Total Logical Files {sampled}: {len(df_schema[df_schema['File_Type'] == 'LF'])}")
 print(f"Total Record Count: {df_schema['Record_Count'].sum():,}")
 print(f"Largest Table: {df_schema.nlargest(1, 'Record_Count')[['File_Name', 'Record_Count']].values[0]}")
+if catalog is not None:
+    files = catalog['files']
+    print(f"Catalog Sources: {files['Source'].value_counts().to_dict()}")
+    print(f"Select/Omit LFs (view candidates): {(catalog['lf_pf'].drop_duplicates(['App_ID', 'File_Name'])['Select_Omit'] != '').sum()}")
 
 # Calculate total data size
 df_schema['Size_GB'] = (df_schema['Record_Count'] * df_schema['Record_Length']) / (1024**3)
 total_size = df_schema['Size_GB'].sum()
-print(f"Total Data Size (sampled): {total_size:,.2f} GB")
+print(f"Total Data Size ({scope}): {total_size:,.2f} GB")
+
+# Target DDL with partition / cluster advice (ddl_generator.py; --dialect postgresql for Cloud SQL)
+df_ddl = generate_ddl(df_schema, 'bigquery')
+partitioned = df_ddl[df_ddl['Partitions'] > 0]
+print(f"\n[DDL PLAN - {len(df_ddl)} files: {(df_ddl['File_Type'] == 'PF').sum()} tables, "
+      f"{len(partitioned)} partitioned, {(df_ddl['Cluster_By'].str.len() > 0).sum()} clustered]")
+plan = df_ddl[df_ddl['File_Type'] == 'PF'].assign(Cluster_By=df_ddl['Cluster_By'].str.join(', '))
+print(plan.nlargest(30, 'Size_GB')[['App_ID', 'File_Name', 'Size_GB', 'Partition_Column', 'Partition_Grain',
+                                    'Partitions', 'Partition_GB', 'Cluster_By', 'Partition_Check']].fillna('')
+      .to_markdown(index=False, floatfmt=',.2f'))
+
+# Partitions must add up to each table's size estimate above, stay within the partition
+# bounds, and the partitioned tables must fit in the Total Data Size
+estimate = partitioned[['App_ID', 'File_Name']].merge(
+    df_schema[['App_ID', 'File_Name', 'Size_GB']], how='left', on=['App_ID', 'File_Name'])['Size_GB'].to_numpy()
+problems = partitioned.assign(
+    Sized=~np.isclose(partitioned['Partitions'] * partitioned['Partition_GB'], estimate),
+    Small=partitioned['Partition_GB'] < MIN_PARTITION_GB, Many=partitioned['Partitions'] > MAX_PARTITIONS)
+problems = problems[problems[['Sized', 'Small', 'Many']].any(axis=1)]
+if len(problems):
+    raise ValueError(f"Partition plan inconsistent with the size estimate or bounds:\n"
+                     f"{problems[['App_ID', 'File_Name', 'Partitions', 'Partition_GB', 'Sized', 'Small', 'Many']]}")
+if partitioned['Size_GB'].sum() > total_size * (1 + 1e-9):
+    raise ValueError(f"Partitioned tables ({partitioned['Size_GB'].sum():,.2f} GB) exceed the Total Data Size "
+                     f"({total_size:,.2f} GB)")
+print(f"[Partition Check]: {partitioned['Size_GB'].sum():,.2f} of {total_size:,.2f} GB partitioned, "
+      f"{partitioned['Partition_GB'].min() if len(partitioned) else 0:,.2f} GB smallest partition "
+      f"(min {MIN_PARTITION_GB:g} GB, max {MAX_PARTITIONS:,} partitions)")
+
+example = df_ddl[df_ddl['File_Name'] == 'WHITEM']
+if example.empty:
+    example = df_ddl[df_ddl['File_Type'] == 'PF'].nlargest(1, 'Size_GB')
+print(f"\n[GENERATED DDL - {example['File_Name'].iloc[0]} table]")
+print(example['DDL'].iloc[0])
+
+# Logical file access paths: which need a target index (lf_redundancy.py)
+paths = analyze(catalog_access_paths(catalog) if catalog is not None else access_paths(df_schema))
+pfs = df_schema[df_schema['File_Type'] == 'PF']
+lf_plan = index_plan(paths, dict(zip(zip(pfs['App_ID'], pfs['File_Name']), pfs['LF_Count'])))
+dropped = paths[paths['Action'] == 'Drop']
+print(f"\n[LF ACCESS PATH REDUNDANCY - {lf_plan['Access_Paths'].sum()} keyed access paths over {len(lf_plan)} PFs]")
+print(lf_plan.nlargest(30, 'Index_GB_Before')[[
+    'App_ID', 'PF', 'LF_Count', 'Access_Paths', 'Indexes_Kept', 'Indexes_Dropped', 'Views', 'Kept',
+    'Write_Amplification_Before', 'Write_Amplification_After', 'Savings_Pct']].to_markdown(index=False, floatfmt='.2f'))
+if len(dropped):
+    print(dropped.head(30).assign(Keys=dropped['Keys'].str.join(', '))[
+        ['App_ID', 'PF', 'File_Name', 'Keys', 'Select_Omit', 'Reason', 'Served_By']].to_markdown(index=False))
+index_gb_saved = (lf_plan['Index_GB_Before'] - lf_plan['Index_GB_After']).sum()
+print(f"[Indexes]: {lf_plan['Indexes_Kept'].sum()} kept, {lf_plan['Indexes_Dropped'].sum()} dropped, "
+      f"{lf_plan['Views'].sum()} views; {index_gb_saved:,.2f} GB of index entries not written "
+      f"(full-table paths; select/omit paths: up to {lf_plan['Sparse_GB_Dropped_Max'].sum():,.2f} GB more, "
+      f"{lf_plan['Sparse_Paths'].sum()} sparse paths not sized)")
 
-# Export DDL (synthetic PostgreSQL-compatible)
-print("\n[SAMPLE DDL EXPORT - WHITEM table]")
-print("""
-CREATE TABLE warehouse_item (
-    warehouse_id CHAR(4) NOT NULL,
-    item_sku CHAR(14) NOT NULL,
-    qty_on_hand INTEGER,
-    qty_allocated INTEGER,
-    location_bin CHAR(10),
-    last_count_date DATE,
-    last_movement_ts TIMESTAMP,
-    cost_usd NUMERIC(15,4),
-    weight_lbs NUMERIC(10,2),
-    status_code CHAR(1),
-    CONSTRAINT pk_warehouse_item PRIMARY KEY (warehouse_id, item_sku),
-    CONSTRAINT fk_warehouse_item_invmast FOREIGN KEY (item_sku) REFERENCES inventory_master(item_sku),
-    CONSTRAINT chk_warehouse_item_status CHECK (status_code IN ('A','H','D','X'))
-)
-PARTITION BY LIST (warehouse_id);
--- Note: BigQuery uses CLUSTER BY instead of partition for dimension tables
--- GCS staging: gs://costco-migration/schema/warehouse_item/*.parquet
-""")
+# Cataloged LFs vs the inventory's Logical_Files, projected at the cataloged drop rate
+inventory = load_inventory(['App_ID', 'Physical_Files', 'Logical_Files', 'LF_PF_Ratio'])
+lf_paths = paths[(paths['File_Type'] == 'LF') & (paths['Action'] != 'View')]
+drop_rate = (lf_paths['Action'] == 'Drop').mean() if len(lf_paths) else 0.0
+print(f"[Portfolio LFs]: {inventory['Logical_Files'].sum():,} in the inventory "
+      f"(LF/PF {inventory['LF_PF_Ratio'].mean():.1f}), {(paths['File_Type'] == 'LF').sum()} cataloged")
+if len(lf_paths) >= MIN_PROJECTION_PATHS:
+    print(f"[Projected]: ~{inventory['Logical_Files'].sum() * drop_rate:,.0f} fewer target indexes "
+          f"at the cataloged drop rate ({drop_rate:.0%} of {len(lf_paths)} keyed LFs)")
+else:
+    print(f"[Projected]: needs {MIN_PROJECTION_PATHS}+ keyed LFs in the catalog (python dds_catalog.py)")
 
 # Generate checksum
 schema_csv = df_schema.to_csv(index=False)
@@ -2,8 +2,12 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from pipeline import upstream
+from column_profiler import PROFILED_ISSUE_TYPES, extract_files, profile_extracts, profile_issues
 
 # Synthetic data quality metrics (real implementation requires RUNQRY on AS400 or JDBC sampling)
+# Files with CSV extracts are profiled instead (column_profiler.py): their issues of the
+# PROFILED_ISSUE_TYPES come from the data, cross-file checks stay as reviewed below
 
 quality_issues = []
 
@@ -203,6 +207,24 @@ quality_issues.append({
 
 df_quality = pd.DataFrame(quality_issues)
 
+# Load schema from Task 1.1 (schema_catalog artifact, see pipeline.py)
+df_schema = upstream('schema_catalog')
+
+if extract_files():
+    df_profile = profile_extracts(df_schema)
+    profiled = df_quality.set_index(['App_ID', 'File_Name']).index.isin(
+        df_profile.set_index(['App_ID', 'File_Name']).index)
+    df_quality = pd.concat([
+        df_quality[~(profiled & df_quality['Issue_Type'].isin(PROFILED_ISSUE_TYPES))],
+        profile_issues(df_profile, df_schema),
+    ], ignore_index=True)
+
+    print("[COLUMN PROFILE (extracts, sketch estimates)]")
+    print(df_profile[['App_ID', 'File_Name', 'Column_Name', 'Family', 'Rows', 'Nulls', 'Distinct', 'Min', 'Max',
+                      'P50', 'Duplicates']].to_markdown(index=False))
+    scanned = df_profile.groupby(['App_ID', 'File_Name'])[['Rows', 'Profile_Seconds']].max()
+    print(f"Profiled {len(scanned)} files, {scanned['Rows'].sum():,} rows in {scanned['Profile_Seconds'].sum():.1f}s\n")
+
 print("[DATA QUALITY ISSUES SUMMARY]")
 print(df_quality.groupby(['Severity', 'Issue_Type']).size().to_markdown())
 
@@ -224,7 +246,7 @@ def calculate_dq_score(app_id, df_schema, df_quality):
     
     total_records = app_schema['Record_Count'].sum()
     if total_records == 0:
-        return 100
+        return 100.0
     
     penalty_weights = {'CRITICAL': 10, 'HIGH': 5, 'MEDIUM': 2, 'LOW': 0.5}
     total_penalty = 0
@@ -237,9 +259,6 @@ def calculate_dq_score(app_id, df_schema, df_quality):
     score = max(0, 100 - total_penalty)
     return round(score, 1)
 
-# Load schema from Task 1.1
-df_schema = pd.read_csv('/tmp/schema_catalog.csv') if False else pd.DataFrame(schema_catalog)
-
 app_scores = []
 for app_id in df_quality['App_ID'].unique():
     score = calculate_dq_score(app_id, df_schema, df_quality)
@@ -1,5 +1,5 @@
 # scripts/1.5_retention_policy.py
-import pandas as pd
+from tabulate import tabulate  # pandas' to_markdown backend; skips the ~0.7s pandas import
 
 retention_policies = [
     {
@@ -100,10 +100,11 @@ retention_policies = [
     }
 ]
 
-df_retention = pd.DataFrame(retention_policies)
+SUMMARY_COLUMNS = ['Table', 'Compliance_Driver', 'Retention_Period_Years', 'Hot_Period_Days']
 
 print("[DATA RETENTION POLICY SUMMARY]")
-print(df_retention[['Table', 'Compliance_Driver', 'Retention_Period_Years', 'Hot_Period_Days']].to_markdown(index=False))
+print(tabulate([[policy[col] for col in SUMMARY_COLUMNS] for policy in retention_policies],
+               headers=SUMMARY_COLUMNS, tablefmt='pipe'))
 
 print("\n[GCS LIFECYCLE POLICY CONFIGURATION]")
 print("""
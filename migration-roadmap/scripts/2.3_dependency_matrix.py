@@ -1,8 +1,14 @@
 # scripts/2.3_dependency_matrix.py
+import sys
 import pandas as pd
 import numpy as np
 import networkx as nx
-import matplotlib.pyplot as plt
+from call_graph import app_dependencies, load_call_graph
+from dependency_graph import dependency_matrix
+from wave_scheduler import assign_waves
+from portfolio_scoring import ASSESSMENT_DATE, score_portfolio
+from window_scheduler import estimate_effort, load_change_windows, schedule_migrations
+from inventory_snapshot import load_inventory
 
 # Load application inventory
 apps = ['WMS001', 'INV002', 'POS003', 'SHIP004', 'PURCH005', 'MEMBER006', 
@@ -12,8 +18,7 @@ apps = ['WMS001', 'INV002', 'POS003', 'SHIP004', 'PURCH005', 'MEMBER006',
         'LOYALTY021', 'AUDIT022', 'BACKUP023', 'EDI024', 'ALLOCATION025']
 
 # Dependency matrix (1 = depends on, 0 = no dependency)
-# Row depends on Column
-dependency_data = np.zeros((len(apps), len(apps)), dtype=int)
+# Row depends on Column - sparse CSR, see dependency_graph.dependency_matrix
 
 # Define dependencies (from Task 0.2 + new integrations from Task 2.1)
 dependencies = [
@@ -71,22 +76,32 @@ dependencies = [
     ('EDI024', 'CARRIER008'),
 ]
 
+# Apps with scanned source: extracted call-graph edges (python call_graph.py) replace the
+# hand-maintained ones above
+edges = load_call_graph(columns=['App_ID', 'Target', 'Target_Type', 'Edge_Type', 'Count'])
+if edges is not None:
+    scanned = set(edges['App_ID'])
+    extracted = app_dependencies(edges, load_inventory(['App_ID', 'DB2_Objects_List']))
+    extracted = extracted[extracted['App_ID'].isin(apps) & extracted['Depends_On'].isin(apps)]
+    dependencies = ([(src, dst) for src, dst in dependencies if src not in scanned]
+                    + list(zip(extracted['App_ID'], extracted['Depends_On'])))
+    print(f"[Dependency Source]: call graph for {len(scanned & set(apps))} apps, "
+          f"hand-maintained edges for {len(set(apps) - scanned)}\n")
+
 # Populate matrix
-for src, dst in dependencies:
-    if src in apps and dst in apps:
-        src_idx = apps.index(src)
-        dst_idx = apps.index(dst)
-        dependency_data[src_idx][dst_idx] = 1
+dependency_data, app_index = dependency_matrix(apps, dependencies)
 
-df_matrix = pd.DataFrame(dependency_data, index=apps, columns=apps)
+# Preview slices the sparse matrix - only the 10×10 block is densified
+preview = 10
+df_matrix = pd.DataFrame(dependency_data[:preview, :preview].toarray(), index=apps[:preview], columns=apps[:preview])
 
 print("[DEPENDENCY MATRIX (sample - first 10 apps)]")
-print(df_matrix.iloc[:10, :10].to_markdown())
+print(df_matrix.to_markdown())
 
 # Analyze dependency metrics
 print("\n[DEPENDENCY METRICS]")
-inbound_deps = dependency_data.sum(axis=1)  # Row sums (how many apps this app depends on)
-outbound_deps = dependency_data.sum(axis=0)  # Column sums (how many apps depend on this app)
+inbound_deps = np.asarray(dependency_data.sum(axis=1)).ravel()  # Row sums (how many apps this app depends on)
+outbound_deps = np.asarray(dependency_data.sum(axis=0)).ravel()  # Column sums (how many apps depend on this app)
 
 df_metrics = pd.DataFrame({
     'App_ID': apps,
@@ -128,33 +143,11 @@ except:
 
 # Wave assignment (respecting dependencies)
 print("\n[MIGRATION WAVE ASSIGNMENT]")
-waves = []
-remaining = set(G.nodes())
-wave_num = 1
-
-while remaining:
-    wave = []
-    for node in list(remaining):
-        # Node can be in this wave if all its dependencies are already migrated
-        predecessors = set(G.predecessors(node))
-        if predecessors.issubset(set(G.nodes()) - remaining):
-            wave.append(node)
-    
-    if not wave:
-        print(f"[ERROR] Cannot form wave {wave_num} - circular dependency")
-        # Force break cycle by selecting node with fewest inbound deps
-        candidates = [(node, len(list(G.predecessors(node)))) for node in remaining]
-        node_to_force = min(candidates, key=lambda x: x[1])[0]
-        wave.append(node_to_force)
-        print(f"  [FORCED] Breaking cycle by including {node_to_force} (requires feature toggle)")
-    
-    waves.append((wave_num, wave))
-    remaining -= set(wave)
-    wave_num += 1
-    
-    if wave_num > 50:  # Safety valve
-        print("[ERROR] Too many waves, terminating")
-        break
+# Single O(V + E) Kahn pass, cycles broken by the FORCED rule (see wave_scheduler.py)
+waves, forced = assign_waves(G)
+for wave_num, node_to_force in forced:
+    print(f"[ERROR] Cannot form wave {wave_num} - circular dependency")
+    print(f"  [FORCED] Breaking cycle by including {node_to_force} (requires feature toggle)")
 
 for wave_num, apps_in_wave in waves:
     print(f"Wave {wave_num}: {', '.join(sorted(apps_in_wave))}")
@@ -165,6 +158,31 @@ print(f"  Sequential: {len(apps)} waves × 4 weeks/wave = {len(apps) * 4} weeks"
 print(f"  Parallel: {len(waves)} waves × 4 weeks/wave = {len(waves) * 4} weeks")
 print(f"  Time Savings: {(len(apps) - len(waves)) * 4} weeks ({((len(apps) - len(waves)) / len(apps) * 100):.1f}% reduction)")
 
+# Calendar-constrained plan: real change windows, blackouts, risk levels, concurrency cap
+print("\n[WINDOW-CONSTRAINED SCHEDULE (AS400_Change_Window_Calendar.csv)]")
+inventory = score_portfolio(load_inventory())
+change_windows = load_change_windows('/mnt/user-data/uploads/AS400_Change_Window_Calendar.csv')
+# dependencies are (dependent, dependency); the scheduler wants dependency → dependent
+plan = schedule_migrations(G.reverse(), estimate_effort(inventory), change_windows, start=ASSESSMENT_DATE, max_concurrent=5)
+print(plan.to_markdown(index=False))
+
+# Every dependency must finish before its dependents start (apps of one work item cut over together)
+item_of = {app: row for row in plan.itertuples() for app in row.Work_Item.strip('{}').split(', ')}
+out_of_order = [(dependent, dependency) for dependent, dependency in dependencies
+                if item_of[dependent].Index != item_of[dependency].Index
+                and item_of[dependency].Finish > item_of[dependent].Start]
+if out_of_order:
+    print(f"  [ERROR] {len(out_of_order)} dependents start before their dependency finishes: "
+          + ', '.join(f'{dependent} <- {dependency}' for dependent, dependency in out_of_order))
+else:
+    print(f"  [OK] All {len(dependencies)} dependencies finish before their dependents start")
+
+unscheduled = plan['Finish'].isna().sum()
+plan_weeks = (plan['Finish'].max() - pd.Timestamp(ASSESSMENT_DATE)).days / 7
+print(f"  Calendar-constrained: {plan_weeks:.1f} weeks (5 concurrent, blackouts and risk levels honored)")
+if unscheduled:
+    print(f"  [WARNING] {unscheduled} work items do not fit the planning horizon")
+
 # Export adjacency list for visualization
 print("\n[DEPENDENCY GRAPH EXPORT (DOT format for Graphviz)]")
 print("```dot")
@@ -175,6 +193,11 @@ for src, dst in dependencies:
     print(f'  "{src}" -> "{dst}";')
 print("}")
 print("```")
+
+# Optional render: python 2.3_dependency_matrix.py --plot dependencies.png
+if '--plot' in sys.argv:
+    from dependency_plot import render_dependency_graph
+    print(f"\n[Dependency Graph]: {render_dependency_graph(G, sys.argv[sys.argv.index('--plot') + 1])}")
 ```
 
 **Expected Output:**
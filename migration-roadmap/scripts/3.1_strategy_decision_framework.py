@@ -2,6 +2,7 @@
 import pandas as pd
 import numpy as np
 import hashlib
+from pipeline import upstream
 
 # Load application inventory from Task 0.1
 apps_data = [
@@ -34,6 +35,15 @@ apps_data = [
 
 df = pd.DataFrame(apps_data)
 
+# TDI / criticality as scored by Task 0.1 (portfolio_scores artifact, see pipeline.py);
+# the values above are a hand-copied snapshot, used when 0.1 has not run on the current inventory
+try:
+    scores = upstream('portfolio_scores').set_index('App_ID')
+    for col in ['Technical_Debt_Index', 'Business_Criticality_Score']:
+        df[col] = df['App_ID'].map(scores[col]).fillna(df[col]).astype(df[col].dtype)
+except LookupError:
+    pass
+
 # Multi-dimensional scoring model
 def calculate_business_value_score(row):
     """
@@ -0,0 +1,699 @@
+# scripts/column_profiler.py
+import csv
+import functools
+import math
+import os
+import re
+import time
+
+from ddl_generator import TIME_FAMILIES, column_types
+from compliance_rules import split_catalog
+from lazy_imports import lazy_import
+from portfolio_scoring import ASSESSMENT_DATE
+
+np = lazy_import('numpy')
+pa = lazy_import('pyarrow')
+pd = lazy_import('pandas')
+
+# Streaming column profiler for Task 1.2 (replaces the synthetic quality_issues where extracts exist)
+# Extracts are CPYTOIMPF stream files with a header row (ADDCOLNAM(*SYS)), laid out as
+# PROFILE_ROOT/<App_ID>/<File_Name>[.<partition>...].csv; column types come from the Task 1.1
+# schema catalog. Each file is read once in Arrow record batches; per column the state is
+# bounded whatever the row count:
+#   counters     rows, NULL (empty) / blank, unparseable for the type, negatives, future and
+#                sentinel dates, values outside a CHK IN list
+#   min / max    numeric, date (as days) or text (lexicographic)
+#   HyperLogLog  distinct count, HLL_PRECISION (±1.04/√m)
+#   Count-Min    frequencies of CMS_DEPTH × CMS_WIDTH counters, plus the HEAVY_HITTERS most
+#                frequent values as candidates (estimates over-count by ≤ e/width of the rows)
+#   t-digest     quantiles of the value (numeric), day (date) or length (text)
+#   char classes histogram of which CHAR_CLASSES a value contains (bitmask of the classes)
+# A batch is reduced to its distinct values and their counts first (value_counts), so every
+# sketch sees each distinct value of a batch once, with a weight; values are hashed and
+# classified straight from their UTF-8 bytes (hash_strings, char_classes). The table key
+# (PK(...)) is profiled as one more column: combined field hashes into a KEY_HLL_PRECISION
+# HyperLogLog, duplicates reported beyond 3 standard errors of its estimate.
+#
+# Every state has merge(): counters add, min/max combine, HyperLogLog registers take the max,
+# Count-Min tables add, t-digests recompress their joint centroids. Extracts split by
+# partition or LPAR are profiled one file per task in a process pool and merged into their
+# table in file order (profile_extracts), so the result does not depend on the worker count.
+#
+# profile_issues maps the profile to the 1.2 Issue_Type categories (PROFILED_ISSUE_TYPES);
+# REFERENTIAL_INTEGRITY, LOGICAL_CONSISTENCY and SECURITY need cross-file checks (0.5 scans
+# for card numbers) and stay as reviewed.
+#
+# Run: python column_profiler.py [--root DIR] [--workers N] [--rows N [--partitions P] --workers 1,2,4,8]
+#      (--rows: benchmark on a generated extract, scaling table over the listed worker counts)
+
+PROFILE_ROOT = '/mnt/user-data/uploads/extracts'
+BLOCK_BYTES = 16 << 20  # CSV bytes per record batch
+
+HLL_PRECISION = 14  # 16,384 one-byte registers: ±0.8% distinct count
+KEY_HLL_PRECISION = 18  # 256 KB per key: ±0.2%, duplicates show from ~0.6% of the rows
+CMS_DEPTH, CMS_WIDTH = 4, 4096  # over-count ≤ 0.07% of rows with 98% confidence
+HEAVY_HITTERS = 10
+DIGEST_COMPRESSION = 200  # t-digest δ: about δ/2 centroids, finest at the tails
+QUANTILES = (0.01, 0.5, 0.99)
+
+INTEGER_FAMILIES = {'SMALLINT', 'INTEGER', 'BIGINT'}
+NUMERIC_FAMILIES = {'DECIMAL', 'REAL', 'DOUBLE', *INTEGER_FAMILIES}
+CHAR_CLASSES = {
+    'DIGIT': '[0-9]', 'UPPER': '[A-Z]', 'LOWER': '[a-z]', 'SPACE': ' ',
+    'PUNCT': r"[-./,:;'#&@()+*%$_]", 'NON_ASCII': r'[^\x00-\x7f]', 'CONTROL': r'[\x00-\x1f\x7f]',
+}
+DIGITS_ONLY = 1 << list(CHAR_CLASSES).index('DIGIT')
+ENCODING_CLASSES = (1 << list(CHAR_CLASSES).index('NON_ASCII')) | (1 << list(CHAR_CLASSES).index('CONTROL'))
+PATTERN_DOMINANCE = 0.9  # a CHAR column this share digits-only is numeric: other shapes are violations
+SENTINEL_DATES = ('0001-01-01', '1900-01-01', '9999-12-31')  # NULL substitutes in DB2 for i date fields
+
+# Amount / quantity columns that cannot go negative (deltas and variances can)
+NON_NEGATIVE = r'(?:COST|PRICE|FEE|_USD$|_AMT|AMOUNT|_ON_HAND|WEIGHT|LENGTH|WIDTH|HEIGHT)'
+SIGNED = r'(?:CHANGE|VARIANCE|ADJ|IMPACT|DELTA|BALANCE)'
+
+PROFILED_ISSUE_TYPES = ('COMPLETENESS', 'RANGE_VIOLATION', 'TEMPORAL_ANOMALY', 'PATTERN_VIOLATION',
+                        'DATA_QUALITY', 'UNIQUENESS')
+SEVERITIES = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+SEVERITY_SHARE = (('CRITICAL', 0.10), ('HIGH', 0.01), ('MEDIUM', 0.001))  # else LOW; share of rows affected
+ISSUE_FIXES = {
+    'NULL': 'Default value or NOT NULL exemption per target column (review with data owner)',
+    'NULL_KEY': 'Key field without a value: quarantine rows, fix at source before load',
+    'NEGATIVE': 'Manual review required - possible data entry error or return transaction',
+    'DOMAIN': 'Map to a valid code or add it to the CHECK list after review',
+    'FUTURE': 'Set to NULL or CURRENT_DATE - 1 if > CURRENT_DATE',
+    'SENTINEL': 'Convert sentinel dates to NULL in the load',
+    'INVALID': 'Cast with SAFE_CAST, route failures to a reject table',
+    'PATTERN': 'Standardize or mask non-conforming values in the cleansing pipeline (1.4)',
+    'ENCODING': 'UTF-8 conversion with unicode normalization (check the CCSID of the extract)',
+    'DUPLICATE': 'Deduplicate on the key before load, keep latest by change timestamp',
+}
+
+COUNTERS = ['Rows', 'Nulls', 'Blanks', 'Invalid', 'Distinct', 'Negatives', 'Out_Of_Domain', 'Future', 'Sentinels',
+            'Pattern_Violations', 'Encoding_Errors']
+PROFILE_COLUMNS = ['App_ID', 'File_Name', 'Column_Name', 'Family', 'Rows', 'Nulls', 'Blanks', 'Invalid',
+                   'Distinct', 'Min', 'Max', 'P01', 'P50', 'P99', 'Negatives', 'Out_Of_Domain', 'Future',
+                   'Sentinels', 'Pattern_Violations', 'Encoding_Errors', 'Top_Values', 'Classes']
+
+
+def _mix(hashes):
+    """splitmix64 finalizer: every output bit depends on every input bit"""
+    hashes = (hashes ^ (hashes >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    hashes = (hashes ^ (hashes >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return hashes ^ (hashes >> np.uint64(31))
+
+
+def _utf8(values):
+    """(offsets, bytes) of a string Series as one Arrow large_string buffer (no copy of the text)"""
+    array = pa.array(values, type=pa.large_string())
+    _, offsets, data = array.buffers()
+    offsets = np.frombuffer(offsets, dtype=np.int64)[array.offset:array.offset + len(array) + 1]
+    data = np.frombuffer(data, dtype=np.uint8) if data is not None else np.zeros(0, dtype=np.uint8)
+    return offsets, data[offsets[0]:offsets[-1]]
+
+
+def hash_strings(values):
+    """
+    64-bit hashes of a string Series, straight from the UTF-8 bytes: polynomial over the bytes
+    (mod 2^64), then _mix. Same string → same hash in every batch, file and process
+    """
+    if not len(values):
+        return np.zeros(0, dtype=np.uint64)
+    offsets, data = _utf8(values)
+    lengths = np.diff(offsets)
+    position = np.arange(offsets[0], offsets[-1]) - np.repeat(offsets[:-1], lengths)
+    powers = np.cumprod(np.full(int(lengths.max(initial=0)) + 1, 0x100000001B3, dtype=np.uint64))
+    terms = (data.astype(np.uint64) + np.uint64(1)) * powers[position]
+    sums = np.concatenate([np.zeros(1, dtype=np.uint64), np.cumsum(terms, dtype=np.uint64)])
+    return _mix(sums[offsets[1:] - offsets[0]] - sums[offsets[:-1] - offsets[0]] + lengths.astype(np.uint64))
+
+
+@functools.cache
+def _byte_classes():
+    """CHAR_CLASSES bit per byte value (UTF-8 lead and continuation bytes are all NON_ASCII)"""
+    return np.array([sum(1 << bit for bit, pattern in enumerate(CHAR_CLASSES.values()) if re.match(pattern, chr(b)))
+                     for b in range(256)], dtype=np.int64)
+
+
+def char_classes(values):
+    """Bitmask of the CHAR_CLASSES each string contains (one lookup per UTF-8 byte)"""
+    masks = np.zeros(len(values), dtype=np.int64)
+    if not len(values):
+        return masks
+    offsets, data = _utf8(values)
+    starts = offsets[:-1] - offsets[0]
+    filled = np.diff(offsets) > 0
+    if filled.any():
+        masks[filled] = np.bitwise_or.reduceat(_byte_classes()[data], starts[filled])
+    return masks
+
+
+class HyperLogLog:
+    """Distinct count of 64-bit hashes in 2^precision registers"""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, hashes):
+        bits = 64 - self.precision
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        index = (hashes >> np.uint64(bits)).astype(np.intp)
+        # rank = leading zeros of the low bits + 1; frexp's exponent is the bit length
+        # (exact: the low bits fit a float64 mantissa for precision ≥ 11)
+        low = (hashes & np.uint64((1 << bits) - 1)).astype(np.float64)
+        rank = (bits + 1 - np.frexp(low)[1]).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        """Union of the two hash sets: register-wise max (exact, any order)"""
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.ldexp(1.0, -self.registers.astype(np.int64)).sum()
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting for small cardinalities
+        return estimate
+
+    def error(self):
+        """Relative standard error of count()"""
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+class CountMinSketch:
+    """Frequency estimates (never under) of weighted values, and the most frequent candidates"""
+
+    def __init__(self, depth=CMS_DEPTH, width=CMS_WIDTH, top=HEAVY_HITTERS):
+        self.width, self.top = width, top
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.candidates = {}  # value → hash
+
+    def _cells(self, hashes):
+        """Row-wise counter index per hash (double hashing: h1 + row × h2)"""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        h1, h2 = hashes & np.uint64(0xFFFFFFFF), (hashes >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(len(self.table), dtype=np.uint64)[:, None]
+        return ((h1[None, :] + rows * h2[None, :]) % np.uint64(self.width)).astype(np.intp)
+
+    def estimate(self, hashes):
+        cells = self._cells(hashes)
+        return self.table[np.arange(len(self.table))[:, None], cells].min(axis=0)
+
+    def add(self, values, hashes, counts):
+        counts = np.asarray(counts, dtype=np.int64)
+        for row, cells in enumerate(self._cells(hashes)):
+            self.table[row] += np.bincount(cells, weights=counts, minlength=self.width).astype(np.int64)
+        for i in np.argsort(-counts, kind='stable')[:self.top]:
+            self.candidates[values[i]] = hashes[i]
+        self._trim()
+
+    def merge(self, other):
+        """Counters add up; candidates of both, trimmed by the combined estimates"""
+        self.table += other.table
+        self.candidates.update(other.candidates)
+        self._trim()
+        return self
+
+    def _trim(self):
+        if len(self.candidates) > self.top:
+            self.candidates = dict(self.heavy_hitters(self.candidates))
+
+    def heavy_hitters(self, candidates=None):
+        """[(value, hash)] of the top candidates by estimated count, ties by value"""
+        candidates = self.candidates if candidates is None else candidates
+        if not candidates:
+            return []
+        values = list(candidates)
+        estimates = self.estimate(np.array([candidates[v] for v in values], dtype=np.uint64))
+        order = sorted(range(len(values)), key=lambda i: (-estimates[i], str(values[i])))[:self.top]
+        return [(values[i], candidates[values[i]]) for i in order]
+
+    def error(self):
+        """Over-count bound of estimate() (e / width of the total weight, 1 - e^-depth confidence)"""
+        return math.e / self.width * int(self.table[0].sum())
+
+
+class TDigest:
+    """Merging t-digest (k1 scale): weighted centroids, dense at the tails"""
+
+    def __init__(self, compression=DIGEST_COMPRESSION):
+        self.compression = compression
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+
+    def add(self, values, weights):
+        means = np.concatenate([self.means, np.asarray(values, dtype=np.float64)])
+        weights = np.concatenate([self.weights, np.asarray(weights, dtype=np.float64)])
+        if not len(means):
+            return
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        q = (np.cumsum(weights) - weights / 2) / weights.sum()
+        k = np.floor(self.compression / (2 * math.pi) * np.arcsin(2 * q - 1))
+        _, group = np.unique(k, return_inverse=True)
+        self.weights = np.bincount(group, weights=weights)
+        self.means = np.bincount(group, weights=weights * means) / self.weights
+
+    def merge(self, other):
+        """Centroids of both, recompressed (order-sensitive at the bit level: reduce in a fixed order)"""
+        self.add(other.means, other.weights)
+        return self
+
+    def quantile(self, q):
+        if not len(self.means):
+            return math.nan
+        centers = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(q * self.weights.sum(), centers, self.means))
+
+
+class ColumnProfile:
+    """Bounded-memory profile of one column; update() with batches of raw strings"""
+
+    def __init__(self, family, domain=None, as_of=ASSESSMENT_DATE):
+        self.family = family
+        self.domain = domain  # allowed values (CHK IN list) or None
+        self.as_of = pd.Timestamp(as_of)
+        self.rows = self.nulls = self.blanks = self.invalid = 0
+        self.negatives = self.out_of_domain = self.future = self.sentinels = 0
+        self.minimum = self.maximum = None
+        self.distinct = HyperLogLog()
+        self.frequent = CountMinSketch()
+        self.digest = TDigest()
+        self.classes = np.zeros(1 << len(CHAR_CLASSES), dtype=np.int64)
+
+    def merge(self, other):
+        """Fold in the profile of the same column from another partition"""
+        for counter in ('rows', 'nulls', 'blanks', 'invalid', 'negatives', 'out_of_domain', 'future', 'sentinels'):
+            setattr(self, counter, getattr(self, counter) + getattr(other, counter))
+        if other.minimum is not None:
+            self._extremes(other.minimum, other.maximum)
+        self.distinct.merge(other.distinct)
+        self.frequent.merge(other.frequent)
+        self.digest.merge(other.digest)
+        self.classes += other.classes
+        return self
+
+    def _extremes(self, low, high):
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+
+    def update(self, raw):
+        self.rows += len(raw)
+        stripped = raw.str.strip()
+        empty = (stripped == '').to_numpy(dtype=bool)
+        self.nulls += int((raw == '').sum())
+        self.blanks += int(empty.sum()) - int((raw == '').sum())
+        counts = stripped[~empty].value_counts(sort=False)
+        if counts.empty:
+            return
+        values = pd.Series(counts.index.array)
+        weights = counts.to_numpy(dtype=np.int64)
+        hashes = hash_strings(values)
+        self.distinct.add(hashes)
+        self.frequent.add(values.tolist(), hashes, weights)
+        if self.domain is not None:
+            self.out_of_domain += int(weights[~values.isin(self.domain).to_numpy()].sum())
+
+        if self.family in NUMERIC_FAMILIES:
+            numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = ~np.isnan(numbers)
+            self.invalid += int(weights[~valid].sum())
+            numbers, weights = numbers[valid], weights[valid]
+            self.negatives += int(weights[numbers < 0].sum())
+        elif self.family in TIME_FAMILIES:
+            sentinel = values.str.startswith(SENTINEL_DATES).to_numpy(dtype=bool)
+            self.sentinels += int(weights[sentinel].sum())
+            values, weights = values[~sentinel], weights[~sentinel]
+            if self.family == 'DATE':
+                stamps = pd.to_datetime(values, format='%Y-%m-%d', errors='coerce')
+            else:  # DB2 '2024-01-15-10.30.00.000000' or ISO
+                iso = values.str.replace(r'^(\d{4}-\d\d-\d\d)[-T ](\d\d)[.:](\d\d)[.:](\d\d)', r'\1 \2:\3:\4', regex=True)
+                stamps = pd.to_datetime(iso, format='ISO8601', errors='coerce')
+            valid = stamps.notna().to_numpy()
+            self.invalid += int(weights[~valid].sum())
+            stamps, weights = stamps[valid], weights[valid]
+            self.future += int(weights[(stamps > self.as_of).to_numpy()].sum())
+            numbers = ((stamps - pd.Timestamp('1970-01-01')) / pd.Timedelta(days=1)).to_numpy(dtype=np.float64)
+        else:
+            mask = char_classes(values)
+            self.classes += np.bincount(mask, weights=weights, minlength=len(self.classes)).astype(np.int64)
+            self._extremes(values.min(), values.max())
+            numbers = values.str.len().to_numpy(dtype=np.float64)
+        if len(numbers):
+            if self.family in NUMERIC_FAMILIES or self.family in TIME_FAMILIES:
+                self._extremes(float(numbers.min()), float(numbers.max()))
+            self.digest.add(numbers, weights)
+
+    def summary(self):
+        """One PROFILE_COLUMNS row (without App_ID / File_Name / Column_Name)"""
+        dates = self.family in TIME_FAMILIES
+
+        def shown(value):
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                return ''
+            if dates:
+                return str((pd.Timestamp('1970-01-01') + pd.Timedelta(days=value)).date())
+            return value if isinstance(value, str) else f'{value:g}'
+
+        valid = self.rows - self.nulls - self.blanks - self.invalid - self.sentinels
+        text = not dates and self.family not in NUMERIC_FAMILIES
+        quantiles = {f'P{round(q * 100):02d}': self.digest.quantile(q) for q in QUANTILES}
+        digits_only = int(self.classes[DIGITS_ONLY])
+        numeric_text = text and valid and digits_only / valid >= PATTERN_DOMINANCE
+        top = self.frequent.heavy_hitters()
+        estimates = self.frequent.estimate(np.array([h for _, h in top], dtype=np.uint64)) if top else []
+        # only values whose count stands out of the sketch's collision noise
+        top = [(value, e) for (value, _), e in zip(top, estimates) if e > self.frequent.error()]
+        names = list(CHAR_CLASSES)
+        classes = sorted(((int(n), '+'.join(names[b] for b in range(len(names)) if mask >> b & 1) or 'EMPTY')
+                          for mask, n in enumerate(self.classes) if n), reverse=True)
+        return {
+            'Family': self.family, 'Rows': self.rows, 'Nulls': self.nulls, 'Blanks': self.blanks,
+            'Invalid': self.invalid, 'Distinct': int(round(min(self.distinct.count(), max(valid, 0)))),
+            'Min': shown(self.minimum), 'Max': shown(self.maximum),
+            **{name: f'{value:g} chars' if text and not math.isnan(value) else shown(value)
+               for name, value in quantiles.items()},
+            'Negatives': self.negatives, 'Out_Of_Domain': self.out_of_domain, 'Future': self.future,
+            'Sentinels': self.sentinels,
+            'Pattern_Violations': valid - digits_only if numeric_text else 0,
+            'Encoding_Errors': int(self.classes[(np.arange(len(self.classes)) & ENCODING_CLASSES) > 0].sum()),
+            'Top_Values': ', '.join(f'{v}:{e:,}' for v, e in top),
+            'Classes': ', '.join(f'{name}:{n:,}' for n, name in classes[:5]),
+        }
+
+
+class KeyProfile:
+    """Rows with a complete key and distinct combined values of a multi-field key"""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.rows = 0
+        self.distinct = HyperLogLog(KEY_HLL_PRECISION)
+
+    def update(self, frame):
+        # rows with a blank key field are NULL keys (COMPLETENESS), not duplicates of each other
+        fields = [frame[field].str.strip() for field in self.fields]
+        keyed = np.logical_and.reduce([(field != '').to_numpy(dtype=bool) for field in fields])
+        self.rows += int(keyed.sum())
+        hashes = np.zeros(int(keyed.sum()), dtype=np.uint64)
+        for field in fields:
+            hashes = _mix(hashes * np.uint64(31) ^ hash_strings(field[keyed]))
+        self.distinct.add(hashes)
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.distinct.merge(other.distinct)
+        return self
+
+    def duplicates(self):
+        """Rows beyond the distinct count, 0 within 3 standard errors of the estimate"""
+        distinct = self.distinct.count()
+        excess = self.rows - distinct
+        return int(round(excess)) if excess > 3 * self.distinct.error() * self.rows else 0
+
+
+def _file_columns(schema):
+    """(App_ID, File_Name) → (columns frame: Column_Name, Family, Domain; key fields)"""
+    _, columns = split_catalog(schema)
+    columns = columns.join(column_types(columns)[['Family']])
+    domains = schema[['App_ID', 'File_Name']].join(schema['Constraints'].fillna('').str.extractall(
+        r'CHK\((\w+)\s+IN\s*\(([^()]*)\)\)').droplevel(1), how='inner')
+    domain = {(app, name, column): frozenset(v.strip().strip("'") for v in values.split(','))
+              for app, name, column, values in domains.itertuples(index=False)}
+    keys = schema['Constraints'].fillna('').str.extract(r'\bPK\(([^)]*)\)')[0]
+    key_fields = {(app, name): [k.strip() for k in key.split(',')]
+                  for app, name, key in zip(schema['App_ID'], schema['File_Name'], keys) if isinstance(key, str)}
+    files = {}
+    for (app, name), group in columns.groupby(['App_ID', 'File_Name'], sort=False):
+        group = group.assign(Domain=[domain.get((app, name, c)) for c in group['Column_Name']])
+        files[(app, name)] = (group[['Column_Name', 'Family', 'Domain']], key_fields.get((app, name), []))
+    return files
+
+
+def extract_files(root=PROFILE_ROOT):
+    """[(App_ID, File_Name, path)] of the extracts under root (File_Name: file name up to the first '.')"""
+    found = []
+    if not os.path.isdir(root):
+        return found
+    for app in sorted(os.listdir(root)):
+        directory = os.path.join(root, app)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path) and name.lower().endswith('.csv'):
+                found.append((app, name.split('.')[0].upper(), path))
+    return found
+
+
+def profile_file(path, columns, key_fields=(), as_of=ASSESSMENT_DATE, block_bytes=BLOCK_BYTES):
+    """
+    Single streamed pass over one extract: {Column_Name: ColumnProfile} plus 'PK(...)': KeyProfile
+    for the key; columns: Column_Name, Family, Domain (extract columns not in it profile as text)
+    """
+    import pyarrow.csv as pcsv
+
+    with open(path, newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f), [])
+    names = [name.strip().upper() for name in header]
+    families = dict(zip(columns['Column_Name'], columns['Family']))
+    domains = dict(zip(columns['Column_Name'], columns['Domain']))
+    profiles = {name: ColumnProfile(families.get(name, 'VARCHAR'), domains.get(name), as_of) for name in names}
+    if key_fields and set(key_fields) <= set(names):
+        profiles[f"PK({','.join(key_fields)})"] = KeyProfile(list(key_fields))
+    reader = pcsv.open_csv(
+        path, read_options=pcsv.ReadOptions(block_size=block_bytes),
+        convert_options=pcsv.ConvertOptions(column_types={name: pa.string() for name in header},
+                                            strings_can_be_null=False))
+    for batch in reader:
+        frame = batch.to_pandas()
+        frame.columns = names
+        for name, profile in profiles.items():
+            if isinstance(profile, KeyProfile):
+                profile.update(frame)
+            elif name in frame:
+                profile.update(frame[name])
+    return profiles
+
+
+def summarize(app, file_name, profiles):
+    """PROFILE_COLUMNS rows of one file's profiles (key profiles as Family 'KEY')"""
+    rows = []
+    for name, profile in profiles.items():
+        if isinstance(profile, KeyProfile):
+            row = {**dict.fromkeys(PROFILE_COLUMNS[3:], ''), **dict.fromkeys(COUNTERS, 0), 'Family': 'KEY',
+                   'Rows': profile.rows, 'Distinct': int(round(min(profile.distinct.count(), profile.rows))),
+                   'Duplicates': profile.duplicates()}
+        else:
+            row = {**profile.summary(), 'Duplicates': 0}
+        rows.append({'App_ID': app, 'File_Name': file_name, 'Column_Name': name, **row})
+    return rows
+
+
+def merge_profiles(profiles, other):
+    """Fold one partition's profiles into the table's (columns missing so far are taken over)"""
+    for name, profile in other.items():
+        if name in profiles:
+            profiles[name].merge(profile)
+        else:
+            profiles[name] = profile
+    return profiles
+
+
+def _profile_task(task):
+    """Worker: (path, columns, key_fields, as_of, block_bytes) → (profiles, seconds)"""
+    began = time.perf_counter()
+    profiles = profile_file(*task)
+    return profiles, time.perf_counter() - began
+
+
+def profile_extracts(schema, root=PROFILE_ROOT, as_of=ASSESSMENT_DATE, workers=None, block_bytes=BLOCK_BYTES):
+    """
+    Profile every extract of a cataloged file: PROFILE_COLUMNS (+ Duplicates, Profile_Seconds:
+    summed over the partitions) per column.
+
+    Each extract file (partition, LPAR) is profiled on its own, in a process pool, and the
+    partitions of a table are merged in file order. The merge order is fixed, so 1 or N
+    workers give identical profiles. Results are consumed in order as they arrive, so only
+    partitions finished ahead of the next one in line are held in memory.
+    """
+    catalog = _file_columns(schema)
+    files = [(app, name, path) for app, name, path in extract_files(root) if (app, name) in catalog]
+    tasks = [(path, *catalog[(app, name)], as_of, block_bytes) for app, name, path in files]
+    workers = workers or os.cpu_count() or 1
+    tables, seconds = {}, {}
+
+    def reduce(results):
+        for (app, name, _), (profiles, task_seconds) in zip(files, results):
+            merge_profiles(tables.setdefault((app, name), {}), profiles)
+            seconds[(app, name)] = seconds.get((app, name), 0.0) + task_seconds
+
+    if workers == 1 or len(tasks) < 2:
+        reduce(map(_profile_task, tasks))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            reduce(pool.map(_profile_task, tasks))
+
+    rows = []
+    for (app, name), profiles in tables.items():
+        rows += [{**row, 'Profile_Seconds': seconds[(app, name)]} for row in summarize(app, name, profiles)]
+    return pd.DataFrame(rows, columns=[*PROFILE_COLUMNS, 'Duplicates', 'Profile_Seconds'])
+
+
+def _severity(share):
+    for severity, threshold in SEVERITY_SHARE:
+        if share >= threshold:
+            return severity
+    return 'LOW'
+
+
+def profile_issues(profile, schema):
+    """Issues in the 1.2 quality_issues layout from a profile_extracts frame"""
+    keys = schema['Constraints'].fillna('').str.extract(r'\bPK\(([^)]*)\)')[0]
+    key_columns = {(app, name, field.strip()) for app, name, key in zip(schema['App_ID'], schema['File_Name'], keys)
+                   if isinstance(key, str) for field in key.split(',')}
+    issues = []
+    for row in profile.itertuples(index=False):
+        rows = max(row.Rows, 1)
+        in_key = (row.App_ID, row.File_Name, row.Column_Name) in key_columns
+
+        def issue(kind, affected, description, fix, floor='LOW'):
+            severity = min(_severity(affected / rows), floor, key=SEVERITIES.index)
+            issues.append({
+                'App_ID': row.App_ID, 'File_Name': row.File_Name, 'Column_Name': row.Column_Name,
+                'Issue_Type': kind, 'Issue_Description': description, 'Affected_Rows': int(affected),
+                'Severity': severity, 'Proposed_Fix': ISSUE_FIXES[fix]})
+
+        if row.Family == 'KEY':
+            if row.Duplicates:
+                issue('UNIQUENESS', row.Duplicates, f'Duplicate keys {row.Column_Name} (HyperLogLog estimate)',
+                      'DUPLICATE', 'HIGH')
+            continue
+        if row.Nulls + row.Blanks:
+            issue('COMPLETENESS', row.Nulls + row.Blanks, f'NULL ({row.Nulls:,}) / blank ({row.Blanks:,}) values',
+                  'NULL_KEY' if in_key else 'NULL', 'CRITICAL' if in_key else 'LOW')
+        if row.Negatives and re.search(NON_NEGATIVE, row.Column_Name) and not re.search(SIGNED, row.Column_Name):
+            issue('RANGE_VIOLATION', row.Negatives, f'Negative values detected (min {row.Min})', 'NEGATIVE', 'HIGH')
+        if row.Out_Of_Domain:
+            issue('RANGE_VIOLATION', row.Out_Of_Domain, 'Values outside the CHECK list', 'DOMAIN')
+        if row.Future:
+            issue('TEMPORAL_ANOMALY', row.Future, f'Future dates detected (max {row.Max})', 'FUTURE')
+        if row.Sentinels:
+            issue('TEMPORAL_ANOMALY', row.Sentinels, f"Default dates ({', '.join(SENTINEL_DATES)}) used as NULL substitute",
+                  'SENTINEL')
+        if row.Invalid:
+            issue('PATTERN_VIOLATION', row.Invalid, f'Values not parseable as {row.Family}', 'INVALID')
+        if row.Pattern_Violations:
+            issue('PATTERN_VIOLATION', row.Pattern_Violations, 'Non-numeric characters in a numeric code column',
+                  'PATTERN')
+        if row.Encoding_Errors:
+            issue('DATA_QUALITY', row.Encoding_Errors, 'Non-ASCII / control characters - encoding corruption',
+                  'ENCODING')
+    return pd.DataFrame(issues, columns=['App_ID', 'File_Name', 'Column_Name', 'Issue_Type', 'Issue_Description',
+                                         'Affected_Rows', 'Severity', 'Proposed_Fix'])
+
+
+def synthetic_extract(path, columns, rows, key_fields=(), seed=0, first_key=0, block_rows=1_000_000):
+    """
+    Benchmark extract with a header for the catalog columns (Column_Name, Family, Length, Domain):
+    1% NULLs, 0.5% negatives, 0.2% future and 0.2% sentinel dates, 0.1% values outside a CHK
+    list or with letters / non-ASCII in digit codes; key fields count up from first_key with
+    0.1% repeats
+    """
+    import pyarrow.csv as pcsv
+
+    rng = np.random.default_rng(seed)
+    names = list(columns['Column_Name'])
+    with pcsv.CSVWriter(path, pa.schema([(name, pa.string()) for name in names])) as writer:
+        for start in range(0, rows, block_rows):
+            n = min(block_rows, rows - start)
+            data = {}
+            for column in columns.itertuples(index=False):
+                length = int(column.Length) if pd.notna(column.Length) else 10
+                if column.Column_Name in key_fields:
+                    ids = np.arange(first_key + start, first_key + start + n)
+                    repeat = rng.random(n) < 0.001
+                    ids[repeat] = rng.integers(first_key, first_key + start + 1, int(repeat.sum()))
+                    text = ids.astype(str).astype(object)
+                elif column.Family in NUMERIC_FAMILIES:
+                    values = np.round(rng.lognormal(3, 1.5, n), 0 if column.Family in INTEGER_FAMILIES else 2)
+                    values[rng.random(n) < 0.005] *= -1
+                    text = (values.astype(np.int64) if column.Family in INTEGER_FAMILIES else values).astype(str).astype(object)
+                elif column.Family in TIME_FAMILIES:
+                    days = np.datetime64(ASSESSMENT_DATE.date()) - rng.integers(1, 3650, n).astype('timedelta64[D]')
+                    days[rng.random(n) < 0.002] += np.timedelta64(900, 'D')
+                    text = days.astype(str).astype(object)
+                    text[rng.random(n) < 0.002] = '1900-01-01'
+                    if column.Family == 'TIMESTAMP':
+                        text = text + '-12.30.00.000000'
+                elif column.Domain:
+                    text = rng.choice(sorted(column.Domain), n).astype(object)
+                    text[rng.random(n) < 0.001] = '?'
+                else:
+                    digits = min(length, 12)
+                    text = rng.integers(0, 10 ** digits, n).astype(str).astype(object)
+                    text[rng.random(n) < 0.001] = 'X' * min(length, 4)
+                    text[rng.random(n) < 0.001] = 'Ü' + 'A' * (min(length, 4) - 1)
+                text[rng.random(n) < 0.01] = ''
+                data[column.Column_Name] = pa.array(text, type=pa.string())
+            writer.write_table(pa.table(data))
+
+
+if __name__ == '__main__':
+    import argparse
+    import resource
+    import tempfile
+
+    from pipeline import upstream
+
+    parser = argparse.ArgumentParser(description='Profile extracts against the schema catalog (Task 1.2)')
+    parser.add_argument('--root', default=PROFILE_ROOT, help='extracts: <root>/<App_ID>/<File_Name>[.<part>].csv')
+    parser.add_argument('--rows', type=int, default=0, help='benchmark: profile a generated WHXFER extract of N rows')
+    parser.add_argument('--partitions', type=int, default=1, help='benchmark: split the N rows over this many files')
+    parser.add_argument('--workers', default=None, help='process pool size, or a list to compare (e.g. 1,2,4,8)')
+    args = parser.parse_args()
+
+    schema = upstream('schema_catalog')
+    root = args.root
+    if args.rows:
+        root = tempfile.mkdtemp(prefix='profile_bench_')
+        columns, key_fields = _file_columns(schema)[('WMS001', 'WHXFER')]
+        types = column_types(split_catalog(schema[schema['File_Name'] == 'WHXFER'])[1])
+        columns = columns.assign(Length=types['Length'].to_numpy())
+        os.makedirs(os.path.join(root, 'WMS001'))
+        per_partition = -(-args.rows // args.partitions)
+        for part in range(args.partitions):
+            rows = min(per_partition, args.rows - part * per_partition)
+            path = os.path.join(root, 'WMS001', f'WHXFER.{part:04d}.csv' if args.partitions > 1 else 'WHXFER.csv')
+            synthetic_extract(path, columns, rows, key_fields, seed=part, first_key=part * per_partition)
+        size = sum(os.path.getsize(path) for *_, path in extract_files(root))
+        print(f"[Generated]: {args.rows:,} rows in {args.partitions} files, {size / 1024 ** 2:,.0f} MB")
+
+    runs = []
+    for workers in [int(w) for w in args.workers.split(',')] if args.workers else [None]:
+        started = time.perf_counter()
+        profile = profile_extracts(schema, root, workers=workers)
+        runs.append((workers or os.cpu_count() or 1, time.perf_counter() - started, profile))
+    rows = profile.groupby(['App_ID', 'File_Name'])['Rows'].max().sum() if len(profile) else 0
+    scaling = pd.DataFrame([(workers, seconds, run.groupby(['App_ID', 'File_Name'])['Profile_Seconds'].max().sum())
+                            for workers, seconds, run in runs], columns=['Workers', 'Seconds', 'Task_Seconds'])
+    scaling['Rows_Per_Sec'] = (rows / scaling['Seconds']).round().astype(int)
+    scaling['Speedup'] = scaling['Seconds'].iloc[0] / scaling['Seconds'] * scaling['Workers'].iloc[0]
+    # Amdahl from the first run: what is not partition work (setup, merges) stays serial
+    first = scaling.iloc[0]
+    serial = max(first['Seconds'] - first['Task_Seconds'] / first['Workers'], 0.0)
+    scaling['Bound'] = first['Seconds'] * first['Workers'] / (serial + first['Task_Seconds'] / scaling['Workers'])
+    print(f"[Profiled]: {profile[['App_ID', 'File_Name']].drop_duplicates().shape[0]} tables, {rows:,} rows, "
+          f"{os.cpu_count()} CPUs, peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:,.0f} MB "
+          f"(parent) / {resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024:,.0f} MB (largest worker)")
+    print(scaling.round(2).to_markdown(index=False))
+    print(f"Serial share {serial / first['Seconds']:.1%} of the first run; Bound: speedup with that many free cores")
+    results = [run.drop(columns=['Profile_Seconds']) for *_, run in runs]
+    if not all(result.equals(results[0]) for result in results):
+        raise ValueError('profiles differ between worker counts')
+    print(profile.drop(columns=['Profile_Seconds']).to_markdown(index=False))
+    print(profile_issues(profile, schema).to_markdown(index=False))
@@ -0,0 +1,202 @@
+# scripts/compliance_rules.py
+import re
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Compliance rules engine for Task 0.5 (replaces the if/elif classification chains)
+# Scope is declared, not coded: SCOPE_RULES put apps, files or columns in a framework's scope,
+# FRAMEWORKS says which data classification each framework implies, CLASSIFICATIONS holds the
+# encryption requirement and GCP controls per classification. Adding a framework is a new
+# FRAMEWORKS row plus its scope rules.
+#
+# Rules are compiled once: 'equals' rules become one hash table per (level, field), 'regex'
+# rules are evaluated vectorized over the distinct values of their field only. A target's
+# frameworks are a bitmask; columns roll up into their file (an LF also takes its based-on
+# file's scope), files into their app, so the whole catalog is classified in one pass:
+#   Compliance_Frameworks = frameworks in scope (FRAMEWORKS order)
+#   Data_Classification   = strictest classification implied by them (CLASSIFICATIONS order)
+
+LEVELS = ('APP', 'FILE', 'COLUMN')
+
+# framework → data classification it implies (None: controls framework only); also report order
+FRAMEWORKS = {
+    'PCI-DSS': 'PCI',
+    'SOX': 'SOX',
+    'PII': 'PII',
+    'GDPR': 'PII',
+    'ISO-27001': None,
+}
+
+# classification → (encryption requirement, GCP controls on top of BASELINE_CONTROLS); strictest first
+CLASSIFICATIONS = {
+    'PCI': ('AES-256 (at-rest), TLS 1.3 (in-transit)', ['DLP API', 'Cloud HSM', 'VPC Service Controls']),
+    'PII': ('AES-256 (at-rest), TLS 1.3 (in-transit)', ['DLP API', 'Access Transparency']),
+    'SOX': ('AES-256 (at-rest), TLS 1.2+ (in-transit)', ['Assured Workloads', 'Access Approval']),
+    'Internal': ('AES-256 (at-rest recommended)', []),
+}
+DEFAULT_CLASSIFICATION = 'Internal'
+BASELINE_CONTROLS = ['VPC-SC', 'Cloud KMS', 'Cloud Audit Logs']
+
+# (level, field, match, value or pattern (full match), framework)
+SCOPE_RULES = [
+    # Application owners' attestations
+    ('APP', 'App_ID', 'equals', 'PAYMENT007', 'PCI-DSS'),
+    ('APP', 'App_ID', 'equals', 'PAYMENT007', 'SOX'),
+    ('APP', 'App_ID', 'equals', 'POS003', 'PCI-DSS'),
+    ('APP', 'App_ID', 'equals', 'MEMBER006', 'PII'),
+    ('APP', 'App_ID', 'equals', 'MEMBER006', 'GDPR'),
+    ('APP', 'App_ID', 'equals', 'ACCT010', 'SOX'),
+    ('APP', 'App_ID', 'equals', 'PAYROLL019', 'SOX'),
+    ('APP', 'App_ID', 'equals', 'PAYROLL019', 'PII'),
+    ('APP', 'App_ID', 'equals', 'AUDIT022', 'SOX'),
+    ('APP', 'App_ID', 'equals', 'AUDIT022', 'ISO-27001'),
+    ('APP', 'App_ID', 'equals', 'SECURITY018', 'ISO-27001'),
+    ('APP', 'App_ID', 'equals', 'LOYALTY021', 'PII'),
+    ('APP', 'App_ID', 'equals', 'RETURNS016', 'PII'),
+    ('APP', 'App_ID', 'equals', 'TIMECLK020', 'PII'),
+    # Cardholder data (PAN or its token, expiry, verification values, track data)
+    ('COLUMN', 'Column_Name', 'regex', r'CARD_(?:NUM(?:BER)?|NO|TOKEN)|PAN|CVV2?|CVC2?|TRACK[12]?_DATA|EXP_(?:MONTH|YEAR|DATE)', 'PCI-DSS'),
+    # Personal data
+    ('COLUMN', 'Column_Name', 'regex', r'SSN|SOC_SEC_\w+|BIRTH_DATE|DOB|(?:FIRST|LAST|FULL|MEMBER|EMPLOYEE)_NAME|'
+                                       r'E?MAIL_ADDR\w*|EMAIL\w*|(?:HOME_|MOBILE_|CELL_)?PHONE\w*|'
+                                       r'(?:HOME|STREET|MAILING)_ADDR\w*|DRIVER_LIC\w*|BANK_ACCT\w*', 'PII'),
+    # Financial reporting (general-ledger postings)
+    ('COLUMN', 'Column_Name', 'regex', r'GL_\w+', 'SOX'),
+]
+
+OUTPUT_COLUMNS = ['Compliance_Frameworks', 'Data_Classification', 'Encryption_Requirement', 'GCP_Security_Controls']
+
+_COLUMN_SPLIT = r',\s*(?![^()]*\))'  # commas outside type parentheses: DECIMAL(15,2)
+_BASED_ON = re.compile(r'\bFROM\s+(?:\w+[./])?(\w+)', re.I)
+
+
+class ComplianceRules:
+    """
+    Compiled SCOPE_RULES: per (level, field) a value → bitmask table ('equals') and a list of
+    (pattern, bitmask) ('regex'). Bit i = i-th framework of FRAMEWORKS.
+    """
+
+    def __init__(self, rules=SCOPE_RULES, frameworks=FRAMEWORKS, classifications=CLASSIFICATIONS):
+        self.frameworks = list(frameworks)
+        self.implies = frameworks
+        self.classifications = classifications
+        self.bit = {framework: 1 << i for i, framework in enumerate(self.frameworks)}
+        self.exact, self.patterns = {}, {}
+        for level, field, match, value, framework in rules:
+            if level not in LEVELS:
+                raise ValueError(f"Unknown rule level: {level}")
+            if framework not in self.bit:
+                raise KeyError(f"Rule references undeclared framework: {framework}")
+            if match == 'equals':
+                table = self.exact.setdefault((level, field), {})
+                table[value] = table.get(value, 0) | self.bit[framework]
+            elif match == 'regex':
+                self.patterns.setdefault((level, field), []).append((value, self.bit[framework]))
+            else:
+                raise ValueError(f"Unknown rule match: {match}")
+
+    def masks(self, level, frame):
+        """Framework bitmask per row of frame from the rules of level"""
+        mask = np.zeros(len(frame), dtype=np.int64)
+        fields = {field for lvl, field in [*self.exact, *self.patterns] if lvl == level}
+        for field in sorted(fields):
+            if field not in frame:
+                continue
+            codes, uniques = pd.factorize(frame[field])
+            table = self.exact.get((level, field), {})
+            per_value = np.array([table.get(value, 0) for value in uniques], dtype=np.int64)
+            values = pd.Series(uniques, dtype='string')
+            for pattern, bit in self.patterns.get((level, field), []):
+                per_value |= np.where(values.str.fullmatch(pattern).fillna(False).to_numpy(dtype=bool), bit, 0)
+            mask |= np.where(codes >= 0, per_value[codes] if len(per_value) else 0, 0)
+        return mask
+
+    def frameworks_mask(self, lists):
+        """Bitmask per entry of an iterable of comma-separated framework lists (None/'' = none)"""
+        masks = []
+        for entry in lists:
+            mask = 0
+            for framework in (entry.split(',') if isinstance(entry, str) and entry else []):
+                if framework not in self.bit:
+                    raise KeyError(f"Undeclared framework: {framework}")
+                mask |= self.bit[framework]
+            masks.append(mask)
+        return np.array(masks, dtype=np.int64)
+
+    def describe(self, masks, categorical=False):
+        """OUTPUT_COLUMNS for an array of bitmasks (derived once per distinct mask)"""
+        codes, uniques = pd.factorize(pd.Series(masks))
+        rows = []
+        for mask in uniques:
+            in_scope = [f for f in self.frameworks if mask & self.bit[f]]
+            implied = {self.implies[f] for f in in_scope}
+            classification = next((c for c in self.classifications if c in implied), DEFAULT_CLASSIFICATION)
+            encryption, controls = self.classifications[classification]
+            rows.append((','.join(in_scope), classification, encryption, ', '.join(BASELINE_CONTROLS + controls)))
+        table = pd.DataFrame(rows, columns=OUTPUT_COLUMNS)
+        if not categorical:
+            return table.iloc[codes].reset_index(drop=True)
+        described = {}
+        for name in OUTPUT_COLUMNS:
+            value_codes, categories = pd.factorize(table[name])
+            described[name] = pd.Categorical.from_codes(value_codes[codes], categories=categories)
+        return pd.DataFrame(described)
+
+    def evaluate(self, apps, files=None, columns=None, detected=None):
+        """
+        One pass over the catalog: apps (App_ID, ...), files (App_ID, File_Name, optional
+        Based_On) and columns (App_ID, File_Name, Column_Name) get OUTPUT_COLUMNS, with scope
+        rolled up column → file → app. detected (comma-separated frameworks per app row, e.g.
+        from data discovery) is added at app level; Declared_Classification then keeps the
+        classification from the rules alone. Returns (apps, files, columns) copies; file and
+        column outputs are Categoricals (a handful of distinct values over millions of rows).
+        """
+        app_mask = self.masks('APP', apps)
+        file_mask = None if files is None else self.masks('FILE', files)
+        column_mask = None if columns is None else self.masks('COLUMN', columns)
+        if files is not None:
+            file_index = pd.MultiIndex.from_frame(files[['App_ID', 'File_Name']])
+            if columns is not None:
+                owner = file_index.get_indexer(pd.MultiIndex.from_frame(columns[['App_ID', 'File_Name']]))
+                np.bitwise_or.at(file_mask, owner[owner >= 0], column_mask[owner >= 0])
+            if 'Based_On' in files:
+                base = file_index.get_indexer(pd.MultiIndex.from_arrays([files['App_ID'], files['Based_On']]))
+                file_mask[base >= 0] |= file_mask[base[base >= 0]]
+            owner = pd.Index(apps['App_ID']).get_indexer(files['App_ID'])
+            np.bitwise_or.at(app_mask, owner[owner >= 0], file_mask[owner >= 0])
+
+        def described(frame, mask, categorical=True):
+            frame = frame.copy(deep=False)
+            for name, values in self.describe(mask, categorical).items():
+                frame[name] = values.array
+            return frame
+
+        if detected is not None:
+            apps = apps.assign(Declared_Classification=self.describe(app_mask)['Data_Classification'].to_numpy())
+            app_mask = app_mask | self.frameworks_mask(detected)
+        return (described(apps, app_mask, categorical=False),
+                None if files is None else described(files, file_mask),
+                None if columns is None else described(columns, column_mask))
+
+
+def split_catalog(schema):
+    """
+    Schema catalog (1.1 schema_catalog) → (files, columns): files with Based_On (the file an
+    LF's SELECT reads), columns one row per 'NAME TYPE' entry of the physical files' Columns.
+    """
+    files = schema[['App_ID', 'File_Name', 'File_Type']].copy()
+    is_view = schema['Columns'].str.match(r'\s*SELECT\b', case=False).fillna(False)
+    files['Based_On'] = schema['Columns'].where(is_view).str.extract(_BASED_ON, expand=False)
+    entries = schema.loc[~is_view, ['App_ID', 'File_Name', 'Columns']]
+    entries = entries.assign(Entry=entries['Columns'].str.split(_COLUMN_SPLIT, regex=True)).explode('Entry')
+    parts = entries['Entry'].str.strip().str.extract(r'^(\S+)\s*(.*)$')
+    columns = pd.DataFrame({
+        'App_ID': entries['App_ID'].to_numpy(),
+        'File_Name': entries['File_Name'].to_numpy(),
+        'Column_Name': parts[0].to_numpy(),
+        'Column_Type': parts[1].to_numpy(),
+    }).dropna(subset=['Column_Name'])
+    return files, columns.reset_index(drop=True)
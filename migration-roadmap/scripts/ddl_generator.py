@@ -0,0 +1,434 @@
+# scripts/ddl_generator.py
+import re
+import time
+
+from compliance_rules import split_catalog
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Target DDL generator for Task 1.1 (replaces the hand-written WHITEM DDL block)
+# Works on the schema_catalog layout (Columns 'NAME TYPE, ...' or 'SELECT ...' for LFs,
+# Key_Fields, Constraints, Index_Strategy). The catalog is exploded into one row per column
+# once; type mapping, key cardinality, partition and cluster choice are column operations
+# over that frame, and only the final statement text is assembled per table.
+#
+# Types: DB2 for i CHAR/VARCHAR/GRAPHIC, DECIMAL/PACKED, NUMERIC/ZONED, SMALLINT/INT/BIGINT,
+# REAL/DOUBLE, DATE/TIME/TIMESTAMP, BINARY/BLOB/CLOB → TYPE_MAP per dialect (BigQuery: scale-0
+# decimals up to 18 digits become INT64, wider than NUMERIC allows BIGNUMERIC).
+#
+# Partitioning (time unit): Size_GB = Record_Count × Record_Length / 1024³ (the Task 1.1 size
+# estimate). Column: the Index_Strategy 'Partition by X' column if it is a DATE/TIMESTAMP, else
+# the first DATE/TIMESTAMP key field, else the first DATE/TIMESTAMP column that is not a
+# last-changed stamp (rows would move between partitions on update). Grain: the finest of
+# DAY/MONTH/YEAR (not finer than a '(daily|monthly|yearly)' hint) whose partitions average
+# MIN_PARTITION_GB over HISTORY_DAYS within MAX_PARTITIONS; no partitioning if none does.
+# Foreign key targets only partition on a hinted or key column. PostgreSQL adds the partition
+# column to the primary key, so foreign keys to a table partitioned on another column are
+# omitted (with a comment), and a DEFAULT partition takes rows until range partitions exist.
+#
+# Clustering (tables of MIN_CLUSTER_GB or more, up to MAX_CLUSTER_COLUMNS): a non-time
+# 'Partition by' column, 'cluster on' columns, key fields by ascending cardinality, the leading
+# keys of LFs over the file (most LFs first), 'index on' columns; the partition column and
+# columns below MIN_CLUSTER_CARDINALITY are skipped.
+# Cardinality estimate: Record_Count^(1/keys) per key field (independent fields), Record_Count
+# otherwise, capped by the column's domain (CHK IN list, type width, HISTORY_DAYS for dates).
+#
+# Run: python ddl_generator.py [--dialect bigquery|postgresql] [--out FILE] [--tables N]
+
+DIALECTS = ('bigquery', 'postgresql')
+
+HISTORY_DAYS = 7 * 365  # history held in a time-partitioned table (7-year PCI/SOX retention, Task 1.5)
+MIN_PARTITION_GB = 1.0  # below this per partition, clustering prunes as well without the partition overhead
+MAX_PARTITIONS = 10_000  # BigQuery limit per table
+GRAINS = [('DAY', 1), ('MONTH', 365 / 12), ('YEAR', 365)]
+HINT_GRAINS = {'daily': 'DAY', 'monthly': 'MONTH', 'yearly': 'YEAR'}
+MAX_CLUSTER_COLUMNS = 4  # BigQuery limit
+MIN_CLUSTER_GB = 64 / 1024  # BigQuery does not prune blocks of smaller tables
+MIN_CLUSTER_CARDINALITY = 100  # flags and codes do not prune
+
+# DB2 for i type → family
+FAMILIES = {
+    'CHAR': 'CHAR', 'CHARACTER': 'CHAR', 'GRAPHIC': 'CHAR', 'NCHAR': 'CHAR',
+    'VARCHAR': 'VARCHAR', 'VARGRAPHIC': 'VARCHAR', 'NVARCHAR': 'VARCHAR',
+    'CLOB': 'CLOB', 'DBCLOB': 'CLOB',
+    'DECIMAL': 'DECIMAL', 'DEC': 'DECIMAL', 'PACKED': 'DECIMAL', 'NUMERIC': 'DECIMAL', 'ZONED': 'DECIMAL',
+    'SMALLINT': 'SMALLINT', 'INT': 'INTEGER', 'INTEGER': 'INTEGER', 'BIGINT': 'BIGINT',
+    'REAL': 'REAL', 'FLOAT': 'DOUBLE', 'DOUBLE': 'DOUBLE', 'DOUBLE PRECISION': 'DOUBLE',
+    'DATE': 'DATE', 'TIME': 'TIME', 'TIMESTAMP': 'TIMESTAMP',
+    'BINARY': 'BINARY', 'VARBINARY': 'BINARY', 'BLOB': 'BLOB',
+}
+TEXT_FAMILIES = {'CHAR', 'VARCHAR', 'CLOB'}
+TIME_FAMILIES = {'DATE', 'TIMESTAMP'}
+
+# dialect → family → (target type, parameters: 'n' length, 'p,s' precision and scale, '' none)
+TYPE_MAP = {
+    'bigquery': {
+        'CHAR': ('STRING', 'n'), 'VARCHAR': ('STRING', 'n'), 'CLOB': ('STRING', ''),
+        'DECIMAL': ('NUMERIC', 'p,s'), 'SMALLINT': ('INT64', ''), 'INTEGER': ('INT64', ''), 'BIGINT': ('INT64', ''),
+        'REAL': ('FLOAT64', ''), 'DOUBLE': ('FLOAT64', ''),
+        'DATE': ('DATE', ''), 'TIME': ('TIME', ''), 'TIMESTAMP': ('DATETIME', ''),  # DB2 timestamps carry no zone
+        'BINARY': ('BYTES', 'n'), 'BLOB': ('BYTES', ''),
+    },
+    'postgresql': {
+        'CHAR': ('CHAR', 'n'), 'VARCHAR': ('VARCHAR', 'n'), 'CLOB': ('TEXT', ''),
+        'DECIMAL': ('NUMERIC', 'p,s'), 'SMALLINT': ('SMALLINT', ''), 'INTEGER': ('INTEGER', ''), 'BIGINT': ('BIGINT', ''),
+        'REAL': ('REAL', ''), 'DOUBLE': ('DOUBLE PRECISION', ''),
+        'DATE': ('DATE', ''), 'TIME': ('TIME', ''), 'TIMESTAMP': ('TIMESTAMP', ''),
+        'BINARY': ('BYTEA', ''), 'BLOB': ('BYTEA', ''),
+    },
+}
+BIGQUERY_NUMERIC = (29, 9)  # max integer digits, max scale of NUMERIC; BIGNUMERIC beyond
+
+PLAN_COLUMNS = ['App_ID', 'File_Name', 'File_Type', 'Target', 'Size_GB', 'Partition_Column', 'Partition_Grain',
+                'Partitions', 'Partition_GB', 'Partition_Check', 'Cluster_By', 'DDL', 'Foreign_Keys']
+
+_TYPE = r'^\s*(?P<base>[A-Z]+(?:\s+PRECISION)?)\s*(?:\(\s*(?P<p>\d+)\s*(?:,\s*(?P<s>\d+)\s*)?\))?'
+_NAMES = r'([A-Z][A-Z0-9_#@$]*(?:\s*,\s*[A-Z][A-Z0-9_#@$]*)*)'
+_PARTITION_HINT = r'(?i:partition by)\s+([A-Z][A-Z0-9_#@$]*)(?:\s*\((?i:(daily|monthly|yearly)))?'
+_CLUSTER_HINT = r'(?i:cluster(?:ed)? on)\s+' + _NAMES
+_INDEX_HINT = r'(?i:index(?:es)? on)\s+' + _NAMES
+_MUTABLE_TIME = r'(?:^|_)(?:LAST|UPD|UPDATED?|CHG|CHANGED?|MODIFIED|MOD)(?:_|$)'
+_PRIMARY_KEY = re.compile(r'\bPK\(([^)]*)\)')
+_FOREIGN_KEY = re.compile(r'\bFK\(([^)]*)\)\s*->\s*(\w+)\(([^)]*)\)')
+_CHECK = re.compile(r'\bCHK\(((?:[^()]|\([^()]*\))*)\)')
+_IN_LIST = re.compile(r"(\w+)(\s+(?:NOT\s+)?IN\s*\()([^()]*)\)", re.I)
+_COMPARISON = re.compile(r"(\w+)(\s*(?:<>|<=|>=|=|<|>)\s*)([A-Za-z0-9_#@$]+)\b(?!\s*\()")
+_TABLE_REF = re.compile(r'\b(FROM|JOIN)\s+(?:\w+[./])?(\w+)', re.I)
+
+
+def _names(text):
+    return [name.strip() for name in text.split(',') if name.strip()]
+
+
+def _collect(frame, by, column):
+    """(by values) → list of column values in frame order (groupby().agg(list) without the per-group Series)"""
+    groups = {}
+    for *key, value in zip(*(frame[name].tolist() for name in by), frame[column].tolist()):
+        groups.setdefault(tuple(key), []).append(value)
+    return groups
+
+
+def column_types(columns, dialect='bigquery'):
+    """
+    Column_Type (DB2 for i) → frame of Family, Length (length or precision), Scale and
+    Target_Type in dialect; raises on types without a mapping
+    """
+    parts = columns['Column_Type'].str.upper().str.extract(_TYPE)
+    family = parts['base'].str.replace(r'\s+', ' ', regex=True).map(FAMILIES)
+    if family.isna().any():
+        unknown = sorted(set(columns.loc[family.isna().to_numpy(), 'Column_Type']))
+        raise ValueError(f"No type mapping for: {', '.join(unknown)}")
+    length = pd.to_numeric(parts['p']).astype('Int64')
+    scale = pd.to_numeric(parts['s']).fillna(0).astype(int)
+    mapping = TYPE_MAP[dialect]
+    name = family.map({f: target for f, (target, _) in mapping.items()})
+    params = family.map({f: p for f, (_, p) in mapping.items()})
+    if dialect == 'bigquery':
+        decimal = family == 'DECIMAL'
+        name = name.mask(decimal & (scale == 0) & (length.fillna(0) <= 18).to_numpy(dtype=bool), 'INT64')
+        wide = decimal & ((length.fillna(0) - scale > BIGQUERY_NUMERIC[0]) | (scale > BIGQUERY_NUMERIC[1])).to_numpy(dtype=bool)
+        name = name.mask(wide, 'BIGNUMERIC')
+        params = params.mask(name == 'INT64', '')
+    has_length = length.notna().to_numpy(dtype=bool)
+    text_length = '(' + length.astype(str) + ')'
+    precision = '(' + length.astype(str) + ',' + scale.astype(str) + ')'
+    suffix = np.select([(params == 'n') & has_length, (params == 'p,s') & has_length], [text_length, precision], '')
+    return pd.DataFrame({'Family': family, 'Length': length, 'Scale': scale, 'Target_Type': name + suffix},
+                        index=columns.index)
+
+
+def _domain(columns, record_count):
+    """Distinct values a column can hold: its CHK IN list, else its type width, capped by Record_Count"""
+    length = columns['Length'].fillna(1).astype(float).to_numpy()
+    family = columns['Family']
+    width = np.select(
+        [family.isin(TEXT_FAMILIES), family == 'DECIMAL', family == 'SMALLINT', family == 'INTEGER',
+         family == 'BIGINT', family == 'DATE', family == 'TIME'],
+        [36.0 ** np.minimum(length, 12), 10.0 ** np.minimum(length - columns['Scale'].to_numpy(), 30),
+         2.0 ** 16, 2.0 ** 32, 2.0 ** 64, HISTORY_DAYS, 86400.0], np.inf)
+    width = np.where(columns['In_List'].notna(), columns['In_List'].fillna(0), width)
+    return np.minimum(width, record_count)
+
+
+def _literals(condition, text_columns, all_columns):
+    """Quotes the bare values DDS-style conditions compare character columns with (IN (A,B), X=USD)"""
+    def in_list(match):
+        column, operator, values = match.groups()
+        if column.upper() not in text_columns:
+            return match.group(0)
+        quoted = [v if v.startswith("'") else f"'{v}'" for v in re.findall(r"'[^']*'|[^\s,]+", values)]
+        return f"{column}{operator}{', '.join(quoted)})"
+
+    def comparison(match):
+        column, operator, value = match.groups()
+        if column.upper() not in text_columns or value.upper() in all_columns:
+            return match.group(0)
+        return f"{column}{operator}'{value}'"
+
+    return _COMPARISON.sub(comparison, _IN_LIST.sub(in_list, condition))
+
+
+def partition_plan(schema, columns):
+    """
+    Per file (schema order): Size_GB, Partition_Column (and its Partition_Family), Partition_Grain,
+    Partitions, Partition_GB, Partition_Check (how the grain relates to the hint and MIN_PARTITION_GB)
+    and Cluster_By (list)
+
+    columns: the exploded catalog (App_ID, File_Name, Column_Name, Family, Length, Scale, Key_Position,
+    Key_Count, In_List, Cardinality) - see generate_ddl
+    """
+    tables = schema[['App_ID', 'File_Name', 'File_Type']].reset_index(drop=True)
+    tables['Size_GB'] = (schema['Record_Count'] * schema['Record_Length']).to_numpy() / (1024 ** 3)
+    hints = schema['Index_Strategy'].fillna('').reset_index(drop=True)
+    partition_hint = hints.str.extract(_PARTITION_HINT)
+    by_file = ['App_ID', 'File_Name']
+
+    # partition column: hinted time column, else a time key field, else an immutable time column
+    time_columns = columns[columns['Family'].isin(TIME_FAMILIES)].merge(
+        tables[by_file].assign(Hint=partition_hint[0].to_numpy()), on=by_file)
+    rank = np.select([time_columns['Column_Name'] == time_columns['Hint'], time_columns['Key_Position'].notna(),
+                      ~time_columns['Column_Name'].str.contains(_MUTABLE_TIME)], [0, 1, 2], 3)
+    # foreign key targets (master tables) only on a hinted or key column: any other partition
+    # column would have to join their primary key, which the references point at
+    fk_targets = schema['Constraints'].fillna('').str.findall(_FOREIGN_KEY).explode().dropna().str[1]
+    master = time_columns['File_Name'].isin(set(fk_targets)).to_numpy()
+    chosen = (time_columns.assign(Rank=rank)[(rank < 2) | ((rank == 2) & ~master)]
+              .sort_values(['Rank', 'Position'], kind='stable')
+              .drop_duplicates(by_file)[[*by_file, 'Column_Name', 'Family']]
+              .rename(columns={'Column_Name': 'Partition_Column', 'Family': 'Partition_Family'}))
+    tables = tables.merge(chosen, how='left', on=by_file)
+    unpartitioned_master = tables.set_index(by_file).index.isin(
+        time_columns[(rank == 2) & master].set_index(by_file).index) & tables['Partition_Column'].isna().to_numpy()
+
+    # grain: finest grain whose partitions reach MIN_PARTITION_GB, not finer than the hint
+    days = np.array([d for _, d in GRAINS])
+    counts = np.ceil(HISTORY_DAYS / days)
+    per_partition = tables['Size_GB'].to_numpy()[:, None] / counts[None, :]
+    fits = (per_partition >= MIN_PARTITION_GB) & (counts[None, :] <= MAX_PARTITIONS)
+    finest = np.where(fits.any(axis=1), fits.argmax(axis=1), -1)
+    grain_names = [name for name, _ in GRAINS]
+    hinted = partition_hint[1].str.lower().map(HINT_GRAINS).map({name: i for i, name in enumerate(grain_names)})
+    hinted = hinted.where(partition_hint[0].to_numpy() == tables['Partition_Column'].to_numpy())
+    grain = np.where(finest < 0, -1, np.maximum(finest, hinted.fillna(-1).to_numpy(dtype=int)))
+    grain = np.where(tables['Partition_Column'].notna(), grain, -1)
+    tables['Partition_Grain'] = np.where(grain >= 0, np.array(grain_names)[np.maximum(grain, 0)], None)
+    tables['Partitions'] = np.where(grain >= 0, counts[np.maximum(grain, 0)], 0).astype(int)
+    tables['Partition_GB'] = np.where(grain >= 0, tables['Size_GB'] / np.maximum(tables['Partitions'], 1), np.nan)
+    tables['Partition_Column'] = tables['Partition_Column'].where(grain >= 0)
+    tables['Partition_Check'] = np.select(
+        [grain >= 0, hinted.notna().to_numpy() & (grain < 0), tables['Partition_Column'].isna() & partition_hint[0].notna().to_numpy()],
+        ['OK', f'hinted partitions < {MIN_PARTITION_GB:g} GB: cluster only', 'hinted column is not a date/timestamp'],
+        '')
+    tables.loc[unpartitioned_master, 'Partition_Check'] = 'foreign key target: cluster only'
+    coarsened = (grain >= 0) & hinted.notna().to_numpy() & (grain > hinted.fillna(-1).to_numpy(dtype=int))
+    tables.loc[coarsened, 'Partition_Check'] = 'coarsened from hint to reach ' + f'{MIN_PARTITION_GB:g} GB'
+
+    # cluster candidates, in priority order
+    def hinted_names(pattern, priority):
+        names = hints.str.extract(pattern)[0].dropna().map(_names)
+        frame = tables.loc[names.index, by_file].assign(Column_Name=names).explode('Column_Name')
+        return frame.assign(Priority=priority, Order=frame.groupby(level=0).cumcount())
+
+    non_time_partition = partition_hint[0].where(tables['Partition_Column'] != partition_hint[0]).dropna()
+    keys = columns[columns['Key_Position'].notna()]
+    lf_keys = schema.loc[schema['File_Type'] == 'LF', ['App_ID', 'Columns', 'Key_Fields']]
+    lf_keys = pd.DataFrame({
+        'App_ID': lf_keys['App_ID'],
+        'File_Name': lf_keys['Columns'].str.extract(_TABLE_REF)[1].str.upper(),
+        'Column_Name': lf_keys['Key_Fields'].fillna('').str.split(',').str[0].str.strip(),
+    }).dropna()
+    lf_keys = lf_keys[lf_keys['Column_Name'] != ''].value_counts().rename('LFs').reset_index()
+    candidates = pd.concat([
+        tables.loc[non_time_partition.index, by_file].assign(Column_Name=non_time_partition, Priority=0, Order=0),
+        hinted_names(_CLUSTER_HINT, 1),
+        keys[[*by_file, 'Column_Name']].assign(Priority=2, Order=keys['Cardinality']),
+        lf_keys[[*by_file, 'Column_Name']].assign(Priority=3, Order=-lf_keys['LFs']),
+        hinted_names(_INDEX_HINT, 4),
+    ], ignore_index=True)
+    candidates = candidates.merge(columns[[*by_file, 'Column_Name', 'Cardinality']], on=[*by_file, 'Column_Name'])
+    candidates = candidates.merge(tables[[*by_file, 'Size_GB', 'Partition_Column']], on=by_file)
+    candidates = candidates[(candidates['Cardinality'] >= MIN_CLUSTER_CARDINALITY)
+                            & (candidates['Column_Name'] != candidates['Partition_Column'])
+                            & (candidates['Size_GB'] >= MIN_CLUSTER_GB)]
+    cluster = _collect(candidates.sort_values(['Priority', 'Order'], kind='stable')
+                       .drop_duplicates([*by_file, 'Column_Name'])
+                       .groupby(by_file, sort=False).head(MAX_CLUSTER_COLUMNS), by_file, 'Column_Name')
+    tables['Cluster_By'] = [cluster.get(key, []) for key in zip(tables['App_ID'], tables['File_Name'])]
+    return tables
+
+
+def generate_ddl(schema, dialect='bigquery'):
+    """
+    Target DDL for every file of a schema catalog (1.1 schema_catalog layout): PFs become tables
+    with keys and constraints, partitioned / clustered per partition_plan; LFs become views over
+    their based-on tables (materialized if their Index_Strategy says so). Datasets / schemas are
+    the lower-case App_IDs. Returns one row per file: PLAN_COLUMNS (Foreign_Keys: the PostgreSQL
+    ALTER TABLE statements, to run once every table exists).
+    """
+    if dialect not in DIALECTS:
+        raise ValueError(f"Unknown dialect: {dialect} (one of {', '.join(DIALECTS)})")
+    schema = schema.reset_index(drop=True)
+    by_file = ['App_ID', 'File_Name']
+    _, columns = split_catalog(schema)
+    columns = columns.join(column_types(columns, dialect))
+    columns['Position'] = columns.groupby(by_file).cumcount()
+
+    key_lists = schema['Key_Fields'].fillna('').map(_names)
+    keys = schema[by_file].assign(Column_Name=key_lists).explode('Column_Name').dropna(subset=['Column_Name'])
+    keys['Key_Position'] = keys.groupby(level=0).cumcount()
+    keys['Key_Count'] = key_lists.str.len().reindex(keys.index)
+    in_lists = schema[by_file].join(schema['Constraints'].fillna('').str.extractall(
+        r'CHK\((\w+)\s+IN\s*\(([^()]*)\)\)').droplevel(1).rename(columns={0: 'Column_Name', 1: 'Values'}), how='inner')
+    in_lists['In_List'] = in_lists['Values'].str.count(',') + 1
+    columns = (columns.merge(keys.drop_duplicates([*by_file, 'Column_Name']), how='left', on=[*by_file, 'Column_Name'])
+               .merge(in_lists.drop_duplicates([*by_file, 'Column_Name'])[[*by_file, 'Column_Name', 'In_List']],
+                      how='left', on=[*by_file, 'Column_Name'])
+               .merge(schema[[*by_file, 'Record_Count']], how='left', on=by_file))
+    record_count = columns['Record_Count'].astype(float).to_numpy()
+    share = np.where(columns['Key_Position'].notna(), 1 / columns['Key_Count'].fillna(1).to_numpy(dtype=float), 1.0)
+    columns['Cardinality'] = _domain(columns, np.power(np.maximum(record_count, 1), share))
+
+    plan = partition_plan(schema, columns)
+
+    # column definitions, one vectorized pass
+    pk_lists = schema['Constraints'].fillna('').str.extract(_PRIMARY_KEY)[0].fillna('').map(_names)
+    pk = schema[by_file].assign(Column_Name=pk_lists).explode('Column_Name').dropna().assign(In_PK=True)
+    columns = columns.merge(pk.drop_duplicates(), how='left', on=[*by_file, 'Column_Name'])
+    columns['Definition'] = ('    ' + columns['Column_Name'].str.lower() + ' ' + columns['Target_Type']
+                             + np.where(columns['In_PK'].eq(True), ' NOT NULL', ''))
+    definitions = {key: ',\n'.join(lines) for key, lines in _collect(columns, by_file, 'Definition').items()}
+    text_columns = {key: set(names) for key, names in
+                    _collect(columns[columns['Family'].isin(TEXT_FAMILIES)], by_file, 'Column_Name').items()}
+    all_columns = {key: set(names) for key, names in _collect(columns, by_file, 'Column_Name').items()}
+    owner = schema.drop_duplicates('File_Name').set_index('File_Name')['App_ID']
+
+    def target(app, name):
+        return f"{app.lower()}.{name.lower()}"
+
+    def resolve(app, name):
+        return (app, name) if (app, name) in all_columns else (owner.get(name, app), name)
+
+    def referenced(app, name):
+        return target(*resolve(app, name))
+
+    partition_of = dict(zip(zip(plan['App_ID'], plan['File_Name']), plan['Partition_Column']))
+
+    statements, foreign_keys = [], []
+    for row, part in zip(schema.itertuples(index=False), plan.itertuples(index=False)):
+        key = (row.App_ID, row.File_Name)
+        table = target(*key)
+        hint = row.Index_Strategy if isinstance(row.Index_Strategy, str) else ''
+        if row.File_Type == 'LF':
+            select = row.Columns if isinstance(row.Columns, str) else ''
+            if not re.match(r'\s*SELECT\b', select, re.I):
+                statements.append(f"-- {table}: logical file without a SELECT definition ({row.Constraints})")
+                foreign_keys.append('')
+                continue
+            based_on = _TABLE_REF.search(select)
+            base = (row.App_ID, based_on.group(2).upper()) if based_on else key
+            if base not in all_columns:
+                base = (owner.get(base[1], row.App_ID), base[1])
+            select = _TABLE_REF.sub(lambda m: f"{m.group(1)} {referenced(row.App_ID, m.group(2).upper())}", select)
+            select = _literals(select, text_columns.get(base, set()), all_columns.get(base, set()))
+            kind = 'MATERIALIZED VIEW' if re.search(r'materiali[sz]ed', hint, re.I) else 'VIEW'
+            statements.append(f"CREATE {kind} {table} AS\n{select};")
+            foreign_keys.append('')
+            continue
+
+        texts, names = text_columns.get(key, set()), all_columns.get(key, set())
+        constraints = row.Constraints if isinstance(row.Constraints, str) else ''
+        pk_columns = _names(m.group(1)) if (m := _PRIMARY_KEY.search(constraints)) else []
+        partition = part.Partition_Column if isinstance(part.Partition_Column, str) else None
+        lines, notes, alters = [definitions.get(key, '')], [], []
+        if pk_columns:
+            if dialect == 'postgresql' and partition and partition not in pk_columns:
+                pk_columns = [*pk_columns, partition]
+                notes.append(f"-- {table}: primary key extended with partition column {partition.lower()} (PostgreSQL)")
+            pk_sql = ', '.join(c.lower() for c in pk_columns)
+            lines.append(f"    PRIMARY KEY ({pk_sql}) NOT ENFORCED" if dialect == 'bigquery'
+                         else f"    CONSTRAINT pk_{row.File_Name.lower()} PRIMARY KEY ({pk_sql})")
+        # PostgreSQL: foreign keys after every CREATE TABLE (ALTER TABLE, Foreign_Keys), none to a
+        # partitioned table whose primary key gained the partition column
+        for source, ref_table, ref_columns in _FOREIGN_KEY.findall(constraints):
+            ref_key = resolve(row.App_ID, ref_table)
+            fk = (f"FOREIGN KEY ({', '.join(c.lower() for c in _names(source))}) REFERENCES "
+                  f"{target(*ref_key)}({', '.join(c.lower() for c in _names(ref_columns))})")
+            ref_partition = partition_of.get(ref_key)
+            if dialect == 'bigquery':
+                lines.append(f"    {fk} NOT ENFORCED")
+            elif isinstance(ref_partition, str) and ref_partition not in _names(ref_columns):
+                notes.append(f"-- {table}: {fk} omitted - {target(*ref_key)} is partitioned by "
+                             f"{ref_partition.lower()}, so its primary key is not unique on the referenced columns")
+            else:
+                alters.append(f"ALTER TABLE {table} ADD CONSTRAINT fk_{row.File_Name.lower()}_{ref_table.lower()} {fk};")
+        for i, check in enumerate(_CHECK.findall(constraints), 1):
+            condition = _literals(check, texts, names)
+            if dialect == 'bigquery':
+                notes.append(f"-- {table}: CHECK ({condition}) - not enforced by BigQuery, validate in the load")
+            else:
+                lines.append(f"    CONSTRAINT chk_{row.File_Name.lower()}_{i} CHECK ({condition})")
+        statement = f"CREATE TABLE {table} (\n" + ',\n'.join(line for line in lines if line) + "\n)"
+        cluster = ', '.join(c.lower() for c in part.Cluster_By)
+        if dialect == 'bigquery':
+            if partition:
+                column = partition.lower()
+                if part.Partition_Family == 'TIMESTAMP':
+                    statement += f"\nPARTITION BY DATETIME_TRUNC({column}, {part.Partition_Grain})"
+                elif part.Partition_Grain == 'DAY':
+                    statement += f"\nPARTITION BY {column}"
+                else:
+                    statement += f"\nPARTITION BY DATE_TRUNC({column}, {part.Partition_Grain})"
+            if cluster:
+                statement += f"\nCLUSTER BY {cluster}"
+            statement += ';'
+        else:
+            if partition:
+                statement += (f" PARTITION BY RANGE ({partition.lower()});\n"
+                              f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT;  "
+                              f"-- until the {part.Partition_Grain} range partitions are attached")
+            else:
+                statement += ';'
+            if cluster:
+                index = f"ix_{row.File_Name.lower()}_cluster"
+                statement += f"\nCREATE INDEX {index} ON {table} ({cluster});"
+                if not partition:
+                    statement += f"\nCLUSTER {table} USING {index};"
+        statements.append('\n'.join([statement, *notes]))
+        foreign_keys.append('\n'.join(alters))
+
+    plan['Target'] = [f"{app.lower()}.{name.lower()}" for app, name in zip(plan['App_ID'], plan['File_Name'])]
+    plan['DDL'] = statements
+    plan['Foreign_Keys'] = foreign_keys
+    return plan[PLAN_COLUMNS]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from pipeline import upstream
+
+    parser = argparse.ArgumentParser(description='Generate target DDL for the schema catalog (Task 1.1 artifact)')
+    parser.add_argument('--dialect', choices=DIALECTS, default='bigquery')
+    parser.add_argument('--out', help='write every statement to this .sql file')
+    parser.add_argument('--tables', type=int, default=0, help='benchmark: replicate the catalog to about N files')
+    args = parser.parse_args()
+
+    schema = upstream('schema_catalog')
+    if args.tables:
+        copies = max(1, round(args.tables / len(schema)))
+        schema = pd.concat([schema.assign(App_ID=schema['App_ID'] + f'_{i}') for i in range(copies)], ignore_index=True)
+    started = time.perf_counter()
+    ddl = generate_ddl(schema, args.dialect)
+    seconds = time.perf_counter() - started
+    print(f"[DDL]: {len(ddl):,} files ({(ddl['File_Type'] == 'PF').sum():,} tables) in {seconds:.2f}s "
+          f"({len(ddl) / seconds:,.0f} files/s, {args.dialect})")
+    print(f"[Partitioned]: {(ddl['Partitions'] > 0).sum():,}  [Clustered]: {(ddl['Cluster_By'].str.len() > 0).sum():,}")
+    if args.out:
+        with open(args.out, 'w') as f:
+            # tables, then the views over them, then the foreign keys between them
+            views = ddl['File_Type'] == 'LF'
+            f.write('\n\n'.join([*ddl.loc[~views, 'DDL'], *ddl.loc[views, 'DDL'],
+                                  *ddl.loc[ddl['Foreign_Keys'] != '', 'Foreign_Keys']]) + '\n')
+        print(f"[Written]: {args.out}")
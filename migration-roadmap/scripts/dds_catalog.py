@@ -0,0 +1,554 @@
+# scripts/dds_catalog.py
+import os
+import re
+
+from lazy_imports import lazy_import
+from source_metrics import ENCODING, SOURCE_ROOT, source_members
+
+pd = lazy_import('pandas')
+
+# DB2/400 schema catalog for Task 1.1 (replaces the hand-typed schema_catalog)
+# Two exports feed it, both read in a single streamed pass:
+# - DSPFD / DSPFFD outfiles, copied with CPYTOIMPF to DSPFD_ROOT/<App_ID>/<OUTFILE>.csv:
+#     DSPFD FILE(<lib>/*ALL) TYPE(*BASATR)  OUTFILE(QAFDBASI)   file attribute, text
+#     DSPFD FILE(<lib>/*ALL) TYPE(*RCDFMT)  OUTFILE(QAFDRFMT)   record formats, lengths
+#     DSPFD FILE(<lib>/*ALL) TYPE(*MBR)     OUTFILE(QAFDMBR)    record counts, data space size
+#     DSPFD FILE(<lib>/*ALL) TYPE(*ACCPTH)  OUTFILE(QAFDACCP)   keys, UNIQUE, based-on files
+#     DSPFFD FILE(<lib>/*ALL)               OUTFILE(QADSPFFD)   fields (compiled types/lengths)
+# - DDS source members (source type PF / LF) in the source export (see source_metrics.py), for
+#   files without outfile rows and for what the outfiles do not carry: select/omit rules and
+#   VALUES / RANGE / COMP checks. Reference fields (REF / REFFLD) and LF fields without a
+#   definition are resolved against the catalog once every member has been read.
+# The outfiles describe the compiled objects and win where both describe a file.
+#
+# Normalized tables (Parquet, one file per table under SCHEMA_CATALOG):
+#   files    App_ID, File_Name, File_Type, Text, Unique_Keys, Record_Count, Size_Bytes, Source
+#   formats  App_ID, File_Name, Record_Format, Record_Length, Field_Count
+#   fields   App_ID, File_Name, Record_Format, Ordinal, Field_Name, Data_Type (DDS code), Length,
+#            Decimals, Varying, Nullable, Byte_Length, SQL_Type, Check, Text
+#   keys     App_ID, File_Name, Record_Format, Key_Ordinal, Field_Name, Descending
+#   lf_pf    App_ID, File_Name, Record_Format, Based_On, Join_Order, Select_Omit (SQL condition)
+#
+# Run: python dds_catalog.py [--source DIR] [--dspfd DIR] [--out DIR]
+
+SCHEMA_CATALOG = os.environ.get('SCHEMA_CATALOG', '/tmp/schema_catalog')  # Parquet dataset directory
+DSPFD_ROOT = '/mnt/user-data/uploads/dspfd'
+DDS_TYPES = {'PF', 'LF'}
+BATCH_ROWS = 100_000  # outfile rows per read
+
+TABLES = {
+    'files': ['App_ID', 'File_Name', 'File_Type', 'Text', 'Unique_Keys', 'Record_Count', 'Size_Bytes', 'Source'],
+    'formats': ['App_ID', 'File_Name', 'Record_Format', 'Record_Length', 'Field_Count'],
+    'fields': ['App_ID', 'File_Name', 'Record_Format', 'Ordinal', 'Field_Name', 'Data_Type', 'Length',
+               'Decimals', 'Varying', 'Nullable', 'Byte_Length', 'SQL_Type', 'Check', 'Text'],
+    'keys': ['App_ID', 'File_Name', 'Record_Format', 'Key_Ordinal', 'Field_Name', 'Descending'],
+    'lf_pf': ['App_ID', 'File_Name', 'Record_Format', 'Based_On', 'Join_Order', 'Select_Omit'],
+}
+NULLABLE_INTS = {'Record_Count', 'Size_Bytes', 'Decimals'}  # unknown without outfiles / for non-numeric fields
+
+# outfile → {outfile field: catalog name}
+OUTFILES = {
+    'QAFDBASI': {'ATFILE': 'File_Name', 'ATFATR': 'File_Type', 'ATFTYP': 'Content', 'ATTXT': 'Text'},
+    'QAFDRFMT': {'RFFILE': 'File_Name', 'RFNAME': 'Record_Format', 'RFFLDN': 'Field_Count', 'RFLEN': 'Record_Length'},
+    'QAFDMBR': {'MBFILE': 'File_Name', 'MBNRCD': 'Record_Count', 'MBDSZ': 'Size_Bytes'},
+    'QAFDACCP': {'APFILE': 'File_Name', 'APUNIQ': 'Unique', 'APKEYN': 'Key_Ordinal', 'APKEYF': 'Field_Name',
+                 'APKSEQ': 'Sequence', 'APBOF': 'Based_On'},
+    'QADSPFFD': {'WHFILE': 'File_Name', 'WHNAME': 'Record_Format', 'WHFLDE': 'Field_Name', 'WHFOBO': 'Offset',
+                 'WHFLDB': 'Bytes', 'WHFLDD': 'Digits', 'WHFLDP': 'Decimals', 'WHFLDT': 'Data_Type',
+                 'WHFTXT': 'Text', 'WHNULL': 'Nullable', 'WHVARL': 'Varying'},
+}
+
+# DDS data type → fixed byte length (others: A, S, H, O, J, E = length; G = 2 × length)
+FIXED_BYTES = {'L': 10, 'T': 8, 'Z': 26}
+COMPARISONS = {'EQ': '=', 'NE': '<>', 'GT': '>', 'GE': '>=', 'LT': '<', 'LE': '<=', 'NG': '<=', 'NL': '>='}
+
+_KEYWORD = re.compile(r"([A-Z][A-Z0-9]*)(?:\(((?:'[^']*'|\([^()]*\)|[^()'])*)\))?", re.I)
+_ARGUMENT = re.compile(r"'(?:[^']|'')*'|[^\s']+")
+
+
+def _keywords(text):
+    """DDS keyword area → {KEYWORD: argument text} ('' for keywords without parameters)"""
+    return {name.upper(): (arguments or '').strip() for name, arguments in _KEYWORD.findall(text)}
+
+
+def _arguments(text):
+    return _ARGUMENT.findall(text)
+
+
+def _unqualified(name):
+    return name.rpartition('/')[2].upper()
+
+
+def byte_length(data_type, length, decimals=0, varying=False):
+    """Storage bytes of a field from its DDS type and length (digits for numeric types)"""
+    if data_type == 'P':
+        size = length // 2 + 1
+    elif data_type == 'B':
+        size = 2 if length <= 4 else 4 if length <= 9 else 8
+    elif data_type == 'F':
+        size = 4 if length <= 7 else 8
+    elif data_type == 'G':
+        size = 2 * length
+    else:
+        size = FIXED_BYTES.get(data_type, length)
+    return size + (2 if varying else 0)
+
+
+def sql_type(data_type, length, decimals=0, varying=False, size=None):
+    """DB2 for i SQL type of a DDS / DSPFFD field"""
+    decimals = decimals or 0
+    size = size or byte_length(data_type, length, decimals, varying)
+    if data_type in ('A', 'O', 'J', 'E'):
+        return f"{'VARCHAR' if varying else 'CHAR'}({length})"
+    if data_type == 'G':
+        return f"{'VARGRAPHIC' if varying else 'GRAPHIC'}({length})"
+    if data_type == 'H':
+        return f"{'VARBINARY' if varying else 'BINARY'}({length})"
+    if data_type == 'P':
+        return f"DECIMAL({length},{decimals})"
+    if data_type == 'S':
+        return f"NUMERIC({length},{decimals})"
+    if data_type == 'B':
+        return f"DECIMAL({length},{decimals})" if decimals else {2: 'SMALLINT', 4: 'INT'}.get(size, 'BIGINT')
+    if data_type == 'F':
+        return 'REAL' if size == 4 else 'DOUBLE'
+    return {'L': 'DATE', 'T': 'TIME', 'Z': 'TIMESTAMP'}.get(data_type, data_type)
+
+
+def _condition(field, keywords):
+    """VALUES / RANGE / COMP (CMP) keywords of a field → SQL condition; 'ALL' → None"""
+    if 'VALUES' in keywords:
+        return f"{field} IN ({', '.join(_arguments(keywords['VALUES']))})"
+    if 'RANGE' in keywords:
+        low, high = _arguments(keywords['RANGE'])[:2]
+        return f"{field} BETWEEN {low} AND {high}"
+    for name in ('COMP', 'CMP'):
+        if name in keywords:
+            operator, value = _arguments(keywords[name])[:2]
+            return f"{field} {COMPARISONS[operator.upper()]} {value}"
+    return None
+
+
+def select_omit_sql(groups):
+    """
+    Select/omit groups [(S|O, [conditions])] in DDS order → SQL condition. DDS takes the first
+    group that matches; a record matching none is omitted after a select, selected after an omit
+    (ALL, an empty group, sets that default explicitly).
+    """
+    rules, default = [], None
+    for kind, conditions in groups:
+        if not conditions:
+            default = kind == 'S'
+            break
+        rules.append((kind, ' AND '.join(conditions)))
+    if default is None:
+        default = rules[-1][0] == 'O'
+    if not rules:
+        return '' if default else 'FALSE'
+    terms = [f"({condition})" if ' AND ' in condition and len(rules) > 1 else condition for _, condition in rules]
+    kinds = {kind for kind, _ in rules}
+    if kinds == {'S'} and not default:
+        return ' OR '.join(terms)
+    if kinds == {'O'} and default:
+        return f"NOT ({' OR '.join(terms)})"
+    cases = ' '.join(f"WHEN {condition} THEN {int(kind == 'S')}" for kind, condition in rules)
+    return f"CASE {cases} ELSE {int(default)} END = 1"
+
+
+def dds_entries(lines):
+    """
+    DDS member lines (positional: 6 form type, 7 comment, 17 name type, 19-28 name, 29 reference,
+    30-34 length, 35 data type, 36-37 decimals, 45-80 keywords; '-' / '+' continue the keywords)
+    → [kind, name, reference, length, data type, decimals, {keywords}], kind being FILE
+    (file-level keywords), R, FIELD, K, S, O, AND (condition of the preceding S/O) or J
+    """
+    entries, pending, section = [], None, 'FIELD'
+    for raw in lines:
+        line = raw.rstrip('\r\n').ljust(80)
+        if line[6] == '*' or line[5] not in 'Aa ':
+            continue
+        keywords = line[44:80].rstrip()
+        if pending:
+            entries[-1][6] += keywords.lstrip() if pending == '+' else keywords
+        else:
+            name_type, name = line[16].upper(), line[18:28].strip().upper()
+            fields = (line[28].upper(), line[29:34].strip(), line[34].strip().upper(), line[35:37].strip())
+            if name_type == 'R':
+                section, kind = 'FIELD', 'R'
+            elif name_type in ('K', 'S', 'O', 'J'):
+                section = kind = name_type
+            elif name:
+                kind = 'AND' if section in ('S', 'O', 'AND') else 'FIELD'
+            elif entries:
+                entries[-1][6] += ' ' + keywords
+                kind = None
+            else:
+                kind = 'FILE'
+            if kind:
+                entries.append([kind, name, *fields, keywords])
+        pending = keywords[-1:] if keywords[-1:] in ('-', '+') else None
+        if pending:
+            entries[-1][6] = entries[-1][6][:-1]
+    for entry in entries:
+        entry[6] = _keywords(entry[6])
+    return entries
+
+
+def _parse_dds(app, file_name, file_type, lines, rows, pending):
+    """One DDS member into rows (table → list of dicts); fields still to be resolved go to pending"""
+    entries = dds_entries(lines)
+    file_keywords = {k: v for entry in entries if entry[0] == 'FILE' for k, v in entry[6].items()}
+    ref_file = _unqualified(_arguments(file_keywords['REF'])[0]) if 'REF' in file_keywords else None
+    base = {'App_ID': app, 'File_Name': file_name}
+    text = next((_arguments(e[6]['TEXT'])[0].strip("'") for e in entries if e[0] in ('FILE', 'R') and 'TEXT' in e[6]), '')
+    rows['files'].append({**base, 'File_Type': file_type, 'Text': text, 'Unique_Keys': 'UNIQUE' in file_keywords,
+                          'Record_Count': None, 'Size_Bytes': None, 'Source': 'DDS'})
+    record_format, ordinal, key_ordinal, groups = None, 0, 0, []
+
+    def close_format():
+        if groups:
+            condition = select_omit_sql(groups)
+            for row in rows['lf_pf']:
+                if row['App_ID'] == app and row['File_Name'] == file_name and row['Record_Format'] == record_format:
+                    row['Select_Omit'] = condition
+
+    for kind, name, reference, length, data_type, decimals, keywords in entries:
+        if kind == 'R':
+            close_format()
+            record_format, ordinal, key_ordinal, groups = name, 0, 0, []
+            rows['formats'].append({**base, 'Record_Format': name})
+            based_on = keywords.get('PFILE') or keywords.get('JFILE') or file_keywords.get('JFILE', '')
+            for order, pf in enumerate(_arguments(based_on), 1):
+                rows['lf_pf'].append({**base, 'Record_Format': name, 'Based_On': _unqualified(pf),
+                                      'Join_Order': order, 'Select_Omit': ''})
+        elif kind == 'FIELD':
+            ordinal += 1
+            field = {**base, 'Record_Format': record_format, 'Ordinal': ordinal, 'Field_Name': name,
+                     'Data_Type': data_type or None, 'Length': length, 'Decimals': int(decimals) if decimals else None,
+                     'Varying': 'VARLEN' in keywords, 'Nullable': 'ALWNULL' in keywords,
+                     'Check': _condition(name, keywords) or '',
+                     'Text': _arguments(keywords.get('TEXT') or keywords.get('COLHDG', "''"))[0].strip("'")}
+            if 'REFFLD' in keywords:
+                refs = _arguments(keywords['REFFLD'])
+                source = (_unqualified(refs[1]) if len(refs) > 1 else ref_file or file_name, _unqualified(refs[0]))
+            elif reference == 'R' or (not length and data_type not in FIXED_BYTES) or length[:1] in ('+', '-'):
+                source = (ref_file, name) if reference == 'R' and ref_file else None
+            else:
+                source = False  # defined here
+            if source is False:
+                field['Data_Type'] = data_type or ('P' if decimals else 'A')
+                field['Length'] = int(length) if length else FIXED_BYTES[data_type]
+            else:
+                pending.append((field, source, length))
+            rows['fields'].append(field)
+        elif kind == 'K':
+            key_ordinal += 1
+            rows['keys'].append({**base, 'Record_Format': record_format, 'Key_Ordinal': key_ordinal,
+                                 'Field_Name': name, 'Descending': 'DESCEND' in keywords})
+        elif kind in ('S', 'O'):
+            condition = _condition(name, keywords)
+            groups.append((kind, [condition] if condition else []))
+        elif kind == 'AND' and groups and (condition := _condition(name, keywords)):
+            groups[-1][1].append(condition)
+    close_format()
+
+
+def _resolve(rows, pending, known=()):
+    """
+    Types of reference fields and undefined LF fields from the field they name (REFFLD / REF file,
+    else the LF's based-on files) among the parsed and known (outfile) fields, same app first;
+    repeated while references chain. Returns the number of fields left unresolved.
+    """
+    based_on = {}
+    for row in rows['lf_pf']:
+        based_on.setdefault((row['App_ID'], row['File_Name']), []).append(row['Based_On'])
+    while pending:
+        defined = {}
+        for field in [*known, *rows['fields']]:
+            if field['Data_Type'] and isinstance(field['Length'], int):
+                defined.setdefault((field['File_Name'], field['Field_Name']), {})[field['App_ID']] = field
+        left = []
+        for field, source, override in pending:
+            candidates = [source] if source else [(pf, field['Field_Name'])
+                                                  for pf in based_on.get((field['App_ID'], field['File_Name']), [])]
+            match = None
+            for candidate in candidates:
+                owners = defined.get(candidate, {})
+                match = owners.get(field['App_ID']) or next(iter(owners.values()), None)
+                if match:
+                    break
+            if not match:
+                left.append((field, source, override))
+                continue
+            field['Data_Type'] = field['Data_Type'] or match['Data_Type']
+            field['Length'] = (match['Length'] + int(override) if override[:1] in ('+', '-')
+                               else int(override) if override else match['Length'])
+            if field['Decimals'] is None:
+                field['Decimals'] = match['Decimals']
+            field['Varying'] = field['Varying'] or match['Varying']
+            field['Nullable'] = field['Nullable'] or match['Nullable']
+            field['Text'] = field['Text'] or match['Text']
+            if source:  # checks stay with the PF, a reference field takes them over
+                field['Check'] = field['Check'] or match['Check']
+        if len(left) == len(pending):
+            break
+        pending = left
+    for field, _, _ in pending:
+        field['Data_Type'] = field['Data_Type'] or ''
+        field['Decimals'] = field['Decimals'] if isinstance(field['Length'], int) else None
+        field['Length'] = field['Length'] if isinstance(field['Length'], int) else 0
+    return len(pending)
+
+
+def _frame(table, rows):
+    """Table frame from row dicts or a frame holding (at least) the table's columns"""
+    frame = pd.DataFrame(rows, columns=TABLES[table])
+    for name in NULLABLE_INTS & set(frame.columns):
+        frame[name] = pd.to_numeric(frame[name]).astype('Int64')
+    return frame
+
+
+def _inherit_formats(rows, known):
+    """LF record formats without a field list take every field of their (single) based-on PF format"""
+    listed = {(f['App_ID'], f['File_Name'], f['Record_Format']) for f in rows['fields']}
+    by_file, described = {}, {(f['App_ID'], f['File_Name']) for f in known}
+    for field in [*known, *(f for f in rows['fields'] if (f['App_ID'], f['File_Name']) not in described)]:
+        owner = by_file.setdefault((field['App_ID'], field['File_Name']), {})
+        owner.setdefault(field['Record_Format'], []).append(field)
+    based_on = {}
+    for row in rows['lf_pf']:
+        based_on.setdefault((row['App_ID'], row['File_Name'], row['Record_Format']), []).append(row['Based_On'])
+    for (app, file_name, record_format), pfs in based_on.items():
+        if (app, file_name, record_format) in listed or len(pfs) != 1:
+            continue
+        formats = by_file.get((app, pfs[0])) or next((f for (a, n), f in by_file.items() if n == pfs[0]), {})
+        source = formats.get(record_format) or next(iter(formats.values()), [])
+        rows['fields'].extend({**field, 'App_ID': app, 'File_Name': file_name, 'Record_Format': record_format,
+                               'Check': ''} for field in source)
+
+
+def _records(frame):
+    """Frame rows as dicts with None for missing values"""
+    columns = list(frame.columns)
+    values = [frame[name].astype(object).where(frame[name].notna(), None).tolist() for name in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def _dds_tables(root, known=None):
+    """
+    Parsed DDS members as frames (table → DataFrame) and the count of unresolved fields;
+    known: already cataloged fields (outfiles) that references may resolve to
+    """
+    rows, pending = {table: [] for table in TABLES}, []
+    for app, _, member, source_type, path in source_members(root, DDS_TYPES):
+        with open(path, encoding=ENCODING, errors='replace') as f:
+            _parse_dds(app, member.upper(), source_type, f, rows, pending)
+    known = [] if known is None else _records(known)
+    unresolved = _resolve(rows, pending, known)
+    _inherit_formats(rows, known)
+    for field in rows['fields']:
+        field['Byte_Length'] = byte_length(field['Data_Type'], field['Length'], field['Decimals'] or 0, field['Varying'])
+        field['SQL_Type'] = sql_type(field['Data_Type'], field['Length'], field['Decimals'], field['Varying'])
+    formats = {}
+    for field in rows['fields']:
+        key = (field['App_ID'], field['File_Name'], field['Record_Format'])
+        length, count = formats.get(key, (0, 0))
+        formats[key] = (length + field['Byte_Length'], count + 1)
+    for row in rows['formats']:
+        row['Record_Length'], row['Field_Count'] = formats.get((row['App_ID'], row['File_Name'], row['Record_Format']), (0, 0))
+    return {table: _frame(table, table_rows) for table, table_rows in rows.items()}, unresolved
+
+
+def _read_outfile(path, columns, batch_rows):
+    """Outfile CSV in chunks of batch_rows: the selected fields, renamed and blank-stripped"""
+    for chunk in pd.read_csv(path, usecols=list(columns), dtype=str, keep_default_na=False, chunksize=batch_rows):
+        yield pd.DataFrame({name: chunk[field].str.strip() for field, name in columns.items()})
+
+
+def _dspfd_tables(root, batch_rows=BATCH_ROWS):
+    """Outfile exports of every app under root as catalog frames (empty frames if there are none)"""
+    parts = {outfile: [] for outfile in OUTFILES}
+    for app in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        for outfile, columns in OUTFILES.items():
+            path = os.path.join(root, app, f'{outfile}.csv')
+            if os.path.exists(path):
+                parts[outfile].extend(chunk.assign(App_ID=app) for chunk in _read_outfile(path, columns, batch_rows))
+    raw = {outfile: pd.concat(chunks, ignore_index=True) if chunks else
+           pd.DataFrame(columns=['App_ID', *OUTFILES[outfile].values()]) for outfile, chunks in parts.items()}
+    number = lambda column: pd.to_numeric(column, errors='coerce')
+
+    basi = raw['QAFDBASI']
+    basi = basi[(basi['Content'] != 'S') & basi['File_Type'].isin(DDS_TYPES)]
+    members = raw['QAFDMBR'].assign(Record_Count=lambda m: number(m['Record_Count']),
+                                    Size_Bytes=lambda m: number(m['Size_Bytes']))
+    members = members.groupby(['App_ID', 'File_Name'], as_index=False)[['Record_Count', 'Size_Bytes']].sum(min_count=1)
+    access = raw['QAFDACCP']
+    unique = access.groupby(['App_ID', 'File_Name'])['Unique'].agg(lambda u: (u == 'Y').any()).rename('Unique_Keys')
+    files = (basi.merge(members, how='left').merge(unique.reset_index(), how='left')
+             .assign(Unique_Keys=lambda f: f['Unique_Keys'].fillna(False).astype(bool), Source='DSPFD'))
+
+    formats = raw['QAFDRFMT'].assign(Record_Length=lambda f: number(f['Record_Length']).astype(int),
+                                     Field_Count=lambda f: number(f['Field_Count']).astype(int))
+    first_format = formats.drop_duplicates(['App_ID', 'File_Name'])[['App_ID', 'File_Name', 'Record_Format']]
+
+    ffd = raw['QADSPFFD']
+    varying = ffd['Varying'] == 'Y'
+    digits, size, decimals = number(ffd['Digits']), number(ffd['Bytes']).astype(int), number(ffd['Decimals'])
+    text_bytes = size - 2 * varying
+    length = digits.where(ffd['Data_Type'].isin(['P', 'S', 'B', 'F']),
+                          (text_bytes // 2).where(ffd['Data_Type'] == 'G', text_bytes))
+    fields = ffd.assign(Length=length.astype(int), Decimals=decimals.where(digits > 0).astype('Int64'),
+                        Varying=varying, Nullable=ffd['Nullable'] == 'Y', Byte_Length=size, Check='',
+                        Offset=number(ffd['Offset']))
+    fields = fields.sort_values(['App_ID', 'File_Name', 'Record_Format', 'Offset'], kind='stable')
+    fields['Ordinal'] = fields.groupby(['App_ID', 'File_Name', 'Record_Format']).cumcount() + 1
+    fields['SQL_Type'] = [sql_type(*args) for args in zip(fields['Data_Type'], fields['Length'], fields['Decimals'].fillna(0),
+                                                          fields['Varying'], fields['Byte_Length'])]
+
+    keyed = access[access['Field_Name'] != ''].merge(first_format, how='left')
+    keys = keyed.assign(Key_Ordinal=number(keyed['Key_Ordinal']).astype(int), Descending=keyed['Sequence'] == 'D')
+    keys = keys.drop_duplicates(['App_ID', 'File_Name', 'Key_Ordinal'])
+    logical = files.loc[files['File_Type'] == 'LF', ['App_ID', 'File_Name']]
+    based = access[access['Based_On'] != ''].merge(logical).drop_duplicates(['App_ID', 'File_Name', 'Based_On'])
+    lf_pf = based.merge(first_format, how='left').assign(Select_Omit='')
+    lf_pf['Join_Order'] = lf_pf.groupby(['App_ID', 'File_Name']).cumcount() + 1
+    frames = {'files': files, 'formats': formats, 'fields': fields, 'keys': keys, 'lf_pf': lf_pf}
+    return {table: _frame(table, frame[TABLES[table]].reset_index(drop=True)) for table, frame in frames.items()}
+
+
+def _merge(dspfd, dds):
+    """Outfile rows first; DDS rows for files the outfiles lack, and its select/omit and checks"""
+    described = pd.MultiIndex.from_frame(dspfd['files'][['App_ID', 'File_Name']])
+    merged = {}
+    for table, columns in TABLES.items():
+        extra = dds[table][~pd.MultiIndex.from_frame(dds[table][['App_ID', 'File_Name']]).isin(described)]
+        merged[table] = pd.concat([frame for frame in (dspfd[table], extra) if len(frame)] or [dds[table]],
+                                  ignore_index=True)[columns]
+    both = pd.MultiIndex.from_frame(merged['files'][['App_ID', 'File_Name']])
+    in_dds = both.isin(pd.MultiIndex.from_frame(dds['files'][['App_ID', 'File_Name']]))
+    merged['files'].loc[in_dds & both.isin(described), 'Source'] = 'DSPFD+DDS'
+    select_omit = dds['lf_pf'].drop_duplicates(['App_ID', 'File_Name']).set_index(['App_ID', 'File_Name'])['Select_Omit']
+    owner = pd.MultiIndex.from_frame(merged['lf_pf'][['App_ID', 'File_Name']])
+    merged['lf_pf']['Select_Omit'] = select_omit.reindex(owner).fillna('').to_numpy()
+    checks = dds['fields'].set_index(['App_ID', 'File_Name', 'Field_Name'])['Check']
+    checks = checks[~checks.index.duplicated()]
+    field_index = pd.MultiIndex.from_frame(merged['fields'][['App_ID', 'File_Name', 'Field_Name']])
+    merged['fields']['Check'] = checks.reindex(field_index).fillna('').to_numpy()
+    return merged
+
+
+def build_catalog(source_root=SOURCE_ROOT, dspfd_root=DSPFD_ROOT, out=SCHEMA_CATALOG, batch_rows=BATCH_ROWS):
+    """
+    Reads the DDS members and outfile exports once and writes the normalized tables to out
+    (each replaced atomically). Returns ({table: rows}, unresolved DDS field count).
+    """
+    dspfd = _dspfd_tables(dspfd_root, batch_rows)
+    dds, unresolved = (_dds_tables(source_root, dspfd['fields']) if os.path.isdir(source_root)
+                       else ({table: _frame(table, []) for table in TABLES}, 0))
+    catalog = _merge(dspfd, dds)
+    os.makedirs(out, exist_ok=True)
+    for table, frame in catalog.items():
+        path = os.path.join(out, f'{table}.parquet')
+        tmp = f"{path}.{os.getpid()}.tmp"
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+    return {table: len(frame) for table, frame in catalog.items()}, unresolved
+
+
+def load_catalog(path=SCHEMA_CATALOG):
+    """{table: DataFrame} of the normalized catalog, or None if it has not been built"""
+    paths = {table: os.path.join(path, f'{table}.parquet') for table in TABLES}
+    if not all(os.path.exists(p) for p in paths.values()):
+        return None
+    return {table: pd.read_parquet(p) for table, p in paths.items()}
+
+
+def schema_rows(catalog):
+    """
+    One row per file in the Task 1.1 schema_catalog layout: Columns as 'NAME TYPE, ...' (PF)
+    or 'SELECT ... FROM <based-on> [JOIN ...] [WHERE <select/omit>]' (LF), Constraints from
+    UNIQUE keys and field checks, LF_Count = logical files over the PF.
+    """
+    files, formats, fields, keys, lf_pf = (catalog[table] for table in TABLES)
+    by_file = ['App_ID', 'File_Name']
+    first = formats.drop_duplicates(by_file)[[*by_file, 'Record_Format', 'Record_Length']]
+    fields = fields.merge(first[[*by_file, 'Record_Format']]).sort_values([*by_file, 'Ordinal'])
+    keys = keys.merge(first[[*by_file, 'Record_Format']]).sort_values([*by_file, 'Key_Ordinal'])
+
+    grouped = fields.assign(Entry=fields['Field_Name'] + ' ' + fields['SQL_Type']).groupby(by_file)
+    columns = pd.DataFrame({
+        'Entries': grouped['Entry'].agg(', '.join),
+        'Names': grouped['Field_Name'].agg(tuple),
+        'Checks': grouped['Check'].agg(lambda checks: ', '.join(f'CHK({c})' for c in checks if c)),
+    })
+    key_fields = keys.groupby(by_file)['Field_Name'].agg(','.join).rename('Key_Fields')
+    joins = lf_pf.sort_values([*by_file, 'Join_Order']).groupby(by_file).agg(
+        Based_On=('Based_On', list), Select_Omit=('Select_Omit', 'first'))
+    lf_count = lf_pf.drop_duplicates([*by_file, 'Based_On']).groupby(['App_ID', 'Based_On']).size()
+
+    schema = (files.merge(first, how='left', on=by_file)
+              .merge(columns.reset_index(), how='left', on=by_file)
+              .merge(key_fields.reset_index(), how='left', on=by_file)
+              .merge(joins.reset_index(), how='left', on=by_file))
+    schema['Key_Fields'] = schema['Key_Fields'].fillna('')
+    schema['Record_Format'] = schema['Record_Format'].fillna('')
+    schema['Record_Length'] = schema['Record_Length'].fillna(0).astype(int)
+    is_lf = schema['File_Type'] == 'LF'
+    schema['Record_Count'] = schema['Record_Count'].fillna(0).astype(int).where(~is_lf, 0)
+    schema['LF_Count'] = [0 if lf else int(lf_count.get((app, name), 0))
+                          for app, name, lf in zip(schema['App_ID'], schema['File_Name'], is_lf)]
+    pf_names = dict(zip(columns.index, columns['Names']))
+
+    def view(row):
+        based_on = row['Based_On'] if isinstance(row['Based_On'], list) else []
+        own = row['Names'] if isinstance(row['Names'], tuple) else ()
+        whole = len(based_on) == 1 and own in ((), pf_names.get((row['App_ID'], based_on[0])))
+        sql = f"SELECT {'*' if whole else ', '.join(own) or '*'} FROM {' JOIN '.join(based_on) or '?'}"
+        return sql + (f" WHERE {row['Select_Omit']}" if row['Select_Omit'] else '')
+
+    def constraints(row):
+        if row['File_Type'] == 'LF':
+            kind = 'JOIN LOGICAL VIEW' if len(row['Based_On'] or []) > 1 else 'LOGICAL VIEW'
+            return kind + (' - select/omit' if row['Select_Omit'] else ' - keyed access path' if row['Key_Fields'] else '')
+        parts = [f"PK({row['Key_Fields']})"] if row['Unique_Keys'] and row['Key_Fields'] else []
+        return ', '.join(parts + ([row['Checks']] if row['Checks'] else []))
+
+    def index_strategy(row):
+        if row['File_Type'] == 'LF':
+            if row['Select_Omit'] or len(row['Based_On'] or []) > 1:
+                return 'Convert to view'
+            return f"Index on {row['Key_Fields']}" if row['Key_Fields'] else 'Convert to view'
+        strategy = f"Cluster on {row['Key_Fields']}" if row['Key_Fields'] else 'No keyed access path'
+        return strategy + (f", review {row['LF_Count']} LF access paths" if row['LF_Count'] else '')
+
+    schema['Based_On'] = schema['Based_On'].where(schema['Based_On'].notna(), None)
+    schema['Select_Omit'] = schema['Select_Omit'].fillna('')
+    schema['Checks'] = schema['Checks'].fillna('')
+    schema['Columns'] = [view(row) if row['File_Type'] == 'LF' else row['Entries'] if isinstance(row['Entries'], str) else ''
+                         for row in schema.to_dict('records')]
+    rows = schema.to_dict('records')
+    schema['Constraints'] = [constraints(row) for row in rows]
+    schema['Index_Strategy'] = [index_strategy(row) for row in rows]
+    return schema[['App_ID', 'File_Name', 'File_Type', 'Record_Format', 'Record_Length', 'Key_Fields',
+                   'Record_Count', 'Columns', 'Constraints', 'LF_Count', 'Index_Strategy']]
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Build the schema catalog from DDS source and DSPFD/DSPFFD outfiles')
+    parser.add_argument('--source', default=SOURCE_ROOT, help='exported source members (<App_ID>/<SRCPF>/<MEMBER>.<TYPE>)')
+    parser.add_argument('--dspfd', default=DSPFD_ROOT, help='outfile exports (<App_ID>/<OUTFILE>.csv)')
+    parser.add_argument('--out', default=SCHEMA_CATALOG, help='output dataset directory')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts, unresolved = build_catalog(args.source, args.dspfd, args.out)
+    elapsed = time.perf_counter() - started
+    files = load_catalog(args.out)['files']
+    print(f"[Schema Catalog]: {args.out} built in {elapsed:.2f}s")
+    print(pd.Series(counts, name='Rows').to_frame().to_markdown())
+    print(files.groupby(['File_Type', 'Source']).size().rename('Files').reset_index().to_markdown(index=False))
+    if unresolved:
+        print(f"\n[WARNING] {unresolved} DDS fields reference definitions missing from the catalog")
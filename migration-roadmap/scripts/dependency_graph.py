@@ -0,0 +1,215 @@
+# scripts/dependency_graph.py
+from lazy_imports import lazy_import
+from wave_scheduler import assign_waves
+
+np = lazy_import('numpy')
+nx = lazy_import('networkx')
+
+# Scalable dependency-graph engine for Tasks 0.2 / 2.3
+# Circular dependencies are collapsed into strongly connected components (Tarjan,
+# via networkx's non-recursive implementation) and every ordering question is
+# answered on the condensed DAG in O(V + E). No simple_cycles enumeration (exponential
+# on program-level graphs), no topological_sort/dag_longest_path failures on cycles.
+
+
+class CondensedGraph:
+    """
+    Dependency graph with each SCC collapsed into a super-node.
+
+    Edges point from dependency to dependent (migrate src before dst). A super-node
+    is a set of apps that must cut over together (feature toggle / dual-run).
+    """
+
+    def __init__(self, G):
+        self.graph = G
+        self.dag = nx.condensation(G)           # node attr 'members', DAG by construction
+        self.mapping = self.dag.graph['mapping']  # app -> super-node id
+        self._members = {scc: sorted(data['members']) for scc, data in self.dag.nodes(data=True)}
+
+    def members(self, scc):
+        return self._members[scc]
+
+    def label(self, scc):
+        members = self.members(scc)
+        return members[0] if len(members) == 1 else '{' + ', '.join(members) + '}'
+
+    def cycles(self):
+        """Circular dependency groups as SCC membership lists (largest first)"""
+        self_loops = set(nx.nodes_with_selfloops(self.graph))
+        groups = [
+            members for members in self._members.values()
+            if len(members) > 1 or members[0] in self_loops
+        ]
+        return sorted(groups, key=lambda g: (-len(g), g))
+
+    def topological_order(self):
+        """Super-nodes in migration order (dependencies first), ties broken by app name"""
+        return list(nx.lexicographical_topological_sort(self.dag, key=lambda scc: self.members(scc)[0]))
+
+    def critical_path(self):
+        """
+        Longest dependency chain, weighted by super-node size (every member of an SCC
+        migrates on the path). Single DP pass over a topological order.
+        """
+        best = {}
+        parent = {}
+        for scc in nx.topological_sort(self.dag):
+            preds = list(self.dag.predecessors(scc))
+            parent[scc] = max(preds, key=lambda p: best[p]) if preds else None
+            best[scc] = len(self._members[scc]) + (best[parent[scc]] if preds else 0)
+
+        if not best:
+            return []
+        scc = max(best, key=best.get)
+        path = []
+        while scc is not None:
+            path.append(scc)
+            scc = parent[scc]
+        return path[::-1]
+
+    def waves(self):
+        """Kahn waves over the condensed DAG: [(wave_num, [super-node, ...]), ...] (acyclic, never FORCED)"""
+        waves, _ = assign_waves(self.dag)
+        return [
+            (wave_num, sorted(sccs, key=lambda scc: self.members(scc)[0]))
+            for wave_num, sccs in waves
+        ]
+
+
+def dependency_matrix(nodes, edges):
+    """
+    Sparse CSR dependency matrix (row depends on column, 1 per distinct edge).
+
+    O(1) dict id→index lookups per edge and O(V + E) memory, so program/file-level
+    graphs (n ≈ 250k) never allocate the n×n dense array. Edges whose endpoints are not
+    in nodes are skipped. Returns (matrix, index).
+    """
+    import scipy.sparse as sp
+
+    index = {node: i for i, node in enumerate(nodes)}
+    pairs = [(index[src], index[dst]) for src, dst in edges if src in index and dst in index]
+    rows, cols = zip(*pairs) if pairs else ((), ())
+    matrix = sp.coo_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(len(index), len(index))
+    ).tocsr()
+    matrix.data[:] = 1  # duplicate edges summed by tocsr() collapse back to 1
+    return matrix, index
+
+
+def _bit_positions(bits):
+    """Indices of set bits (one bin() pass instead of repeated shifts)"""
+    digits = bin(bits)[:1:-1]
+    positions = []
+    i = digits.find('1')
+    while i >= 0:
+        positions.append(i)
+        i = digits.find('1', i + 1)
+    return positions
+
+
+class ReachabilityIndex:
+    """
+    Precomputed transitive closure of the condensed DAG as per-super-node bitsets
+    (Python ints, bit i = super-node i), both directions:
+    - descendants: what is blocked if this app slips (blast radius)
+    - ancestors: what this app transitively depends on
+
+    reaches() is a single bit test (O(1)); set queries OR/expand bitsets in O(k/64) word
+    ops for k super-nodes. Memory is k²/8 bytes per direction (≈ 300 MB at k = 50k).
+    Edge additions/removals between existing SCCs update only the affected ancestor /
+    descendant cone; SCC merges or splits (and new apps) fall back to a full rebuild.
+    """
+
+    def __init__(self, G):
+        self.graph = G.copy()
+        self._build()
+
+    def _build(self):
+        self.cg = CondensedGraph(self.graph)
+        dag = self.cg.dag
+        order = list(nx.topological_sort(dag))
+        self.desc = {}
+        for scc in reversed(order):
+            bits = 1 << scc
+            for succ in dag.successors(scc):
+                bits |= self.desc[succ]
+            self.desc[scc] = bits
+        self.anc = {}
+        for scc in order:
+            bits = 1 << scc
+            for pred in dag.predecessors(scc):
+                bits |= self.anc[pred]
+            self.anc[scc] = bits
+
+    def _apps(self, bits, exclude=()):
+        apps = [app for scc in _bit_positions(bits) for app in self.cg.members(scc)]
+        return sorted(set(apps) - set(exclude))
+
+    def reaches(self, src, dst):
+        """True if dst transitively depends on src (src must migrate first)"""
+        return bool(self.desc[self.cg.mapping[src]] >> self.cg.mapping[dst] & 1)
+
+    def descendants(self, app):
+        """Apps blocked if app slips"""
+        return self._apps(self.desc[self.cg.mapping[app]], exclude=(app,))
+
+    def ancestors(self, app):
+        """Apps that app transitively depends on"""
+        return self._apps(self.anc[self.cg.mapping[app]], exclude=(app,))
+
+    def blast_radius(self, apps):
+        """Batch query: union of everything blocked if any of apps slips (one OR per app)"""
+        bits = 0
+        for app in apps:
+            bits |= self.desc[self.cg.mapping[app]]
+        return self._apps(bits, exclude=apps)
+
+    def blast_radius_sizes(self, apps=None):
+        """Batch query: {app: number of other apps blocked} via popcount, no expansion"""
+        extra = {scc: len(self.cg.members(scc)) - 1 for scc in self.desc if len(self.cg.members(scc)) > 1}
+        sizes = {}
+        for app in (self.graph if apps is None else apps):
+            bits = self.desc[self.cg.mapping[app]]
+            sizes[app] = bits.bit_count() + sum(n for scc, n in extra.items() if bits >> scc & 1) - 1
+        return sizes
+
+    def add_edge(self, src, dst):
+        """src → dst (dst depends on src)"""
+        known = src in self.graph and dst in self.graph
+        self.graph.add_edge(src, dst)
+        if not known:
+            return self._build()
+        u, v = self.cg.mapping[src], self.cg.mapping[dst]
+        if u == v:
+            return
+        if self.desc[v] >> u & 1:
+            return self._build()  # closes a cycle: SCCs merge
+        self.cg.dag.add_edge(u, v)
+        for a in _bit_positions(self.anc[u]):
+            self.desc[a] |= self.desc[v]
+        for d in _bit_positions(self.desc[v]):
+            self.anc[d] |= self.anc[u]
+
+    def remove_edge(self, src, dst):
+        self.graph.remove_edge(src, dst)
+        u, v = self.cg.mapping[src], self.cg.mapping[dst]
+        if u == v:
+            return self._build()  # SCC may split
+        members_u, members_v = self.cg.members(u), set(self.cg.members(v))
+        if any(succ in members_v for app in members_u for succ in self.graph.successors(app)):
+            return  # another edge still links the two super-nodes
+        dag = self.cg.dag
+        dag.remove_edge(u, v)
+
+        # If x reaches y then desc(x) ⊋ desc(y): ascending popcount of the old bitsets is a
+        # valid reverse topological order over the affected cone (no order to maintain)
+        for a in sorted(_bit_positions(self.anc[u]), key=lambda s: self.desc[s].bit_count()):
+            bits = 1 << a
+            for succ in dag.successors(a):
+                bits |= self.desc[succ]
+            self.desc[a] = bits
+        for d in sorted(_bit_positions(self.desc[v]), key=lambda s: self.anc[s].bit_count()):
+            bits = 1 << d
+            for pred in dag.predecessors(d):
+                bits |= self.anc[pred]
+            self.anc[d] = bits
@@ -0,0 +1,52 @@
+# scripts/dependency_plot.py
+from dependency_graph import CondensedGraph
+
+# Optional dependency-graph rendering for Tasks 0.2 / 2.3
+# matplotlib (~0.8s to import pyplot) is only loaded when a plot is requested
+# (--plot PATH); analysis runs and scheduled jobs never pay for it.
+# Layout: one column per migration wave on the condensed DAG, so circular dependency
+# groups are drawn as a single box and edges always point left to right.
+
+
+def _box_label(cg, scc, max_members=3):
+    members = cg.members(scc)
+    if len(members) <= max_members:
+        return cg.label(scc)
+    return '{' + ', '.join(members[:max_members]) + f', … +{len(members) - max_members}}}'
+
+
+def render_dependency_graph(G, path, title='Application Dependencies'):
+    """Writes a wave-layered drawing of G (edge u → v: u migrates before v) to path (PNG/SVG/PDF)"""
+    import matplotlib
+    matplotlib.use('Agg')  # headless: no display on batch hosts
+    import matplotlib.pyplot as plt
+
+    cg = CondensedGraph(G)
+    waves = cg.waves()
+    pos = {}
+    for wave_num, sccs in waves:
+        for row, scc in enumerate(sccs):
+            pos[scc] = (wave_num, -row)
+
+    height = max((len(sccs) for _, sccs in waves), default=1)
+    fig, ax = plt.subplots(figsize=(3 * max(len(waves), 1) + 2, 0.6 * height + 2))
+    for src, dst in cg.dag.edges():
+        ax.annotate('', xy=pos[dst], xytext=pos[src],
+                    arrowprops=dict(arrowstyle='->', color='grey', lw=0.8, shrinkA=18, shrinkB=18))
+    for scc, (x, y) in pos.items():
+        cyclic = len(cg.members(scc)) > 1
+        ax.text(x, y, _box_label(cg, scc), ha='center', va='center', fontsize=8,
+                bbox=dict(boxstyle='round', fc='mistyrose' if cyclic else 'lightsteelblue', ec='black'))
+
+    ax.set_xticks([wave_num for wave_num, _ in waves])
+    ax.set_xticklabels([f"Wave {wave_num}" for wave_num, _ in waves])
+    ax.set_yticks([])
+    ax.set_xlim(0.3, len(waves) + 0.7)
+    ax.set_ylim(-height + 0.3, 0.7)
+    ax.set_title(title)
+    for side in ('left', 'right', 'top'):
+        ax.spines[side].set_visible(False)
+    fig.tight_layout()
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
+    return path
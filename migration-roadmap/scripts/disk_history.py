@@ -0,0 +1,282 @@
+# scripts/disk_history.py
+import glob
+import math
+
+from lazy_imports import lazy_import
+from portfolio_scoring import ASSESSMENT_DATE
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Streaming growth-curve fitter for Task 0.3 (replaces the synthetic growth-rate placeholder)
+# Input: daily DSPFD / RTVDSKINF-style outfile exports, one row per object per snapshot
+# (date, library, object, size in bytes). Exports are streamed in record batches; per object
+# only the running sums of the least-squares normal equations are kept (15 floats + last
+# observation), so memory is O(objects) no matter how many days of history are read.
+#
+# Model per object (log size, t in years from ASSESSMENT_DATE, φ = day-of-year angle):
+#   ln(bytes) = a + b·t + s·sin φ + c·cos φ
+#   Annual_Growth_Rate = e^b - 1; seasonality = s·sin φ + c·cos φ (peak month, amplitude)
+# Objects with less than a year of history get the trend-only fit (a + b·t), as do objects whose
+# snapshots leave sin φ / cos φ collinear (e.g. one snapshot a year on the same day).
+
+DISK_HISTORY_GLOB = '/mnt/user-data/uploads/disk_usage_history/*.csv'
+
+HISTORY_COLUMNS = {'date': 'Snapshot_Date', 'library': 'Library', 'object': 'Object', 'size': 'Size_Bytes'}
+
+# Copies of production objects outside the app's libraries (test, QA, backup, save files):
+# the inventory names objects without a library, so these must not roll up into the app
+# the environment tags sit at either end of the name (TESTINV, INV002DEV, QA_POS, POSBKP2), and
+# the short ones only before a digit / separator, so SAVINGS or DEVICES stay in production
+NON_PRODUCTION_LIBRARIES = (r'^(?:QGPL|QTEMP|QUSRSYS|#\w*)$|^(?:TEST|BACKUP)'
+                            r'|^(?:TST|DEV|QA|UAT|BKP|SAV)(?:[0-9_#@$]|$)|(?:TEST|TST|DEV|QA|UAT|BKP|BACKUP|SAV)[0-9]*$')
+
+MIN_OBSERVATIONS = 8
+SEASONAL_MIN_DAYS = 365
+RANK_TOLERANCE = 1e-10  # smallest / largest singular value of XᵀX below this: a feature is collinear
+Z_95 = 1.96
+
+BLOCK_SIZE = 64 << 20  # CSV bytes per batch
+
+# Running sums, features x = (1, t, sin φ, cos φ) and target y
+_FEATURES = 4
+_PAIRS = [(i, j) for i in range(_FEATURES) for j in range(i, _FEATURES)]  # upper triangle of XᵀX
+_STATS = len(_PAIRS) + _FEATURES + 1                                     # + Xᵀy + yᵀy
+
+
+def _features(days, reference):
+    """Design columns for dates given as datetime64[D]"""
+    t = (days - np.datetime64(reference, 'D')).astype(np.float64) / 365.25
+    day_of_year = (days - days.astype('datetime64[Y]')).astype(np.float64)
+    angle = 2 * math.pi * day_of_year / 365.25
+    return [np.ones_like(t), t, np.sin(angle), np.cos(angle)]
+
+
+class GrowthFitter:
+    """Per-object running regression state; update() with chunks, fit() at any point"""
+
+    def __init__(self, reference=ASSESSMENT_DATE):
+        self.reference = reference
+        self.keys = {}  # (library, object) -> row in the state arrays
+        self.stats = np.zeros((0, _STATS))
+        self.first = np.zeros(0, dtype='datetime64[D]')
+        self.last = np.zeros(0, dtype='datetime64[D]')
+        self.last_bytes = np.zeros(0)
+
+    def _ids(self, libraries, objects):
+        # Factorize each key column, then the combined integer codes: far cheaper than tuples
+        lib_codes, lib_names = pd.factorize(libraries)
+        obj_codes, obj_names = pd.factorize(objects)
+        lib_names, obj_names = lib_names.tolist(), obj_names.tolist()
+        codes, pairs = pd.factorize(lib_codes.astype(np.int64) * len(obj_names) + obj_codes)
+        ids = np.array([self.keys.setdefault((lib_names[pair // len(obj_names)], obj_names[pair % len(obj_names)]),
+                                             len(self.keys)) for pair in pairs.tolist()], dtype=np.int64)
+        if len(self.keys) > len(self.stats):
+            grow = max(len(self.keys), 2 * len(self.stats)) - len(self.stats)
+            self.stats = np.vstack([self.stats, np.zeros((grow, _STATS))])
+            self.first = np.concatenate([self.first, np.full(grow, np.datetime64('NaT'), dtype='datetime64[D]')])
+            self.last = np.concatenate([self.last, np.full(grow, np.datetime64('NaT'), dtype='datetime64[D]')])
+            self.last_bytes = np.concatenate([self.last_bytes, np.zeros(grow)])
+        return ids[codes]
+
+    def update(self, dates, libraries, objects, sizes):
+        """
+        Adds one chunk of observations (equal-length arrays; sizes in bytes). Libraries and
+        objects may be pandas Categoricals - factorizing those skips hashing every string.
+        """
+        days = np.asarray(dates, dtype='datetime64[D]')
+        sizes = np.asarray(sizes, dtype=np.float64)
+        keep = sizes > 0  # ln(0) undefined: empty members carry no growth signal
+        if not keep.all():
+            days, sizes = days[keep], sizes[keep]
+            libraries, objects = (values[keep] if isinstance(values, pd.Categorical) else np.asarray(values)[keep]
+                                  for values in (libraries, objects))
+        if not len(days):
+            return
+        ids = self._ids(libraries, objects)
+        n = len(self.stats)
+
+        x = _features(days, self.reference)
+        y = np.log(sizes)
+        columns = [x[i] * x[j] for i, j in _PAIRS] + [xi * y for xi in x] + [y * y]
+        for k, column in enumerate(columns):
+            self.stats[:, k] += np.bincount(ids, weights=column, minlength=n)
+
+        # First/last observation per object (datetime64[D] as int64 days; NaT is the int64 minimum)
+        touched = np.bincount(ids, minlength=n) > 0
+        day_numbers = days.view(np.int64)
+        chunk_last = np.full(n, np.iinfo(np.int64).min)
+        np.maximum.at(chunk_last, ids, day_numbers)
+        chunk_first = np.full(n, np.iinfo(np.int64).max)
+        np.minimum.at(chunk_first, ids, day_numbers)
+
+        last = self.last.view(np.int64)
+        newer = touched & (chunk_last >= last)
+        at_last = np.flatnonzero(day_numbers == chunk_last[ids])
+        at_last = at_last[newer[ids[at_last]]]
+        self.last_bytes[ids[at_last]] = sizes[at_last]
+        last[newer] = chunk_last[newer]
+
+        first = self.first.view(np.int64)
+        older = touched & (np.isnat(self.first) | (chunk_first < first))
+        first[older] = chunk_first[older]
+
+    def fit(self):
+        """
+        One row per object: Library, Object, Observations, First_Date, Last_Date, Current_GB,
+        Model, Annual_Growth_Rate, Growth_Rate_Low/High (95% CI of the trend), Seasonal_Amplitude
+        (peak-to-mean, as a fraction), Peak_Month, R_Squared, plus the coefficients (b, s, c) for
+        projection. Objects with too little history have Model = None and NaN estimates.
+        """
+        k = len(self.keys)
+        stats = self.stats[:k]
+        xtx = np.empty((k, _FEATURES, _FEATURES))
+        for col, (i, j) in enumerate(_PAIRS):
+            xtx[:, i, j] = xtx[:, j, i] = stats[:, col]
+        xty = stats[:, len(_PAIRS):len(_PAIRS) + _FEATURES]
+        yty = stats[:, -1]
+        n = stats[:, 0]
+        span = (self.last[:k] - self.first[:k]).astype(np.float64)
+
+        seasonal = (n >= MIN_OBSERVATIONS) & (span >= SEASONAL_MIN_DAYS)
+        trend = (n >= MIN_OBSERVATIONS) & (span > 0) & ~seasonal
+        coef = np.full((k, _FEATURES), np.nan)
+        slope_var = np.full(k, np.nan)
+        rss = np.full(k, np.nan)
+        for mask, p in ((seasonal, _FEATURES), (trend, 2)):
+            # rank-deficient normal matrices: seasonal → trend-only, trend → no model
+            rows = np.flatnonzero(mask)
+            if len(rows):
+                singular = np.linalg.svd(xtx[rows, :p, :p], compute_uv=False)
+                deficient = rows[singular[:, -1] <= singular[:, 0] * RANK_TOLERANCE]
+                mask[deficient] = False
+                if p == _FEATURES:
+                    trend[deficient] = True
+            if not mask.any():
+                continue
+            a, v = xtx[mask][:, :p, :p], xty[mask][:, :p]
+            beta = np.linalg.solve(a, v[..., None])[..., 0]
+            residual = np.maximum(yty[mask] - (beta * v).sum(axis=1), 0.0)
+            sigma2 = residual / np.maximum(n[mask] - p, 1)
+            coef[mask, :p] = beta
+            coef[mask, p:] = 0.0
+            slope_var[mask] = sigma2 * np.linalg.inv(a)[:, 1, 1]
+            rss[mask] = residual
+
+        b, s, c = coef[:, 1], coef[:, 2], coef[:, 3]
+        se = np.sqrt(slope_var)
+        tss = yty - xty[:, 0] ** 2 / np.maximum(n, 1)
+        peak_angle = np.arctan2(s, c) % (2 * math.pi)
+        libraries, objects = zip(*self.keys) if k else ((), ())
+        return pd.DataFrame({
+            'Library': list(libraries),
+            'Object': list(objects),
+            'Observations': n.astype(np.int64),
+            'First_Date': self.first[:k],
+            'Last_Date': self.last[:k],
+            'Current_GB': self.last_bytes[:k] / 1024 ** 3,
+            'Model': np.where(seasonal, 'trend+seasonal', np.where(trend, 'trend', None)),
+            'Annual_Growth_Rate': np.expm1(b),
+            'Growth_Rate_Low': np.expm1(b - Z_95 * se),
+            'Growth_Rate_High': np.expm1(b + Z_95 * se),
+            'Seasonal_Amplitude': np.where(seasonal, np.expm1(np.hypot(s, c)), 0.0),
+            'Peak_Month': np.where(seasonal, np.floor(peak_angle / (2 * math.pi) * 12) + 1, np.nan),
+            'R_Squared': np.where(tss > 0, 1 - rss / np.where(tss > 0, tss, 1), np.nan),
+            'Trend': b, 'Season_Sin': s, 'Season_Cos': c,
+        })
+
+
+def fit_history(paths=None, columns=HISTORY_COLUMNS, reference=ASSESSMENT_DATE, block_size=BLOCK_SIZE):
+    """Streams every export in paths (default: DISK_HISTORY_GLOB) through a GrowthFitter"""
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+
+    paths = sorted(glob.glob(DISK_HISTORY_GLOB)) if paths is None else paths
+    fitter = GrowthFitter(reference)
+    for path in paths:
+        reader = pcsv.open_csv(
+            path,
+            read_options=pcsv.ReadOptions(block_size=block_size),
+            convert_options=pcsv.ConvertOptions(
+                include_columns=list(columns.values()),
+                column_types={columns['date']: pa.date32(), columns['library']: pa.string(),
+                              columns['object']: pa.string(), columns['size']: pa.float64()},
+            ),
+        )
+        for batch in reader:
+            fitter.update(
+                batch.column(columns['date']).to_numpy(zero_copy_only=False),
+                batch.column(columns['library']).dictionary_encode().to_pandas(),
+                batch.column(columns['object']).dictionary_encode().to_pandas(),
+                batch.column(columns['size']).to_numpy(),
+            )
+    return fitter.fit()
+
+
+def _season(fits, days):
+    _, _, sin, cos = _features(np.asarray(days, dtype='datetime64[D]'), ASSESSMENT_DATE)
+    return fits['Season_Sin'].to_numpy() * sin + fits['Season_Cos'].to_numpy() * cos
+
+
+def app_growth(fits, inventory, months=24, start=ASSESSMENT_DATE, libraries=None):
+    """
+    Rolls object fits up to applications via the inventory's DB2_Objects_List.
+
+    libraries: {App_ID: [library, ...]} joins on (Library, Object). Without it, objects in
+    NON_PRODUCTION_LIBRARIES are dropped and an object name still found in several libraries
+    counts once, in the library holding the most data.
+
+    Per App_ID (apps with at least one fitted object): Fitted_Objects, History_GB (fitted size
+    of those objects at start), Growth_Factor (projected / current over the horizon, trend + seasonality),
+    Annual_Growth_Rate / Growth_Rate_Low / Growth_Rate_High (size-weighted trend and its 95% CI,
+    annualized) and Seasonal_Factor (seasonal part of Growth_Factor).
+    """
+    fitted = fits[fits['Model'].notna()]
+    objects = inventory[['App_ID', 'DB2_Objects_List']].explode('DB2_Objects_List')
+    if libraries is not None:
+        objects = objects.merge(pd.Series(libraries, name='Library').explode().rename_axis('App_ID').reset_index())
+        merged = objects.merge(fitted, left_on=['Library', 'DB2_Objects_List'], right_on=['Library', 'Object'])
+    else:
+        fitted = fitted[~fitted['Library'].str.contains(NON_PRODUCTION_LIBRARIES, regex=True)]
+        merged = (objects.merge(fitted, left_on='DB2_Objects_List', right_on='Object')
+                  .sort_values('Current_GB', ascending=False, kind='stable')
+                  .drop_duplicates(['App_ID', 'Object']).sort_index(kind='stable').reset_index(drop=True))
+    if merged.empty:
+        return pd.DataFrame(columns=['Fitted_Objects', 'History_GB', 'Growth_Factor', 'Annual_Growth_Rate',
+                                     'Growth_Rate_Low', 'Growth_Rate_High', 'Seasonal_Factor'],
+                            index=pd.Index([], name='App_ID'))
+
+    start_day = np.datetime64(start, 'D')
+    horizon = np.datetime64(pd.Timestamp(start) + pd.DateOffset(months=months), 'D')
+    years = (horizon - start_day).astype(np.float64) / 365.25
+    b = merged['Trend'].to_numpy()
+    gap = (start_day - merged['Last_Date'].to_numpy().astype('datetime64[D]')).astype(np.float64) / 365.25
+    at_start = _season(merged, np.full(len(merged), start_day))
+    # Object size at the assessment date (fit carried forward from the last observation):
+    # inventory volumes are as of then, so the growth factor runs start → horizon
+    weight = merged['Current_GB'].to_numpy() * np.exp(b * gap + at_start - _season(merged, merged['Last_Date']))
+    season = np.exp(_season(merged, np.full(len(merged), horizon)) - at_start)
+    se = (np.log1p(merged['Growth_Rate_High']) - np.log1p(merged['Annual_Growth_Rate'])).to_numpy() / Z_95
+
+    def trend_gb(slope):
+        return weight * np.exp(slope * years)
+
+    rolled = pd.DataFrame({
+        'App_ID': merged['App_ID'],
+        'Fitted_Objects': 1,
+        'History_GB': weight,
+        'Trend_GB': trend_gb(b),
+        'Low_GB': trend_gb(b - Z_95 * se),
+        'High_GB': trend_gb(b + Z_95 * se),
+        'Projected_GB': trend_gb(b) * season,
+    }).groupby('App_ID').sum()
+
+    return pd.DataFrame({
+        'Fitted_Objects': rolled['Fitted_Objects'],
+        'History_GB': rolled['History_GB'],
+        'Growth_Factor': rolled['Projected_GB'] / rolled['History_GB'],
+        'Annual_Growth_Rate': (rolled['Trend_GB'] / rolled['History_GB']) ** (1 / years) - 1,
+        'Growth_Rate_Low': (rolled['Low_GB'] / rolled['History_GB']) ** (1 / years) - 1,
+        'Growth_Rate_High': (rolled['High_GB'] / rolled['History_GB']) ** (1 / years) - 1,
+        'Seasonal_Factor': rolled['Projected_GB'] / rolled['Trend_GB'],
+    })
@@ -0,0 +1,118 @@
+# scripts/growth_simulation.py
+from lazy_imports import lazy_import
+from portfolio_scoring import ASSESSMENT_DATE
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Monte Carlo data-growth engine for Task 0.3
+# Each simulated path gives every app a persistent annual trend (uniform in its usage
+# frequency's range) and month-to-month volatility around it; Q4 months grow 15% faster
+# (holiday transaction volume). Each app's path compounds over the horizon:
+#   rate_m = trend × U(1 - MONTHLY_VOLATILITY, 1 + MONTHLY_VOLATILITY)
+#   GB_horizon = GB_now × exp(Σ_m w_m · ln(1 + rate_m)),   w_m = 1/12 (× 1.15 in Oct-Dec)
+# Draws are generated in chunks of simulations and immediately reduced to per-group totals
+# (two matrix products), so memory is one chunk of draws plus n_sims × groups totals.
+# Apps with fitted disk-usage history (disk_history.py) pass their own trend bounds and
+# q4_spike=0 - their seasonality is already in the fitted volume.
+
+GROWTH_RATE_RANGES = {
+    'daily': (0.08, 0.15),    # 8-15% annual
+    'weekly': (0.04, 0.08),   # 4-8% annual
+    'monthly': (0.02, 0.05),  # 2-5% annual
+}
+DEFAULT_GROWTH_RATE = 0.05    # unknown usage frequency: fixed 5%
+
+MONTHLY_VOLATILITY = 0.5     # month's rate within ±50% of the path's trend
+
+Q4_SPIKE = 0.15
+Q4_MONTHS = (10, 11, 12)
+
+QUANTILES = (0.50, 0.90, 0.99)
+
+CHUNK_ELEMENTS = 1 << 20  # draws per chunk (float32: 4 MB, cache-resident - faster than larger chunks)
+
+
+def rate_bounds(usage):
+    """Per-app (low, high) annual growth rate arrays for a Usage_Frequency column"""
+    low = np.array([GROWTH_RATE_RANGES.get(u, (DEFAULT_GROWTH_RATE,) * 2)[0] for u in usage], dtype=np.float32)
+    high = np.array([GROWTH_RATE_RANGES.get(u, (DEFAULT_GROWTH_RATE,) * 2)[1] for u in usage], dtype=np.float32)
+    return low, high
+
+
+def month_weights(months, start=ASSESSMENT_DATE, q4_spike=Q4_SPIKE):
+    """w_m for each projected month (first month = the one after start)"""
+    calendar_months = [(start.month + m) % 12 + 1 for m in range(months)]
+    return np.array([(1 + q4_spike if cm in Q4_MONTHS else 1.0) / 12 for cm in calendar_months], dtype=np.float32)
+
+
+def expected_projection(volume_gb, usage, months=24, start=ASSESSMENT_DATE, bounds=None, q4_spike=Q4_SPIKE):
+    """Central per-app projection: mid-range trend every month, same seasonality"""
+    low, high = rate_bounds(usage) if bounds is None else bounds
+    mid = (np.asarray(low, dtype=np.float64) + high) / 2
+    return np.asarray(volume_gb, dtype=np.float64) * np.exp(np.log1p(mid) * _log_weights(months, start, q4_spike))
+
+
+def _log_weights(months, start, q4_spike):
+    """Σ_m w_m per app: scalar for a shared q4_spike, array for per-app spikes"""
+    if not np.ndim(q4_spike):
+        return month_weights(months, start, q4_spike).sum(dtype=np.float64)
+    base = month_weights(months, start, 0.0).sum(dtype=np.float64)
+    q4 = month_weights(months, start, 1.0).sum(dtype=np.float64) - base
+    return base + np.asarray(q4_spike, dtype=np.float64) * q4
+
+
+def simulate_totals(volume_gb, usage, groups, n_sims=100_000, months=24, start=ASSESSMENT_DATE,
+                    seed=42, chunk_elements=CHUNK_ELEMENTS, bounds=None, q4_spike=Q4_SPIKE):
+    """
+    Projected GB at the horizon summed per group, one row per simulation.
+
+    bounds = (low, high) per-app trend arrays replaces the usage-frequency ranges;
+    q4_spike may be a per-app array. Returns (labels, totals): labels = sorted distinct
+    groups, totals = (n_sims, len(labels)) float64 array. Reproducible for a given seed
+    and chunk_elements.
+    """
+    rng = np.random.default_rng(seed)
+    low, high = rate_bounds(usage) if bounds is None else (np.asarray(b, dtype=np.float32) for b in bounds)
+    span = (high - low)[:, None]
+    low = low[:, None]
+    if np.ndim(q4_spike):
+        # per-app spikes: base weights for every app, plus spike_a × the Q4-only weights
+        weights = month_weights(months, start, 0.0)
+        q4_weights = month_weights(months, start, 1.0) - weights
+        spikes = np.asarray(q4_spike, dtype=np.float32)
+    else:
+        weights = month_weights(months, start, q4_spike)
+    labels, codes = np.unique(np.asarray(groups), return_inverse=True)
+
+    # apps × groups matrix of current volume: factor @ volume_by_group = per-group totals
+    volume_by_group = np.zeros((len(codes), len(labels)))
+    volume_by_group[np.arange(len(codes)), codes] = np.asarray(volume_gb, dtype=np.float64)
+
+    totals = np.empty((n_sims, len(labels)))
+    chunk = max(1, chunk_elements // max(1, len(codes) * months))
+    for first in range(0, n_sims, chunk):
+        size = min(chunk, n_sims - first)
+        trend = rng.random((size, len(codes), 1), dtype=np.float32) * span + low
+        draws = rng.random((size, len(codes), months), dtype=np.float32)
+        draws *= 2 * MONTHLY_VOLATILITY
+        draws += 1 - MONTHLY_VOLATILITY
+        draws *= trend
+        np.log1p(draws, out=draws)
+        growth = draws @ weights
+        if np.ndim(q4_spike):
+            growth += spikes * (draws @ q4_weights)
+        factor = np.exp(growth.astype(np.float64))  # (size, apps)
+        totals[first:first + size] = factor @ volume_by_group
+    return labels, totals
+
+
+def growth_quantiles(labels, totals, quantiles=QUANTILES, total_label='TOTAL'):
+    """P50/P90/P99 (per quantiles) per group plus the portfolio total, as a DataFrame"""
+    rows = np.column_stack([totals, totals.sum(axis=1)])
+    values = np.quantile(rows, quantiles, axis=0).T
+    return pd.DataFrame(
+        values,
+        index=pd.Index(list(labels) + [total_label], name='Data_Temperature'),
+        columns=[f"P{round(q * 100)}_GB_24mo" for q in quantiles],
+    )
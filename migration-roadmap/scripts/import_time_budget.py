@@ -0,0 +1,80 @@
+# scripts/import_time_budget.py
+import os
+import re
+import subprocess
+import sys
+
+# Cold-start budget for the shared analysis modules (python -X importtime)
+# Run: python import_time_budget.py   → exit 1 if any module is over budget or pulls
+# a heavy library in at import time (they must stay lazy, see lazy_imports.py)
+
+BUDGET_MS = {
+    'lazy_imports': 30,
+    'wave_scheduler': 30,
+    'dependency_graph': 60,
+    'portfolio_scoring': 60,
+    'window_scheduler': 80,
+    'dependency_plot': 80,
+    'inventory_snapshot': 30,
+    'growth_simulation': 60,
+    'disk_history': 60,
+    'source_metrics': 40,
+    'call_graph': 50,
+    'pii_scanner': 50,
+    'compliance_rules': 30,
+    'traffic_model': 40,
+    'transfer_simulator': 60,
+    'spool_model': 30,
+    'dds_catalog': 50,
+    'ddl_generator': 50,
+    'lf_redundancy': 50,
+    'column_profiler': 50,
+    'pipeline': 80,
+}
+
+# Loaded on first use only: pandas ~0.7s, matplotlib.pyplot ~0.8s, networkx ~0.2s
+HEAVY = ['pandas', 'numpy', 'networkx', 'scipy', 'matplotlib', 'pyarrow']
+
+RUNS = 5  # best of N (first run also pays for .pyc compilation)
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def measure(module):
+    """Cumulative import time (µs, best of RUNS) and every module loaded by `import module`"""
+    best, loaded = None, set()
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True
+        )
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if not match:
+                continue
+            loaded.add(match.group(4))
+            if match.group(4) == module and match.group(3) == ' ':  # top level, not nested
+                cumulative = int(match.group(2))
+                best = cumulative if best is None else min(best, cumulative)
+    return best, loaded
+
+
+failures = []
+print(f"{'Module':<20} {'Import (ms)':>12} {'Budget (ms)':>12}  Heavy imports")
+for module, budget in BUDGET_MS.items():
+    micros, loaded = measure(module)
+    heavy = sorted({name.split('.')[0] for name in loaded} & set(HEAVY))
+    ms = micros / 1000
+    status = 'OK' if ms <= budget and not heavy else 'FAIL'
+    print(f"{module:<20} {ms:>12.1f} {budget:>12}  {', '.join(heavy) or '-'}  [{status}]")
+    if ms > budget:
+        failures.append(f"{module}: {ms:.1f} ms > {budget} ms budget")
+    if heavy:
+        failures.append(f"{module}: imports {', '.join(heavy)} at load time")
+
+if failures:
+    print("\n[IMPORT-TIME REGRESSION]")
+    for failure in failures:
+        print(f"  {failure}")
+    sys.exit(1)
+print("\n[OK] All modules within import-time budget")
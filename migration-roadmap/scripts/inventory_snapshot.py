@@ -0,0 +1,115 @@
+# scripts/inventory_snapshot.py
+import os
+
+from lazy_imports import lazy_import
+
+pa = lazy_import('pyarrow')
+pd = lazy_import('pandas')
+
+# Columnar inventory snapshot for the discovery scripts (0.1-0.6, 2.3)
+# AS400_Inventory_Detailed.csv is parsed once into a typed, uncompressed Arrow IPC (Feather v2)
+# file with the delimited fields pre-split into list columns. Scripts open it through a
+# memory map: pages are shared across processes and only the requested columns are touched.
+# The snapshot records the CSV's size/mtime and is re-ingested when the CSV changes.
+
+INVENTORY_CSV = '/mnt/user-data/uploads/AS400_Inventory_Detailed.csv'
+SNAPSHOT_PATH = os.environ.get('INVENTORY_SNAPSHOT', '/tmp/AS400_Inventory_Detailed.arrow')
+SNAPSHOT_VERSION = 2  # bump when ingest changes what a snapshot holds: older ones are re-ingested
+
+# Declared up front so the streaming reader never infers a narrower type from the first block
+# (Last_Modified_Date stays a string, as pd.read_csv leaves it)
+INVENTORY_TYPES = {
+    'App_ID': 'string', 'App_Name': 'string', 'Source_Language': 'string', 'SLOC': 'int64',
+    'Usage_Frequency': 'string', 'Business_Owner': 'string', 'Last_Modified_Date': 'string',
+    'Dependencies': 'string', 'Data_Volume_GB': 'int64', 'Critical_Business_Function': 'string',
+    'DB2_Objects': 'string', 'Network_Calls': 'int64', 'Batch_Jobs': 'int64', 'CICS_TPS': 'int64',
+    'Physical_Files': 'int64', 'Logical_Files': 'int64', 'LF_PF_Ratio': 'float64',
+    'Screen_Sessions_Peak': 'int64', 'Spool_Files_Daily': 'int64', 'Job_Dependencies': 'string',
+    'File_IO_Daily_GB': 'int64', 'Record_Locks_Peak': 'int64', 'API_Endpoints': 'int64',
+}
+
+# pd.read_csv's default NA strings: empty and NA-like cells load as null, not '' (empty
+# Dependencies → a null list, not [''])
+NULL_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+               '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+# Delimited fields → <column>_List (list<string>, items whitespace-trimmed)
+# Dependencies: 'INV002,POS003'   DB2_Objects: 'WHITEM|WHLOC'   Job_Dependencies: 'INV002>ALLOCATION025,...'
+LIST_COLUMNS = {'Dependencies': ',', 'DB2_Objects': '|', 'Job_Dependencies': ','}
+
+BLOCK_SIZE = 64 << 20  # CSV bytes per record batch: ingest memory stays bounded on multi-GB exports
+
+
+def _split(column, separator):
+    import pyarrow.compute as pc
+
+    lists = pc.split_pattern(column, separator)
+    items = pc.utf8_trim_whitespace(lists.flatten())
+    return pa.ListArray.from_arrays(lists.offsets, items, mask=lists.is_null())
+
+
+def _source_stamp(csv_path):
+    stat = os.stat(csv_path)
+    return {b'version': str(SNAPSHOT_VERSION).encode(),
+            b'source': os.path.abspath(csv_path).encode(),
+            b'source_size': str(stat.st_size).encode(),
+            b'source_mtime_ns': str(stat.st_mtime_ns).encode()}
+
+
+def ingest(csv_path=INVENTORY_CSV, snapshot_path=SNAPSHOT_PATH):
+    """
+    CSV → Arrow IPC snapshot, streamed batch by batch. Written to a temp file and renamed,
+    so concurrent readers see either the old or the new snapshot, never a partial one.
+    """
+    import pyarrow.csv as pcsv
+
+    reader = pcsv.open_csv(
+        csv_path,
+        read_options=pcsv.ReadOptions(block_size=BLOCK_SIZE),
+        convert_options=pcsv.ConvertOptions(
+            column_types={name: pa.type_for_alias(alias) for name, alias in INVENTORY_TYPES.items()},
+            null_values=NULL_VALUES, strings_can_be_null=True,
+        ),
+    )
+    schema = reader.schema
+    for column in LIST_COLUMNS:
+        schema = schema.append(pa.field(f"{column}_List", pa.list_(pa.string())))
+    schema = schema.with_metadata(_source_stamp(csv_path))
+
+    tmp = f"{snapshot_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+        for batch in reader:
+            lists = [_split(batch.column(column), separator) for column, separator in LIST_COLUMNS.items()]
+            writer.write_batch(pa.RecordBatch.from_arrays(batch.columns + lists, schema=schema))
+    os.replace(tmp, snapshot_path)
+    return snapshot_path
+
+
+def refresh(csv_path=INVENTORY_CSV, snapshot_path=SNAPSHOT_PATH):
+    """Snapshot path, re-ingesting first if it is missing or older than the CSV"""
+    if os.path.exists(snapshot_path):
+        with pa.memory_map(snapshot_path) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+        if metadata == _source_stamp(csv_path):
+            return snapshot_path
+    return ingest(csv_path, snapshot_path)
+
+
+def inventory_table(columns=None, csv_path=INVENTORY_CSV, snapshot_path=SNAPSHOT_PATH):
+    """
+    Memory-mapped Arrow table (zero-copy: buffers point into the page cache).
+    columns=None → the CSV columns; list columns are opt-in by name (e.g. 'Dependencies_List').
+    """
+    import pyarrow.feather as feather
+
+    path = refresh(csv_path, snapshot_path)
+    if columns is None:
+        with pa.memory_map(path) as source:
+            names = pa.ipc.open_file(source).schema.names
+        columns = [name for name in names if not name.endswith('_List')]
+    return feather.read_table(path, columns=columns, memory_map=True)
+
+
+def load_inventory(columns=None, csv_path=INVENTORY_CSV, snapshot_path=SNAPSHOT_PATH):
+    """Inventory DataFrame from the snapshot; same columns and dtypes as pd.read_csv(csv_path)"""
+    return inventory_table(columns, csv_path, snapshot_path).to_pandas()
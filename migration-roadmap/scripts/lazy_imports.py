@@ -0,0 +1,43 @@
+# scripts/lazy_imports.py
+import importlib.util
+import sys
+
+# Lazy, optional imports for the analysis scripts
+# Heavy libraries (networkx, scipy, matplotlib, pandas) are bound at import time but only
+# executed on first attribute access, so scheduled jobs pay for what they actually use.
+# Missing optional dependencies fail at first use with an install hint, not at import.
+
+
+class _MissingModule:
+    def __init__(self, name, hint):
+        self._name = name
+        self._hint = hint
+
+    def __getattr__(self, attr):
+        raise ModuleNotFoundError(
+            f"Optional dependency '{self._name}' is not installed ({self._hint})"
+        )
+
+
+def lazy_import(name, hint=None):
+    """
+    Returns module `name`, deferring its execution until first attribute access
+    (importlib.util.LazyLoader). Already-imported modules are returned as is.
+    Meant for top-level packages: resolving a submodule spec (scipy.sparse) imports
+    its parent eagerly, so submodules are imported inside the function that needs them.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        spec = importlib.util.find_spec(name)
+    except ModuleNotFoundError:  # parent package missing (e.g. scipy for scipy.sparse)
+        spec = None
+    if spec is None:
+        return _MissingModule(name, hint or f"pip install {name.split('.')[0]}")
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
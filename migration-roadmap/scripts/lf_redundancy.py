@@ -0,0 +1,295 @@
+# scripts/lf_redundancy.py
+import time
+
+from compliance_rules import split_catalog
+from ddl_generator import column_types
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Logical file redundancy analysis for Task 1.1 (which LF access paths need a target index)
+# Every keyed access path over a PF - the PF's own key and each LF record format based on it -
+# is a key-field sequence. Per PF the sequences go into a trie (one node per key field and
+# direction); a path whose node has children is a strict prefix of a longer path, and paths
+# ending on the same node are duplicates. An index on a leaf serves every path above it, so
+# the minimal index set is one path per leaf, plus the UNIQUE paths (the target needs their
+# constraint) - everything else becomes a view reading through a kept index. A select/omit LF
+# is a partial index: it only serves paths with the same select/omit.
+#
+# Key direction: a B-tree is read both ways, so a sequence whose first key is descending is
+# flipped before it goes into the trie ((A DESC, B ASC) ≡ (A ASC, B DESC)).
+# Not index candidates (become views, see ddl_generator.py): join LFs, aggregate LFs and LFs
+# in arrival sequence (no key fields).
+#
+# Write amplification of a PF: bytes written per inserted row / Record_Length, where each index
+# adds its key bytes plus INDEX_ENTRY_OVERHEAD:
+#   (Record_Length + Σ (Key_Bytes + INDEX_ENTRY_OVERHEAD)) / Record_Length
+#
+# Run: python lf_redundancy.py [--catalog DIR | --lfs N]  (N synthetic LFs: benchmark)
+
+INDEX_ENTRY_OVERHEAD = 12  # PostgreSQL B-tree: 8-byte tuple header with the heap TID + 4-byte line pointer
+TYPE_BYTES = {'SMALLINT': 2, 'INTEGER': 4, 'BIGINT': 8, 'REAL': 4, 'DOUBLE': 8,
+              'DATE': 4, 'TIME': 8, 'TIMESTAMP': 8}  # fixed-width families (text: length, decimal: packed)
+BENCHMARK_LF_PF_RATIO = 3  # WMS001: 84 LFs over 28 PFs
+MIN_PROJECTION_PATHS = 30  # keyed LFs analyzed before their drop rate is applied to the inventory's Logical_Files
+
+PATH_COLUMNS = ['App_ID', 'PF', 'File_Name', 'Record_Format', 'File_Type', 'Keys', 'Unique', 'Select_Omit',
+                'Index_Candidate', 'Key_Bytes', 'Record_Count', 'Record_Length']
+
+
+def _direction(keys):
+    """Key tokens ('FIELD' / 'FIELD DESC') → trie tokens, flipped if the first key is descending"""
+    tokens = [(key.split()[0], key.upper().endswith(' DESC')) for key in keys]
+    if tokens and tokens[0][1]:
+        tokens = [(name, not descending) for name, descending in tokens]
+    return tuple(f"{name} DESC" if descending else name for name, descending in tokens)
+
+
+def _key_bytes(keys, widths):
+    """Index key bytes from per-field widths (unknown fields count 0)"""
+    return sum(widths.get(key.split()[0], 0) for key in keys)
+
+
+def column_bytes(columns):
+    """Stored bytes per column of the exploded schema catalog (split_catalog columns)"""
+    types = column_types(columns)
+    length = types['Length'].fillna(0).astype(int)
+    return pd.Series(np.select(
+        [types['Family'].isin(['CHAR', 'VARCHAR', 'BINARY']), types['Family'] == 'DECIMAL'],
+        [length, length // 2 + 1], types['Family'].map(TYPE_BYTES).fillna(0)), index=columns.index).astype(int)
+
+
+def access_paths(schema):
+    """
+    Keyed access paths of a schema catalog in the Task 1.1 layout: one per file, LFs over the file
+    their SELECT reads (Key_Fields 'A,B DESC'; UNIQUE from a PK(...) constraint). PATH_COLUMNS.
+    """
+    schema = schema.reset_index(drop=True)
+    files, columns = split_catalog(schema)
+    is_lf = (schema['File_Type'] == 'LF').to_numpy()
+    view_sql = schema['Columns'].fillna('').where(is_lf, '')
+    pf = files['Based_On'].str.upper().where(is_lf, schema['File_Name'])
+    columns = columns.assign(Bytes=column_bytes(columns))
+    widths = {pf_key: dict(zip(group['Column_Name'], group['Bytes']))
+              for pf_key, group in columns.groupby(['App_ID', 'File_Name'], sort=False)}
+    keys = [tuple(k.strip() for k in fields.split(',') if k.strip()) for fields in schema['Key_Fields'].fillna('')]
+    sizes = schema.assign(PF=schema['File_Name']).set_index(['App_ID', 'PF'])[['Record_Count', 'Record_Length']]
+    sizes = sizes[~is_lf]
+    paths = pd.DataFrame({
+        'App_ID': schema['App_ID'],
+        'PF': pf,
+        'File_Name': schema['File_Name'],
+        'Record_Format': schema['Record_Format'].fillna(''),
+        'File_Type': schema['File_Type'],
+        'Keys': [_direction(k) for k in keys],
+        'Unique': schema['Constraints'].fillna('').str.contains(r'\bPK\(|\bUNIQUE\b', regex=True),
+        'Select_Omit': view_sql.str.extract(r'(?is)\bWHERE\s+(.*)$')[0].fillna(''),
+        'Index_Candidate': ~view_sql.str.contains(r'(?i)\bJOIN\b|\bGROUP\s+BY\b', regex=True),
+        'Key_Bytes': [_key_bytes(k, widths.get((app, name), {})) for k, app, name in zip(keys, schema['App_ID'], pf)],
+    })
+    paths = paths.join(sizes, on=['App_ID', 'PF'])
+    return paths.dropna(subset=['PF'])[PATH_COLUMNS].reset_index(drop=True)
+
+
+def catalog_access_paths(catalog):
+    """
+    Keyed access paths of the normalized DDS catalog (dds_catalog.load_catalog): one per PF and
+    per LF record format, with key directions, UNIQUE and select/omit as compiled. PATH_COLUMNS.
+    """
+    files, formats, fields, keys, lf_pf = (catalog[table] for table in
+                                           ('files', 'formats', 'fields', 'keys', 'lf_pf'))
+    by_format = ['App_ID', 'File_Name', 'Record_Format']
+    keys = keys.sort_values([*by_format, 'Key_Ordinal'])
+    keys = keys.assign(Key=keys['Field_Name'] + np.where(keys['Descending'], ' DESC', ''),
+                       Bytes=keys[['App_ID', 'File_Name', 'Field_Name']].merge(
+                           fields.drop_duplicates(['App_ID', 'File_Name', 'Field_Name']), how='left',
+                           on=['App_ID', 'File_Name', 'Field_Name'])['Byte_Length'].fillna(0).to_numpy(dtype=int))
+    key_lists = {fmt: (list(group['Key']), int(group['Bytes'].sum()))
+                 for fmt, group in keys.groupby(by_format, sort=False)}
+
+    based_on = lf_pf.sort_values([*by_format, 'Join_Order']).groupby(by_format, sort=False).agg(
+        PF=('Based_On', 'first'), Based_On_Count=('Based_On', 'size'), Select_Omit=('Select_Omit', 'first'))
+    paths = formats[by_format].merge(files[['App_ID', 'File_Name', 'File_Type', 'Unique_Keys']], on=['App_ID', 'File_Name'])
+    paths = paths.merge(based_on.reset_index(), how='left', on=by_format)
+    is_pf = paths['File_Type'] == 'PF'
+    paths['PF'] = paths['PF'].where(~is_pf, paths['File_Name'])
+    paths['Select_Omit'] = paths['Select_Omit'].fillna('')
+    paths['Index_Candidate'] = paths['Based_On_Count'].fillna(1).to_numpy() <= 1
+    entries = [key_lists.get(fmt, ([], 0)) for fmt in zip(*(paths[c] for c in by_format))]
+    paths['Keys'] = [_direction(k) for k, _ in entries]
+    paths['Key_Bytes'] = [b for _, b in entries]
+    paths['Unique'] = paths['Unique_Keys'].astype(bool)
+
+    pf_sizes = (files.loc[files['File_Type'] == 'PF', ['App_ID', 'File_Name', 'Record_Count']]
+                .merge(formats.drop_duplicates(['App_ID', 'File_Name'])[['App_ID', 'File_Name', 'Record_Length']])
+                .rename(columns={'File_Name': 'PF'}))
+    paths = paths.merge(pf_sizes, how='left', on=['App_ID', 'PF'])
+    paths['Record_Count'] = paths['Record_Count'].fillna(0).astype(int)
+    return paths.dropna(subset=['PF'])[PATH_COLUMNS].reset_index(drop=True)
+
+
+def _labels(paths):
+    """File_Name, with the record format for multi-format LFs ('ORDLF(ORDHDRR)')"""
+    multi = paths.duplicated(['App_ID', 'File_Name'], keep=False).to_numpy()
+    return paths['File_Name'] + np.where(multi, '(' + paths['Record_Format'] + ')', '')
+
+
+def analyze(paths):
+    """
+    Classify every access path: Action (Keep / Drop / View), Reason (Primary key, Unique, Leaf,
+    Select/omit, Duplicate, Prefix, No keys, Join/aggregate) and Served_By (the kept path whose
+    index serves it). A select/omit index only holds the records it selects: it serves paths with
+    the same Select_Omit, never a full-table path - a path nothing kept can serve is kept (Select/omit)
+    """
+    paths = paths.reset_index(drop=True)
+    action = np.full(len(paths), 'View', dtype=object)
+    reason = np.where(paths['Index_Candidate'], 'No keys', 'Join/aggregate').astype(object)
+    served_by = np.full(len(paths), '', dtype=object)
+    is_pf = (paths['File_Type'] == 'PF').tolist()
+    unique = paths['Unique'].astype(bool).tolist()
+    label = _labels(paths).tolist()
+    where = paths['Select_Omit'].tolist()
+    # keeper of a trie node: UNIQUE first, then the PF's own key, then no select/omit, then by name
+    rank = list(zip([not u for u in unique], [not p for p in is_pf], [w != '' for w in where], label))
+
+    # one trie per PF; node = [children {token: node}, rows of the paths ending here]
+    roots = {}
+    indexed = (paths['Index_Candidate'] & (paths['Keys'].str.len() > 0)).to_numpy()
+    for i, app, pf, keys in zip(np.flatnonzero(indexed), paths['App_ID'][indexed].tolist(),
+                                paths['PF'][indexed].tolist(), paths['Keys'][indexed].tolist()):
+        node = roots.setdefault((app, pf), [{}, []])
+        for token in keys:
+            node = node[0].setdefault(token, [{}, []])
+        node[1].append(i)
+
+    def visit(node):
+        """Classify the paths in node's subtree; returns {Select_Omit: label of a kept path below it}"""
+        below = {}
+        for child in node[0].values():
+            for select_omit, name in visit(child).items():
+                below.setdefault(select_omit, name)
+        if not node[1]:
+            return below
+        rows = sorted(node[1], key=rank.__getitem__)
+        kept = []  # kept paths on this node, in rank order
+        for i in rows:
+            if i == rows[0] and (unique[i] or not below):
+                action[i] = 'Keep'
+                reason[i] = ('Primary key' if is_pf[i] and unique[i] else 'Unique' if unique[i]
+                             else 'Leaf')
+            else:  # a kept index serves it if it has no select/omit or exactly the same one
+                server = next((label[k] for k in kept if where[k] in ('', where[i])), None)
+                if server is None:
+                    server = below.get(where[i], below.get('')) if below else None
+                if server is None:
+                    action[i], reason[i] = 'Keep', 'Select/omit'
+                else:
+                    action[i], reason[i], served_by[i] = 'Drop', 'Prefix' if below else 'Duplicate', server
+            if action[i] == 'Keep':
+                kept.append(i)
+        for i in kept:
+            below.setdefault(where[i], label[i])
+        return below
+
+    for root in roots.values():
+        visit(root)
+    return paths.assign(Action=action, Reason=reason, Served_By=served_by)
+
+
+def index_plan(analyzed, lf_counts=None):
+    """
+    Per PF: Access_Paths (keyed index candidates), Indexes_Kept / Indexes_Dropped, Kept (labels),
+    Write_Amplification before (every keyed path an index) and after (kept only), Savings_Pct,
+    Index_GB before / after. lf_counts: optional {(App_ID, PF): declared LF count} (LF_Count)
+
+    A select/omit path only indexes the records it selects, a share the catalog does not
+    give: sparse paths stay out of the write amplification and Index_GB figures, their
+    dropped entries are Sparse_GB_Dropped_Max (upper bound: as if they indexed every record)
+    """
+    view = analyzed['Action'] == 'View'
+    kept = analyzed['Action'] == 'Keep'
+    sparse = analyzed['Select_Omit'] != ''
+    entry = (analyzed['Key_Bytes'] + INDEX_ENTRY_OVERHEAD).where(~view, 0)
+    label = _labels(analyzed)
+    frame = analyzed[['App_ID', 'PF', 'Record_Count', 'Record_Length']].assign(
+        Paths=(~view).astype(int), Kept_Paths=kept.astype(int), Views=view.astype(int),
+        Sparse_Paths=(~view & sparse).astype(int), Entry_Bytes=entry.where(~sparse, 0),
+        Kept_Bytes=entry.where(kept & ~sparse, 0), Sparse_Dropped_Bytes=entry.where(~kept & sparse, 0))
+    plan = frame.groupby(['App_ID', 'PF'], sort=False).agg(
+        Record_Count=('Record_Count', 'max'), Record_Length=('Record_Length', 'max'),
+        Access_Paths=('Paths', 'sum'), Indexes_Kept=('Kept_Paths', 'sum'), Views=('Views', 'sum'),
+        Sparse_Paths=('Sparse_Paths', 'sum'), Entry_Bytes=('Entry_Bytes', 'sum'), Kept_Bytes=('Kept_Bytes', 'sum'),
+        Sparse_Dropped_Bytes=('Sparse_Dropped_Bytes', 'sum')).reset_index()
+    kept_labels = {}
+    for app, pf, name in zip(frame['App_ID'][kept].tolist(), frame['PF'][kept].tolist(), label[kept].tolist()):
+        kept_labels.setdefault((app, pf), []).append(name)
+    keys = list(zip(plan['App_ID'].tolist(), plan['PF'].tolist()))
+    plan['Kept'] = [', '.join(kept_labels.get(key, [])) for key in keys]
+    plan['Indexes_Dropped'] = plan['Access_Paths'] - plan['Indexes_Kept']
+    if lf_counts is not None:
+        plan['LF_Count'] = [int(lf_counts.get(key, 0)) for key in keys]
+
+    record_length = plan['Record_Length'].astype(float).where(plan['Record_Length'] > 0)
+    plan['Write_Amplification_Before'] = (record_length + plan['Entry_Bytes']) / record_length
+    plan['Write_Amplification_After'] = (record_length + plan['Kept_Bytes']) / record_length
+    plan['Savings_Pct'] = (1 - plan['Write_Amplification_After'] / plan['Write_Amplification_Before']) * 100
+    rows = plan['Record_Count'].astype(float)
+    plan['Index_GB_Before'] = rows * plan['Entry_Bytes'] / 1024 ** 3
+    plan['Index_GB_After'] = rows * plan['Kept_Bytes'] / 1024 ** 3
+    plan['Sparse_GB_Dropped_Max'] = rows * plan['Sparse_Dropped_Bytes'] / 1024 ** 3
+    return plan.drop(columns=['Entry_Bytes', 'Kept_Bytes', 'Sparse_Dropped_Bytes'])
+
+
+def synthetic_paths(lfs, seed=0):
+    """Benchmark paths: lfs LFs over lfs / BENCHMARK_LF_PF_RATIO PFs, keys drawn from 8 fields per PF"""
+    rng = np.random.default_rng(seed)
+    pfs = max(1, lfs // BENCHMARK_LF_PF_RATIO)
+    pf_of = np.concatenate([np.arange(pfs), rng.integers(0, pfs, lfs)])
+    lengths = np.concatenate([rng.integers(1, 3, pfs), rng.integers(1, 5, lfs)])
+    fields = [tuple(f"F{k}" for k in rng.permutation(8)[:n]) for n in lengths]
+    fields = [keys if i < pfs else fields[pf_of[i]][:1] + keys[1:] if rng.random() < 0.5 else keys
+              for i, keys in enumerate(fields)]
+    is_pf = np.arange(pfs + lfs) < pfs
+    return pd.DataFrame({
+        'App_ID': 'APP000',
+        'PF': [f"PF{p:05d}" for p in pf_of],
+        'File_Name': [f"PF{i:05d}" if pf else f"LF{i:05d}" for i, pf in enumerate(is_pf)],
+        'Record_Format': 'R',
+        'File_Type': np.where(is_pf, 'PF', 'LF'),
+        'Keys': fields,
+        'Unique': is_pf | (rng.random(pfs + lfs) < 0.05),
+        'Select_Omit': np.where(~is_pf & (rng.random(pfs + lfs) < 0.3), "F0 = 'A'", ''),
+        'Index_Candidate': is_pf | (rng.random(pfs + lfs) < 0.95),
+        'Key_Bytes': lengths * 8,
+        'Record_Count': 1_000_000,
+        'Record_Length': 256,
+    })[PATH_COLUMNS]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from dds_catalog import SCHEMA_CATALOG, load_catalog
+
+    parser = argparse.ArgumentParser(description='Find redundant logical file access paths (Task 1.1)')
+    parser.add_argument('--catalog', default=SCHEMA_CATALOG, help='normalized DDS catalog (python dds_catalog.py)')
+    parser.add_argument('--lfs', type=int, default=0, help='benchmark: N synthetic LFs instead of the catalog')
+    args = parser.parse_args()
+
+    if args.lfs:
+        paths = synthetic_paths(args.lfs)
+    else:
+        catalog = load_catalog(args.catalog)
+        if catalog is None:
+            parser.error(f"No catalog in {args.catalog} - run python dds_catalog.py")
+        paths = catalog_access_paths(catalog)
+    started = time.perf_counter()
+    plan = index_plan(analyze(paths))
+    seconds = time.perf_counter() - started
+    print(f"[Access Paths]: {plan['Access_Paths'].sum():,} keyed over {len(plan):,} PFs in {seconds:.2f}s "
+          f"({len(paths) / seconds:,.0f} paths/s)")
+    print(f"[Indexes]: {plan['Indexes_Kept'].sum():,} kept, {plan['Indexes_Dropped'].sum():,} dropped; "
+          f"write amplification {plan['Write_Amplification_Before'].mean():.2f}x → "
+          f"{plan['Write_Amplification_After'].mean():.2f}x (mean per PF, {plan['Sparse_Paths'].sum():,} select/omit "
+          f"paths not counted)")
@@ -0,0 +1,401 @@
+# scripts/pipeline.py
+import ast
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+
+from call_graph import CALL_GRAPH
+from dds_catalog import SCHEMA_CATALOG
+from inventory_snapshot import refresh as refresh_snapshot
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# Pipeline runner for the assessment scripts
+# Each script is a stage with declared inputs (source files, upstream artifacts) and typed
+# outputs (DataFrames it leaves in its namespace). Outputs are persisted as Parquet keyed by
+# a hash of everything the stage reads: script + local helper modules + input file contents
+# + upstream stage keys (Merkle chain, so keys are known before anything runs). A stage whose
+# key already has artifacts on disk is skipped; independent stages run in parallel processes.
+#
+# Run: python pipeline.py [STAGE ...] [--force] [--workers N] [--show]
+#      (named stages plus everything upstream of them; default: all)
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ARTIFACT_STORE = os.environ.get('MIGRATION_ARTIFACT_STORE', '/tmp/migration_artifacts')
+
+UPLOADS = '/mnt/user-data/uploads'
+INVENTORY = f'{UPLOADS}/AS400_Inventory_Detailed.csv'
+CHANGE_WINDOWS = f'{UPLOADS}/AS400_Change_Window_Calendar.csv'
+DISK_HISTORY = f'{UPLOADS}/disk_usage_history/*.csv'  # optional; a glob matches zero or more files
+SOURCE_MEMBERS = f'{UPLOADS}/source/*/*/*'  # optional; <App_ID>/<SRCPF>/<MEMBER>.<SRCTYPE>
+CALL_GRAPH_EDGES = f'{CALL_GRAPH}/*.parquet'  # optional; written by python call_graph.py
+SCHEMA_TABLES = f'{SCHEMA_CATALOG}/*.parquet'  # optional; written by python dds_catalog.py
+EXTRACTS = f'{UPLOADS}/extracts/*/*'  # optional; <App_ID>/<file>, scanned for PAN / PII
+SPOOL_FILES = f'{UPLOADS}/spool/*/*'  # optional; <App_ID>/<file>, scanned for PAN / PII
+SPOOL_MANAGEMENT = f'{UPLOADS}/spool_file_management.csv'
+JOB_SCHEDULE = f'{UPLOADS}/job_schedule/*.csv'  # optional; App_ID, Start_Time, Duration_Hours per nightly batch
+
+# Output column types (checked when a stage finishes and when a consumer loads the artifact)
+DTYPE_CHECKS = {
+    'str': lambda s: pd.api.types.is_string_dtype(s),
+    'int': lambda s: pd.api.types.is_integer_dtype(s),
+    'float': lambda s: pd.api.types.is_float_dtype(s),
+    'datetime': lambda s: pd.api.types.is_datetime64_any_dtype(s),
+    'category': lambda s: isinstance(s.dtype, pd.CategoricalDtype),
+}
+
+
+@dataclass(frozen=True)
+class Artifact:
+    """DataFrame a stage publishes: script variable → Parquet table with typed columns"""
+    name: str
+    variable: str
+    columns: dict
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    script: str
+    files: list = field(default_factory=list)    # source files read directly
+    inputs: list = field(default_factory=list)   # upstream artifact names
+    outputs: list = field(default_factory=list)  # Artifact, ...
+
+
+STAGES = {stage.name: stage for stage in [
+    Stage('0.1', '0.1_portfolio_analysis.py', files=[INVENTORY], outputs=[
+        Artifact('portfolio_scores', 'output', {
+            'App_ID': 'str', 'App_Name': 'str', 'Technical_Debt_Index': 'float',
+            'Business_Criticality_Score': 'int', 'Migration_Strategy': 'category'}),
+    ]),
+    Stage('0.2', '0.2_dependency_analysis.py', files=[INVENTORY, CALL_GRAPH_EDGES], outputs=[
+        Artifact('blast_radius', 'blocked', {'App_ID': 'str', 'Apps_Blocked': 'int'}),
+    ]),
+    Stage('0.3', '0.3_data_growth_analysis.py', files=[INVENTORY, DISK_HISTORY], inputs=['spool_projection'], outputs=[
+        Artifact('growth_projection', 'df', {
+            'App_ID': 'str', 'Annual_Growth_Rate': 'float', 'Projected_Data_GB_24mo': 'float',
+            'Data_Temperature': 'str', 'GCS_Storage_Class': 'str'}),
+    ]),
+    Stage('0.4', '0.4_code_complexity.py', files=[INVENTORY, SOURCE_MEMBERS], outputs=[
+        Artifact('code_complexity', 'df', {
+            'App_ID': 'str', 'Cyclomatic_Complexity': 'int', 'Halstead_Volume': 'float',
+            'Maintainability_Index': 'float', 'Complexity_Risk': 'str'}),
+    ]),
+    Stage('0.5', '0.5_security_audit.py', files=[INVENTORY, EXTRACTS, SPOOL_FILES], inputs=['schema_catalog'], outputs=[
+        Artifact('data_classification', 'df', {
+            'App_ID': 'str', 'Compliance_Frameworks': 'str', 'Data_Classification': 'str',
+            'Encryption_Requirement': 'str', 'GCP_Security_Controls': 'str'}),
+    ]),
+    Stage('0.6', '0.6_bandwidth_analysis.py', files=[INVENTORY, CHANGE_WINDOWS, JOB_SCHEDULE],
+          inputs=['integration_catalog', 'growth_projection', 'schema_catalog', 'spool_projection'], outputs=[
+        Artifact('bandwidth', 'df', {'App_ID': 'str', 'Bandwidth_Required_Mbps': 'float'}),
+    ]),
+    Stage('0.7', '0.7_spool_analysis.py', files=[INVENTORY, SPOOL_MANAGEMENT], outputs=[
+        Artifact('spool_projection', 'df', {
+            'App_ID': 'str', 'Retention_Days': 'int', 'Storage_Class': 'str', 'Data_Temperature': 'str',
+            'Daily_GB': 'float', 'Retained_GB': 'float', 'Retained_GB_24mo': 'float', 'Ingest_MBps_24mo': 'float'}),
+    ]),
+    Stage('1.1', '1.1_schema_extraction.py', files=[INVENTORY, SCHEMA_TABLES], outputs=[
+        Artifact('schema_catalog', 'df_schema', {
+            'App_ID': 'str', 'File_Name': 'str', 'File_Type': 'str', 'Record_Format': 'str',
+            'Record_Length': 'int', 'Key_Fields': 'str', 'Record_Count': 'int', 'Columns': 'str',
+            'Constraints': 'str', 'LF_Count': 'int', 'Index_Strategy': 'str', 'Size_GB': 'float'}),
+    ]),
+    Stage('1.2', '1.2_data_quality_profiling.py', files=[EXTRACTS], inputs=['schema_catalog'], outputs=[
+        Artifact('dq_scores', 'df_scores', {'App_ID': 'str', 'DQ_Score': 'float'}),
+    ]),
+    # 1.4 is an Apache Beam job definition (runs on Dataflow), not an assessment stage
+    Stage('1.5', '1.5_retention_policy.py'),
+    Stage('2.1', '2.1_integration_catalog.py', outputs=[
+        Artifact('integration_catalog', 'df_integrations', {
+            'App_ID': 'str', 'Integration_Name': 'str', 'Integration_Type': 'str', 'Protocol': 'str',
+            'Direction': 'str', 'Frequency': 'str', 'Avg_Payload_KB': 'float',
+            'Monthly_Volume_Calls': 'int', 'Cutover_Risk': 'str'}),
+    ]),
+    Stage('2.2', '2.2_api_extraction_analysis.py', outputs=[
+        Artifact('api_candidates', 'df_api_candidates', {
+            'App_ID': 'str', 'Program_Name': 'str', 'Language': 'str', 'SLOC': 'int',
+            'Complexity_Score': 'float', 'API_Viability': 'str', 'Proposed_API_Endpoint': 'str',
+            'Estimated_Effort_Days': 'int'}),
+    ]),
+    Stage('2.3', '2.3_dependency_matrix.py', files=[INVENTORY, CHANGE_WINDOWS, CALL_GRAPH_EDGES], outputs=[
+        Artifact('coupling_metrics', 'df_metrics', {
+            'App_ID': 'str', 'Inbound_Dependencies': 'int', 'Outbound_Dependencies': 'int',
+            'Total_Coupling': 'int'}),
+        Artifact('migration_schedule', 'plan', {
+            'Work_Item': 'str', 'Risk_Level': 'str', 'Cutover_Hours': 'float',
+            'Start': 'datetime', 'Finish': 'datetime', 'Windows': 'str'}),
+    ]),
+    Stage('3.1', '3.1_strategy_decision_framework.py', inputs=['portfolio_scores'], outputs=[
+        Artifact('strategy_decisions', 'df', {
+            'App_ID': 'str', 'App_Name': 'str', 'Technical_Debt_Index': 'float',
+            'Business_Value_Score': 'float', 'Technical_Feasibility_Score': 'float',
+            'Migration_Cost_Score': 'float', 'Risk_Score': 'float', 'Composite_Score': 'float',
+            'Strategy': 'str'}),
+    ]),
+]}
+
+PRODUCERS = {artifact.name: stage.name for stage in STAGES.values() for artifact in stage.outputs}
+
+# Set by the runner for the stage being executed: JSON {artifact name: Parquet path}
+INPUTS_ENV = 'MIGRATION_PIPELINE_INPUTS'
+_FILE_HASHES = {}
+
+
+def _sha256_file(path):
+    stat = os.stat(path)
+    memo_key = (path, stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _FILE_HASHES:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        _FILE_HASHES[memo_key] = digest.hexdigest()
+    return _FILE_HASHES[memo_key]
+
+
+def _expand(files):
+    """Declared files with glob patterns expanded (sorted, so the key is order-independent)"""
+    paths = []
+    for pattern in files:
+        paths += sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+    return paths
+
+
+def script_code(script):
+    """Executable part of a script (several end with a markdown 'Expected Output' section)"""
+    lines = []
+    with open(os.path.join(SCRIPTS_DIR, script)) as f:
+        for line in f:
+            if line.rstrip() == '```':
+                break
+            lines.append(line)
+    return ''.join(lines)
+
+
+def _local_modules(source, seen):
+    """Helper modules in SCRIPTS_DIR imported by source, transitively"""
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            path = os.path.join(SCRIPTS_DIR, name.split('.')[0] + '.py')
+            if path not in seen and os.path.exists(path):
+                seen.add(path)
+                with open(path) as f:
+                    _local_modules(f.read(), seen)
+    return seen
+
+
+def stage_keys(stages=STAGES):
+    """{stage: key} - sha256 over code, helper modules, input files, output contract, upstream keys"""
+    keys = {}
+
+    def key(name):
+        if name not in keys:
+            stage = stages[name]
+            code = script_code(stage.script)
+            digest = hashlib.sha256(code.encode())
+            for path in sorted(_local_modules(code, set())):
+                digest.update(_sha256_file(path).encode())
+            for path in _expand(stage.files):
+                digest.update(_sha256_file(path).encode())
+            digest.update(repr(stage.outputs).encode())
+            for artifact in stage.inputs:
+                digest.update(f"{artifact}={key(PRODUCERS[artifact])}".encode())
+            keys[name] = digest.hexdigest()[:16]
+        return keys[name]
+
+    for name in stages:
+        key(name)
+    return keys
+
+
+def artifact_path(store, artifact, key):
+    return os.path.join(store, f"{artifact}-{key}.parquet")
+
+
+def report_path(store, stage, key):
+    return os.path.join(store, f"{stage}-{key}.txt")
+
+
+def _check_columns(artifact, frame):
+    missing = [col for col in artifact.columns if col not in frame.columns]
+    if missing:
+        raise TypeError(f"Artifact '{artifact.name}' is missing columns {missing}")
+    wrong = [f"{col} ({frame[col].dtype}, expected {kind})"
+             for col, kind in artifact.columns.items() if not DTYPE_CHECKS[kind](frame[col])]
+    if wrong:
+        raise TypeError(f"Artifact '{artifact.name}' has mistyped columns: {', '.join(wrong)}")
+
+
+def _load_artifact(name, path):
+    stage = STAGES[PRODUCERS[name]]
+    artifact = next(a for a in stage.outputs if a.name == name)
+    frame = pd.read_parquet(path)
+    _check_columns(artifact, frame)
+    return frame
+
+
+def upstream(name):
+    """
+    Upstream artifact as a DataFrame. Under the runner this is the exact input the stage
+    was keyed on; run standalone, it is the artifact materialized for the current inputs
+    of the producing stage (LookupError if that stage has not been run since they changed).
+    """
+    inputs = json.loads(os.environ.get(INPUTS_ENV, '{}'))
+    if name in inputs:
+        return _load_artifact(name, inputs[name])
+    producer = PRODUCERS[name]
+    path = artifact_path(ARTIFACT_STORE, name, stage_keys()[producer])
+    if not os.path.exists(path):
+        raise LookupError(f"Artifact '{name}' is not materialized for the current inputs - "
+                          f"run: python pipeline.py {producer}")
+    return _load_artifact(name, path)
+
+
+def _write_atomic(path, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def run_stage(name, key, store, inputs):
+    """Worker: executes one stage script, validates and persists its outputs (report last)"""
+    stage = STAGES[name]
+    namespace = {'__name__': '__main__', '__file__': os.path.join(SCRIPTS_DIR, stage.script)}
+    report = io.StringIO()
+    start = time.perf_counter()
+    argv = sys.argv
+    sys.argv = [stage.script]
+    os.environ[INPUTS_ENV] = json.dumps(inputs)
+    try:
+        with contextlib.redirect_stdout(report):
+            exec(compile(script_code(stage.script), stage.script, 'exec'), namespace)
+    finally:
+        sys.argv = argv
+        del os.environ[INPUTS_ENV]
+    for artifact in stage.outputs:
+        value = namespace[artifact.variable]
+        if isinstance(value, pd.Series):
+            value = value.rename_axis(next(iter(artifact.columns))).reset_index()
+        frame = value[list(artifact.columns)].reset_index(drop=True)
+        _check_columns(artifact, frame)
+        _write_atomic(artifact_path(store, artifact.name, key), lambda tmp: frame.to_parquet(tmp, index=False))
+
+    def write_report(tmp):
+        with open(tmp, 'w') as f:
+            f.write(report.getvalue())
+
+    _write_atomic(report_path(store, name, key), write_report)
+    return time.perf_counter() - start
+
+
+def _is_materialized(stage, key, store):
+    paths = [report_path(store, stage.name, key)]
+    paths += [artifact_path(store, artifact.name, key) for artifact in stage.outputs]
+    return all(os.path.exists(path) for path in paths)
+
+
+def _with_upstream(names):
+    selected = set()
+    todo = list(names)
+    while todo:
+        name = todo.pop()
+        if name not in selected:
+            selected.add(name)
+            todo.extend(PRODUCERS[artifact] for artifact in STAGES[name].inputs)
+    return [name for name in STAGES if name in selected]  # declaration order
+
+
+def run_pipeline(names=None, store=ARTIFACT_STORE, force=False, workers=None):
+    """
+    Runs the selected stages (and their upstream) - returns one row per stage:
+    Stage, Status (cached / ran / failed / blocked), Seconds, Key.
+    A stage is submitted as soon as every stage producing its inputs has finished.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    os.makedirs(store, exist_ok=True)
+    order = _with_upstream(names or list(STAGES))
+    if any(INVENTORY in STAGES[name].files for name in order):
+        refresh_snapshot(INVENTORY)  # parse the CSV once here, not in each parallel stage
+    keys = stage_keys()
+    status, seconds = {}, {}
+    pending = {}
+    for name in order:
+        if not force and _is_materialized(STAGES[name], keys[name], store):
+            status[name] = 'cached'
+        else:
+            pending[name] = {PRODUCERS[artifact] for artifact in STAGES[name].inputs} & set(order)
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        running = {}
+        while pending or running:
+            for name in [n for n, deps in pending.items() if all(d in status for d in deps)]:
+                deps = pending.pop(name)
+                if any(status[d] in ('failed', 'blocked') for d in deps):
+                    status[name] = 'blocked'
+                    continue
+                inputs = {artifact: artifact_path(store, artifact, keys[PRODUCERS[artifact]])
+                          for artifact in STAGES[name].inputs}
+                running[pool.submit(run_stage, name, keys[name], store, inputs)] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    seconds[name] = future.result()
+                    status[name] = 'ran'
+                except Exception:
+                    status[name] = 'failed'
+                    print(f"[FAILED] Stage {name} ({STAGES[name].script}):\n{traceback.format_exc()}", file=sys.stderr)
+
+    return [
+        {'Stage': name, 'Status': status[name], 'Seconds': round(seconds.get(name, 0.0), 2), 'Key': keys[name]}
+        for name in order
+    ]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run the assessment scripts as a cached stage DAG')
+    parser.add_argument('stages', nargs='*', help=f"stages to run (default: all of {', '.join(STAGES)})")
+    parser.add_argument('--store', default=ARTIFACT_STORE, help='artifact directory')
+    parser.add_argument('--force', action='store_true', help='rerun stages even if cached')
+    parser.add_argument('--workers', type=int, default=None, help='parallel processes (default: CPU count)')
+    parser.add_argument('--show', action='store_true', help='print each stage report')
+    args = parser.parse_args()
+    unknown = sorted(set(args.stages) - set(STAGES))
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    results = run_pipeline(args.stages, store=args.store, force=args.force, workers=args.workers)
+
+    if args.show:
+        for row in results:
+            path = report_path(args.store, row['Stage'], row['Key'])
+            if os.path.exists(path):
+                print(f"\n===== {row['Stage']} {STAGES[row['Stage']].script} =====")
+                with open(path) as f:
+                    print(f.read(), end='')
+
+    print("\n[PIPELINE RUN]")
+    print(pd.DataFrame(results).to_markdown(index=False, disable_numparse=True))
+    print(f"[Wall Clock]: {time.perf_counter() - start:.1f}s  [Artifacts]: {args.store}")
+    sys.exit(1 if any(row['Status'] in ('failed', 'blocked') for row in results) else 0)
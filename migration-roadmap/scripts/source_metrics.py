@@ -0,0 +1,509 @@
+# scripts/source_metrics.py
+import hashlib
+import heapq
+import math
+import os
+import re
+import time
+from collections import Counter
+
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# Source metrics engine for Task 0.4 (replaces the SLOC-based complexity proxies)
+# Members are exported from the source physical files (QRPGLESRC, QCBLLESRC, QCLSRC, ...) with
+# CPYTOSTMF into SOURCE_ROOT/<App_ID>/<SRCPF>/<MEMBER>.<SRCTYPE>, keeping the column layout.
+# One pass per member: each line is split by its dialect's column rules (fixed-form specs,
+# COBOL indicator area, CL comments/continuations) and tokenized; decision points and the
+# Halstead operator/operand counts come from the member's token counts at the end.
+#
+#   Cyclomatic_Complexity = decision points + 1
+#     RPG: IF/ELSEIF/WHEN/DOW/DOU/FOR, IFxx/DOWxx/DOUxx/WHxx/CASxx/CABxx, AND/OR (ANDxx/ORxx),
+#          ON-ERROR, conditioning indicators on C-specs
+#     COBOL: IF, WHEN (not WHEN OTHER), UNTIL, AND/OR, AT END, INVALID KEY, SIZE ERROR, EXCEPTION, OVERFLOW
+#            (not inside EXEC SQL ... END-EXEC)
+#     CL: IF, WHEN, DOWHILE/DOUNTIL/DOFOR, MONMSG, *AND/*OR (& and |)
+#   Halstead_Volume = (N1 + N2) × log2(n1 + n2)   (operators: opcodes, verbs, keywords, BIFs, symbols;
+#                                                  operands: names, literals, indicators, special values)
+#   Maintainability_Index = max(0, 171 - 5.2 ln(HV) - 0.23 CC - 16.2 ln(SLOC))   per member
+
+SOURCE_ROOT = '/mnt/user-data/uploads/source'
+
+# Source member type → Source_Language (inventory codes); other types (DSPF, PF, LF, ...) skipped
+SOURCE_TYPES = {
+    'RPGLE': 'RPG_IV', 'SQLRPGLE': 'RPG_IV', 'RPGLEINC': 'RPG_IV',
+    'RPG': 'RPG_III', 'SQLRPG': 'RPG_III', 'RPG38': 'RPG_III', 'RPT': 'RPG_III',
+    'CBLLE': 'COBOL_400', 'SQLCBLLE': 'COBOL_400', 'CBL': 'COBOL_400', 'SQLCBL': 'COBOL_400',
+    'CLLE': 'CL', 'CLP': 'CL', 'CL': 'CL',
+}
+
+ENCODING = 'utf-8'  # CPYTOSTMF STMFCCSID(1208)
+
+# Member metrics cache (see MetricsCache): bump METRICS_VERSION whenever tokenizer or
+# counting rules change, so cached metrics from the old rules are not reused
+METRICS_CACHE = os.environ.get('SOURCE_METRICS_CACHE', '/tmp/source_metrics_cache.parquet')
+METRICS_VERSION = 3
+SHARDS_PER_WORKER = 4  # several shards per process: a slow shard does not hold up the pool
+
+METRIC_TYPES = {
+    'SLOC': 'int64', 'Comment_Lines': 'int64', 'Decisions': 'int64', 'Cyclomatic_Complexity': 'int64',
+    'Distinct_Operators': 'int64', 'Distinct_Operands': 'int64', 'Total_Operators': 'int64',
+    'Total_Operands': 'int64', 'Halstead_Volume': 'float64', 'Maintainability_Index': 'float64',
+}
+CACHED_TYPES = {**METRIC_TYPES, 'Lines': 'int64', 'Bytes': 'int64', 'Scan_Seconds': 'float64'}
+CACHED_COLUMNS = list(CACHED_TYPES)
+
+# --- RPG (RPG IV fixed/free-form, RPG III) ---------------------------------------------------
+
+_COMPARISONS = ('EQ', 'NE', 'GT', 'LT', 'GE', 'LE')
+RPG_DECISIONS = (
+    {'IF', 'ELSEIF', 'WHEN', 'WHEN-IN', 'WHEN-IS', 'DOW', 'DOU', 'FOR', 'FOR-EACH', 'AND', 'OR', 'ON-ERROR'}
+    | {f"{op}{cmp}" for op in ('IF', 'DOW', 'DOU', 'WH', 'CAS', 'CAB', 'AND', 'OR') for cmp in _COMPARISONS}
+)
+RPG_OPERATORS = RPG_DECISIONS | {
+    'ACQ', 'ADD', 'ADDDUR', 'ALLOC', 'BEGSR', 'BITOFF', 'BITON', 'CALL', 'CALLB', 'CALLP', 'CAT', 'CHAIN',
+    'CHECK', 'CHECKR', 'CLEAR', 'CLOSE', 'COMMIT', 'COMP', 'DATA-GEN', 'DATA-INTO', 'DEALLOC', 'DEBUG',
+    'DEFINE', 'DELETE', 'DIV', 'DO', 'DSPLY', 'DUMP', 'ELSE', 'END', 'ENDCS', 'ENDDO', 'ENDFOR', 'ENDIF',
+    'ENDMON', 'ENDSL', 'ENDSR', 'EVAL', 'EVALR', 'EVAL-CORR', 'EXCEPT', 'EXFMT', 'EXSR', 'EXTRCT', 'FEOD',
+    'FORCE', 'FREE', 'GOTO', 'IN', 'ITER', 'KFLD', 'KLIST', 'LEAVE', 'LEAVESR', 'LOKUP', 'LOOKUP',
+    'MONITOR', 'MOVE', 'MOVEA', 'MOVEL', 'MULT', 'MVR', 'NEXT', 'NOT', 'OCCUR', 'ON-EXIT', 'OPEN', 'OTHER',
+    'OUT', 'PARM', 'PLIST', 'POST', 'READ', 'READC', 'READE', 'READP', 'READPE', 'REALLOC', 'REL', 'RESET',
+    'RETRN', 'RETURN', 'ROLBK', 'SCAN', 'SELEC', 'SELECT', 'SETGT', 'SETLL', 'SETOF', 'SETOFF', 'SETON',
+    'SHTDN', 'SORTA', 'SQRT', 'SUB', 'SUBDUR', 'SUBST', 'TAG', 'TEST', 'TESTB', 'TESTN', 'TESTZ', 'TIME',
+    'UNLOCK', 'UPDAT', 'UPDATE', 'WRITE', 'XFOOT', 'XLATE', 'Z-ADD', 'Z-SUB',
+    'DCL-S', 'DCL-C', 'DCL-DS', 'DCL-PR', 'DCL-PI', 'DCL-PROC', 'DCL-F', 'DCL-SUBF', 'DCL-PARM', 'DCL-ENUM',
+    'END-DS', 'END-PR', 'END-PI', 'END-PROC', 'END-ENUM', 'CTL-OPT', 'EXEC', 'SQL',
+}
+
+_RPG_TOKEN = re.compile(r"""
+    '(?:[^']|'')*'?                                            # literal (may continue on next line)
+  | (?:DCL-(?:S|C|DS|PR|PI|PROC|F|SUBF|PARM|ENUM)|END-(?:DS|PR|PI|PROC|ENUM)|CTL-OPT
+     |ON-ERROR|ON-EXIT|EVAL-CORR|DATA-INTO|DATA-GEN|FOR-EACH|WHEN-IN|WHEN-IS)\b
+  | [%*]?[A-Z_#@$][A-Z0-9_#@$]*                                 # names, %BIFs, *special values
+  | [0-9]+(?:\.[0-9]*)?
+  | \*\*|<>|<=|>=|[-+*/]=|[-+*/=<>():;]
+""", re.X)
+
+# --- COBOL/400 --------------------------------------------------------------------------------
+
+COBOL_DECISIONS = {'IF', 'WHEN', 'UNTIL', 'AND', 'OR', 'INVALID', 'ERROR', 'EXCEPTION', 'OVERFLOW'}
+COBOL_OPERATORS = COBOL_DECISIONS | {
+    'ACCEPT', 'ADD', 'ALTER', 'CALL', 'CANCEL', 'CLOSE', 'COMPUTE', 'CONTINUE', 'DELETE', 'DISPLAY', 'DIVIDE',
+    'ELSE', 'EVALUATE', 'EXIT', 'GO', 'GOBACK', 'INITIALIZE', 'INSPECT', 'MERGE', 'MOVE', 'MULTIPLY', 'OPEN',
+    'PERFORM', 'READ', 'RELEASE', 'RETURN', 'REWRITE', 'SEARCH', 'SET', 'SORT', 'START', 'STOP', 'STRING',
+    'SUBTRACT', 'UNSTRING', 'WRITE', 'EXEC', 'SQL', 'END-EXEC', 'COPY', 'REPLACING', 'END',
+    'TO', 'FROM', 'BY', 'INTO', 'GIVING', 'OTHER', 'THEN', 'NOT', 'VARYING', 'TIMES', 'THRU', 'THROUGH',
+    'USING', 'RETURNING', 'OF', 'IN', 'IS', 'ARE', 'EQUAL', 'GREATER', 'LESS', 'THAN', 'AT', 'KEY', 'SIZE',
+    'ON', 'ALSO', 'TALLYING', 'FOR', 'ALL', 'LEADING', 'CHARACTERS', 'BEFORE', 'AFTER', 'INITIAL',
+    'DELIMITED', 'POINTER', 'WITH', 'NO', 'ADVANCING', 'UPON', 'ROUNDED', 'CORRESPONDING', 'CORR',
+    'REFERENCE', 'CONTENT', 'VALUE', 'VALUES', 'LENGTH', 'ADDRESS', 'FUNCTION', 'RUN', 'TEST',
+    'IDENTIFICATION', 'ENVIRONMENT', 'DATA', 'PROCEDURE', 'DIVISION', 'SECTION', 'PROGRAM-ID',
+    'WORKING-STORAGE', 'LINKAGE', 'FILE', 'FILE-CONTROL', 'FD', 'SELECT', 'ASSIGN', 'ORGANIZATION',
+    'ACCESS', 'MODE', 'RECORD', 'PIC', 'PICTURE', 'OCCURS', 'REDEFINES', 'USAGE', 'COMP', 'COMP-3',
+    'COMP-4', 'PACKED-DECIMAL', 'BINARY', 'INDEXED', 'SEQUENTIAL', 'DYNAMIC', 'RANDOM', 'INPUT', 'OUTPUT',
+    'I-O', 'EXTEND', 'DEPENDING',
+}
+
+_COBOL_TOKEN = re.compile(r"""
+    '(?:[^']|'')*'? | "(?:[^"]|"")*"?
+  | [0-9]+\.[0-9]+
+  | [A-Z0-9]+(?:-+[A-Z0-9]+)*                                  # words (hyphens inside names)
+  | \*\*|>=|<=|[-+*/=<>():.]
+""", re.X)
+
+# --- CL ---------------------------------------------------------------------------------------
+
+CL_DECISIONS = {'IF', 'WHEN', 'DOWHILE', 'DOUNTIL', 'DOFOR', 'MONMSG', '*AND', '*OR', '&', '|'}
+CL_OPERATORS = CL_DECISIONS | {
+    '*NOT', '*EQ', '*NE', '*GT', '*LT', '*GE', '*LE', '*NG', '*NL', '*CAT', '*BCAT', '*TCAT', '*LIKE',
+}
+
+_CL_TOKEN = re.compile(r"""
+    '(?:[^']|'')*'?
+  | &[A-Z0-9_#@$]+                                             # variables
+  | [%*][A-Z0-9_#@$]+                                          # %BIFs, *special values/operators
+  | [A-Z_#@$][A-Z0-9_#@$.]*\(?                                 # commands, keywords (with '('), names
+  | [0-9]+(?:\.[0-9]+)?
+  | \|\||\|>|\|<|<=|>=|¬=|[-+*/|&<>=¬:()]
+""", re.X)
+
+
+def free_form_code(line):
+    """Code part of a free-form RPG line (drops // comments outside literals)"""
+    cut = line.find('//')
+    while cut >= 0 and line.count("'", 0, cut) % 2:
+        cut = line.find('//', cut + 2)
+    return line if cut < 0 else line[:cut]
+
+
+def _scan_rpg(lines, tokens, operators, declarations, rpg4):
+    """
+    RPG IV (fixed, /FREE, column-limited and **FREE) and RPG III → (sloc, comment, decisions).
+    H/F/D/P/I/O spec tokens go to declarations: Halstead counts them, decisions do not
+    (the IF in an F-spec is a file type). So does embedded SQL (C/EXEC SQL and C+ lines,
+    free-form EXEC SQL up to its ';'): a WHERE ... AND ... is not an RPG branch.
+    """
+    sloc = comment = decisions = 0
+    free = fully_free = sql = False
+    findall = _RPG_TOKEN.findall
+    for number, line in enumerate(lines):
+        line = line.rstrip('\r\n')
+        if number == 0 and rpg4 and line[:6].upper() == '**FREE':
+            fully_free = True
+            continue
+        if fully_free:
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped.startswith('//'):
+                comment += 1
+                continue
+            if stripped.startswith('/'):  # compiler directive
+                continue
+            code = free_form_code(line).upper()
+            words = findall(code)
+            if words:
+                sloc += 1
+                sql = sql or words[0] == 'EXEC'
+                (declarations if sql else tokens).extend(words)
+                sql = sql and not code.rstrip().endswith(';')
+            else:
+                comment += 1
+            continue
+
+        line = line[:80]  # columns 81-100: comment area
+        if not line.strip():
+            continue
+        if line.startswith('**'):  # compile-time data follows
+            break
+        spec, column7 = line[5:6].upper(), line[6:7]
+        if column7 == '*':
+            comment += 1
+            continue
+        if column7 == '/' and spec != 'C':
+            directive = line[7:].upper()
+            if directive.startswith('FREE'):
+                free = True
+            elif directive.startswith('END-FREE'):
+                free = False
+            continue
+        if free or (rpg4 and spec == ' ' and column7 == ' '):  # /FREE block or column-limited free-form
+            code = free_form_code(line[7:]).strip()
+            if code.startswith('//') or not code:
+                comment += bool(line[7:].strip())
+                continue
+            sloc += 1
+            words = findall(code.upper())
+            sql = sql or words[:1] == ['EXEC']
+            (declarations if sql else tokens).extend(words)
+            sql = sql and not code.rstrip().endswith(';')
+            continue
+
+        sloc += 1
+        if column7 in ('/', '+'):  # embedded SQL (C/EXEC SQL, C+ continuation)
+            declarations.extend(findall(line[6:].upper()))
+            continue
+        if spec != 'C':
+            declarations.extend(findall(line[6:].upper()))
+            continue
+        upper = line.upper()
+        if rpg4:
+            indicators = (upper[8:11],)
+            opcode, operands = upper[25:35], upper[11:25] + ' ' + upper[35:]
+        else:
+            indicators = (upper[8:11], upper[11:14], upper[14:17])
+            opcode, operands = upper[27:32], upper[17:27] + ' ' + upper[32:48] + ' ' + upper[53:59]
+        for indicator in indicators:
+            if indicator.strip():
+                decisions += 1
+                tokens.append(indicator.strip())
+        opcode = opcode.split('(')[0].strip()
+        if opcode:
+            tokens.append(opcode)
+            operators.add(opcode)
+        tokens.extend(findall(operands))
+    return sloc, comment, decisions
+
+
+def _scan_cobol(lines, tokens, declarations):
+    """
+    COBOL/400 fixed format: 1-6 sequence, 7 indicator, 8-72 code → (sloc, comment, decisions)
+    EXEC SQL ... END-EXEC goes to declarations (its AND / OR are not COBOL branches); AT END
+    is counted here, as END alone also closes END PROGRAM / END METHOD
+    """
+    sloc = comment = decisions = 0
+    sql, previous = False, ''
+    findall = _COBOL_TOKEN.findall
+    for line in lines:
+        indicator = line[6:7]
+        if indicator in ('*', '/'):
+            comment += 1
+            continue
+        words = findall(line[7:72].upper())
+        if words:
+            sloc += 1
+            for word in words:
+                sql = sql or word == 'EXEC'
+                (declarations if sql else tokens).append(word)
+                sql = sql and word != 'END-EXEC'
+                decisions += word == 'END' and previous == 'AT'
+                previous = word
+    return sloc, comment, decisions
+
+
+def _scan_cl(lines, tokens, operators):
+    """CL: free format, /* */ comments, + / - continuations → (sloc, comment, decisions)"""
+    sloc = comment = 0
+    in_comment = False
+    expect_command = True
+    findall = _CL_TOKEN.findall
+    for line in lines:
+        line = line.rstrip('\r\n')[:80]
+        code, rest, had_comment = [], line, in_comment
+        while rest:
+            if in_comment:
+                end = rest.find('*/')
+                if end < 0:
+                    break
+                rest, in_comment = rest[end + 2:], False
+            else:
+                start = rest.find('/*')
+                if start < 0:
+                    code.append(rest)
+                    break
+                code.append(rest[:start])
+                rest, in_comment, had_comment = rest[start + 2:], True, True
+        code = ' '.join(code).upper().strip()
+        if not code:
+            comment += had_comment
+            continue
+        sloc += 1
+        continued = code[-1] in '+-'
+        words = findall(code[:-1] if continued else code)
+        for position, word in enumerate(words):
+            keyword = word[-1] == '(' and len(word) > 1
+            if keyword:
+                word = word[:-1]
+            if expect_command and word[0].isalpha():
+                if position + 1 < len(words) and words[position + 1] == ':':  # label
+                    tokens.append(word)
+                    continue
+                operators.add(word)
+                expect_command = word == 'ELSE'  # ELSE CMD / ELSE DO: the next word is a command too
+            elif keyword:
+                operators.add(word)
+                expect_command = word in ('THEN', 'CMD', 'ELSE')  # THEN(CHGVAR ...)
+            tokens.append(word)
+            if keyword:
+                tokens.append('(')
+        if not continued:
+            expect_command = True
+    return sloc, comment, 0
+
+
+def member_metrics(lines, language):
+    """Metrics for one member's lines (any iterable of str) in the given Source_Language"""
+    tokens, operators, declarations = [], set(), []
+    if language in ('RPG_IV', 'RPG_III'):
+        sloc, comment, decisions = _scan_rpg(lines, tokens, operators, declarations, language == 'RPG_IV')
+        keywords, branch_words = RPG_OPERATORS, RPG_DECISIONS
+    elif language == 'COBOL_400':
+        sloc, comment, decisions = _scan_cobol(lines, tokens, declarations)
+        keywords, branch_words = COBOL_OPERATORS, COBOL_DECISIONS
+    elif language == 'CL':
+        sloc, comment, decisions = _scan_cl(lines, tokens, operators)
+        keywords, branch_words = CL_OPERATORS, CL_DECISIONS
+    else:
+        raise ValueError(f"Unsupported source language: {language}")
+
+    counts = Counter(tokens)
+    decisions += sum(counts[word] for word in branch_words if word in counts)
+    if language == 'COBOL_400':
+        decisions -= counts['OTHER']  # WHEN OTHER is the default branch
+    counts.update(declarations)
+
+    n1 = n2 = N1 = N2 = 0
+    for token, count in counts.items():
+        first = token[0]
+        operand = first.isalnum() or first in "'\"&#@$_" or (first == '*' and token[1:2].isalpha())
+        if token in operators or token in keywords or (first == '%' and len(token) > 1) or not operand:
+            n1 += 1
+            N1 += count
+        else:
+            n2 += 1
+            N2 += count
+
+    vocabulary, length = n1 + n2, N1 + N2
+    volume = length * math.log2(vocabulary) if vocabulary > 1 else 0.0
+    complexity = decisions + 1
+    mi = 171 - 5.2 * math.log(max(volume, 1)) - 0.23 * complexity - 16.2 * math.log(max(sloc, 1))
+    return {
+        'SLOC': sloc, 'Comment_Lines': comment, 'Decisions': decisions, 'Cyclomatic_Complexity': complexity,
+        'Distinct_Operators': n1, 'Distinct_Operands': n2, 'Total_Operators': N1, 'Total_Operands': N2,
+        'Halstead_Volume': volume, 'Maintainability_Index': max(0.0, round(mi, 1)),
+    }
+
+
+def scan_member(path, language=None):
+    """Metrics for one exported member; language from the member type extension by default"""
+    language = language or SOURCE_TYPES[os.path.splitext(path)[1][1:].upper()]
+    with open(path, encoding=ENCODING, errors='replace') as f:
+        return member_metrics(f, language)
+
+
+def source_members(root=SOURCE_ROOT, types=SOURCE_TYPES):
+    """(App_ID, Source_File, Member, Source_Type, path) for every member under root of one of types"""
+    members = []
+    for app in sorted(os.listdir(root)):
+        if not os.path.isdir(os.path.join(root, app)):  # README, export logs next to the app folders
+            continue
+        for source_file in sorted(os.listdir(os.path.join(root, app))):
+            directory = os.path.join(root, app, source_file)
+            if not os.path.isdir(directory):
+                continue
+            for name in sorted(os.listdir(directory)):
+                member, _, source_type = name.rpartition('.')
+                if source_type.upper() in types:
+                    members.append((app, source_file, member, source_type.upper(), os.path.join(directory, name)))
+    return members
+
+
+class MetricsCache:
+    """
+    Content-addressed member metrics cache for nightly rescans.
+
+    Stores Content_Hash → member metrics, line/byte counts and the last measured scan time.
+    The hash covers METRICS_VERSION, the language and the member bytes, so a member is
+    re-tokenized only when its source (or the engine) changes. Saved entries are bounded
+    to the members seen by the last scan.
+    """
+
+    def __init__(self, path=METRICS_CACHE):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = self._load()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            return pd.read_parquet(self.path).set_index('Content_Hash')
+        return pd.DataFrame(columns=CACHED_COLUMNS, index=pd.Index([], dtype='object', name='Content_Hash'))
+
+    def known(self):
+        return set(self._entries.index)
+
+    def lookup(self, hashes):
+        return self._entries.loc[hashes, CACHED_COLUMNS]
+
+    def update(self, members):
+        """Replaces the entries with this scan's members (first occurrence per hash)"""
+        self._entries = members.drop_duplicates('Content_Hash').set_index('Content_Hash')[CACHED_COLUMNS]
+
+    def save(self):
+        self._entries.reset_index().to_parquet(self.path, index=False)
+
+
+def _content_hash(data, language):
+    digest = hashlib.sha256(f"v{METRICS_VERSION}:{language}:".encode())
+    digest.update(data)
+    return digest.hexdigest()[:16]
+
+
+def _scan_shard(shard, known):
+    """Worker: [(position, path, language)] → [(position, hash, lines, bytes, metrics | None, seconds)]"""
+    results = []
+    for position, path, language in shard:
+        with open(path, 'rb') as f:
+            data = f.read()
+        key = _content_hash(data, language)
+        if key in known:
+            results.append((position, key, None, None, None, None))
+            continue
+        start = time.perf_counter()
+        metrics = member_metrics(data.decode(ENCODING, errors='replace').splitlines(), language)
+        results.append((position, key, data.count(b'\n'), len(data), metrics, time.perf_counter() - start))
+    return results
+
+
+def balanced_shards(tasks, sizes, count):
+    """Greedy size-balanced shards (largest member first onto the lightest shard)"""
+    shards = [[] for _ in range(count)]
+    loads = [(0, i) for i in range(count)]
+    for task in sorted(tasks, key=lambda task: -sizes[task[0]]):
+        load, i = heapq.heappop(loads)
+        shards[i].append(task)
+        heapq.heappush(loads, (load + sizes[task[0]], i))
+    return [shard for shard in shards if shard]
+
+
+def scan_sources(root=SOURCE_ROOT, cache=None, workers=None):
+    """
+    One row per member: App_ID, Source_File, Member, Source_Type, Language, Content_Hash,
+    member_metrics, Lines, Bytes, Scan_Seconds (tokenize time, last measured) and Cached.
+
+    Members are sharded by size across a process pool; each worker hashes its members and
+    tokenizes only those missing from cache (a MetricsCache). The cache is updated in memory,
+    call cache.save() to persist it.
+    """
+    members = source_members(root)
+    tasks = [(position, path, SOURCE_TYPES[source_type])
+             for position, (_, _, _, source_type, path) in enumerate(members)]
+    sizes = [os.path.getsize(path) for _, path, _ in tasks]
+    known = cache.known() if cache is not None else set()
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(tasks) < 2:
+        results = _scan_shard(tasks, known)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        shards = balanced_shards(tasks, sizes, workers * SHARDS_PER_WORKER)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = [row for shard in pool.map(_scan_shard, shards, [known] * len(shards)) for row in shard]
+    results.sort()
+
+    frame = pd.DataFrame(members, columns=['App_ID', 'Source_File', 'Member', 'Source_Type', '_path']).drop(columns='_path')
+    frame['Language'] = frame['Source_Type'].map(SOURCE_TYPES)
+    frame['Content_Hash'] = [key for _, key, *_ in results]
+    cached = [metrics is None for *_, metrics, _ in results]
+    fresh = pd.DataFrame(
+        [{**metrics, 'Lines': lines, 'Bytes': size, 'Scan_Seconds': seconds}
+         for _, _, lines, size, metrics, seconds in results if metrics is not None],
+        columns=CACHED_COLUMNS,
+    )
+    values = pd.DataFrame(index=frame.index, columns=CACHED_COLUMNS)
+    fresh_rows = [i for i, hit in enumerate(cached) if not hit]
+    if fresh_rows:
+        values.loc[fresh_rows] = fresh.to_numpy()
+    if len(fresh_rows) < len(frame):
+        hit_rows = [i for i, hit in enumerate(cached) if hit]
+        values.loc[hit_rows] = cache.lookup(frame['Content_Hash'].iloc[hit_rows]).to_numpy()
+    frame = frame.join(values.astype(CACHED_TYPES))
+    frame['Cached'] = cached
+    if cache is not None:
+        cache.hits, cache.misses = sum(cached), len(cached) - sum(cached)
+        cache.update(frame)
+    return frame
+
+
+def timing_profile(members, top=10):
+    """Slowest members by tokenize time, with throughput (pathological members stand out by Lines_per_Second)"""
+    profile = members.nlargest(top, 'Scan_Seconds')[
+        ['App_ID', 'Source_File', 'Member', 'Language', 'Lines', 'Bytes', 'Scan_Seconds', 'Cached']
+    ]
+    return profile.assign(Lines_per_Second=(profile['Lines'] / profile['Scan_Seconds'].clip(lower=1e-6)).round().astype('int64'))
+
+
+def app_metrics(members):
+    """
+    Per App_ID: Members, SLOC, Cyclomatic_Complexity and Halstead_Volume (sums over members),
+    Maintainability_Index (SLOC-weighted mean of member MIs - MI is a per-module measure).
+    """
+    weighted = members.assign(MI_x_SLOC=members['Maintainability_Index'] * members['SLOC'])
+    apps = weighted.groupby('App_ID').agg(
+        Members=('Member', 'count'), SLOC=('SLOC', 'sum'), Cyclomatic_Complexity=('Cyclomatic_Complexity', 'sum'),
+        Halstead_Volume=('Halstead_Volume', 'sum'), MI_x_SLOC=('MI_x_SLOC', 'sum'),
+    )
+    apps['Maintainability_Index'] = (apps.pop('MI_x_SLOC') / apps['SLOC'].clip(lower=1)).round(1)
+    return apps
@@ -0,0 +1,103 @@
+# scripts/spool_model.py
+import io
+import math
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Spool volume and archive throughput model for Task 0.7
+# Per app (spool_file_management.csv): daily spool V0 = Daily_Spool_Files × Avg_Size_MB,
+# compounding at Annual_Growth_Rate; every file is kept Retention_Days. The archive is taken
+# to be in steady state today (older spool grew at the same rate), so the volume retained on
+# day t is the ingest integrated over the retention window:
+#   retained(t) = V0 · (1+g)^(t/365) · 365 · (1 - (1+g)^(-R/365)) / ln(1+g)     (V0 · R if g = 0)
+# All apps × months are evaluated as one array expression.
+#
+# Storage class by retention (GCS minimum storage durations: Nearline 30, Coldline 90,
+# Archive 365 days), Data_Temperature as in Task 0.3 (STANDARD HOT, NEARLINE WARM, else COLD)
+
+SPOOL_MANAGEMENT = '/mnt/user-data/uploads/spool_file_management.csv'
+
+DAYS_PER_MONTH = 365 / 12
+MB_PER_GB = 1024
+
+# (retention below, storage class, data temperature)
+RETENTION_CLASSES = [
+    (30, 'STANDARD', 'HOT'),
+    (90, 'NEARLINE', 'WARM'),
+    (365, 'COLDLINE', 'COLD'),
+    (math.inf, 'ARCHIVE', 'COLD'),
+]
+
+
+def load_spool_management(path=SPOOL_MANAGEMENT):
+    """Reads the spool management export (table up to the trailing notes); Annual_Growth_Rate '5%' → 0.05"""
+    lines = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip() or line.startswith('```'):
+                break
+            lines.append(line)
+    spool = pd.read_csv(io.StringIO(''.join(lines)))
+    spool['Annual_Growth_Rate'] = spool['Annual_Growth_Rate'].astype(str).str.rstrip('%').astype(float) / 100
+    return spool
+
+
+def _growth(rate, days):
+    """(1 + rate)^(days / 365) for rate (apps) × days (horizon points)"""
+    return np.power(1 + rate[:, None], np.asarray(days, dtype=float)[None, :] / 365)
+
+
+def retention_window(rate, retention_days):
+    """Days of today's ingest held by a steady-state archive: ∫ (1+g)^(s/365) ds over the last R days"""
+    log_rate = np.log1p(rate)
+    safe = np.where(log_rate > 0, log_rate, 1.0)
+    window = 365 * -np.expm1(-log_rate * retention_days / 365) / safe
+    return np.where(log_rate > 0, window, retention_days)
+
+
+def spool_projection(spool, months=24):
+    """
+    (apps, monthly): apps = one row per app with Storage_Class, Data_Temperature, Daily_GB,
+    Retained_GB (today) and Daily_GB_<months>mo, Retained_GB_<months>mo, Ingest_MBps_<months>mo
+    (average archive write rate); monthly = Month, Storage_Class, Daily_Files, Daily_GB,
+    Retained_GB, Ingest_MBps for months 0..months
+    """
+    rate = spool['Annual_Growth_Rate'].to_numpy(dtype=float)
+    retention = spool['Retention_Days'].to_numpy(dtype=float)
+    files = spool['Daily_Spool_Files'].to_numpy(dtype=float)
+    daily_gb = files * spool['Avg_Size_MB'].to_numpy(dtype=float) / MB_PER_GB
+
+    horizon = np.arange(months + 1)
+    growth = _growth(rate, horizon * DAYS_PER_MONTH)                       # apps × months
+    ingest = daily_gb[:, None] * growth
+    retained = ingest * retention_window(rate, retention)[:, None]
+
+    bounds = [limit for limit, _, _ in RETENTION_CLASSES]
+    tier = np.searchsorted(bounds, retention, side='right')
+    apps = spool[['App_ID', 'Destination', 'Retention_Days', 'Annual_Growth_Rate']].copy()
+    apps['Storage_Class'] = [RETENTION_CLASSES[i][1] for i in tier]
+    apps['Data_Temperature'] = [RETENTION_CLASSES[i][2] for i in tier]
+    apps['Daily_GB'] = daily_gb
+    apps['Retained_GB'] = retained[:, 0]
+    apps[f'Daily_GB_{months}mo'] = ingest[:, -1]
+    apps[f'Retained_GB_{months}mo'] = retained[:, -1]
+    apps[f'Ingest_MBps_{months}mo'] = ingest[:, -1] * MB_PER_GB / 86400
+
+    classes = pd.Index([name for _, name, _ in RETENTION_CLASSES])
+    codes = classes.get_indexer(apps['Storage_Class'])
+    present = np.unique(codes)
+    totals = {}
+    for name, values in [('Daily_Files', files[:, None] * growth), ('Daily_GB', ingest), ('Retained_GB', retained)]:
+        summed = np.zeros((len(classes), len(horizon)))
+        np.add.at(summed, codes, values)
+        totals[name] = summed[present].ravel()
+    monthly = pd.DataFrame({
+        'Month': np.tile(horizon, len(present)),
+        'Storage_Class': np.repeat(classes[present], len(horizon)),
+        **totals,
+    })
+    monthly['Ingest_MBps'] = monthly['Daily_GB'] * MB_PER_GB / 86400
+    return apps, monthly
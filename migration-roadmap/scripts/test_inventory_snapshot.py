@@ -0,0 +1,28 @@
+# scripts/test_inventory_snapshot.py
+import pandas as pd
+
+from inventory_snapshot import load_inventory
+
+CSV = """App_ID,App_Name,SLOC,Dependencies,DB2_Objects,Job_Dependencies,Business_Owner
+WMS001,Warehouse,1200,"INV002, POS003",WHITEM|WHLOC,INV002>ALLOC025,Ops
+INV002,Inventory,800,,INVMAST,,NA
+POS003,Point of Sale,950,N/A,,POS003>EOD001,
+"""
+
+
+def test_nulls_match_read_csv(tmp_path):
+    csv = tmp_path / 'inventory.csv'
+    csv.write_text(CSV)
+    snapshot = load_inventory(csv_path=str(csv), snapshot_path=str(tmp_path / 'inventory.arrow'))
+    expected = pd.read_csv(csv)
+    assert list(snapshot.columns) == list(expected.columns)
+    assert snapshot.isna().equals(expected.isna())
+    assert snapshot.fillna('').astype(str).equals(expected.fillna('').astype(str))
+
+
+def test_empty_dependencies_are_null_lists(tmp_path):
+    csv = tmp_path / 'inventory.csv'
+    csv.write_text(CSV)
+    lists = load_inventory(['Dependencies_List'], str(csv), str(tmp_path / 'inventory.arrow'))['Dependencies_List']
+    assert list(lists[0]) == ['INV002', 'POS003']
+    assert lists[1] is None and lists[2] is None
@@ -0,0 +1,39 @@
+# scripts/test_lf_redundancy.py
+import pandas as pd
+
+from lf_redundancy import PATH_COLUMNS, analyze
+
+
+def _paths(*lfs):
+    """ORDHDR (PF keyed on ORDNO) plus (File_Name, Keys, Select_Omit) LFs over it"""
+    rows = [('ORDHDR', 'PF', ['ORDNO'], True, '')] + [(name, 'LF', keys, False, where) for name, keys, where in lfs]
+    return pd.DataFrame([{'App_ID': 'APP001', 'PF': 'ORDHDR', 'File_Name': name, 'Record_Format': 'R',
+                          'File_Type': kind, 'Keys': keys, 'Unique': unique, 'Select_Omit': where,
+                          'Index_Candidate': True, 'Key_Bytes': 8 * len(keys), 'Record_Count': 1000,
+                          'Record_Length': 100} for name, kind, keys, unique, where in rows])[PATH_COLUMNS]
+
+
+def _actions(analyzed):
+    return {row.File_Name: (row.Action, row.Reason, row.Served_By) for row in analyzed.itertuples()}
+
+
+def test_select_omit_index_does_not_serve_full_table_prefix():
+    actions = _actions(analyze(_paths(('ORDCUST', ['CUST'], ''),
+                                      ('ORDCUSTA', ['CUST', 'DATE'], "STATUS = 'A'"))))
+    assert actions['ORDCUSTA'] == ('Keep', 'Leaf', '')
+    assert actions['ORDCUST'] == ('Keep', 'Select/omit', '')
+
+
+def test_select_omit_index_does_not_serve_other_select_omit():
+    actions = _actions(analyze(_paths(('ORDSTSA', ['STATUS'], "STATUS = 'A'"),
+                                      ('ORDSTSD', ['STATUS'], "STATUS = 'D'"))))
+    assert actions['ORDSTSA'][0] == actions['ORDSTSD'][0] == 'Keep'
+
+
+def test_full_table_and_same_select_omit_indexes_still_serve():
+    actions = _actions(analyze(_paths(('ORDCUST', ['CUST'], "STATUS = 'A'"),
+                                      ('ORDCUSTD', ['CUST', 'DATE'], ''),
+                                      ('ORDSTSA', ['STATUS'], "STATUS = 'A'"),
+                                      ('ORDSTSA2', ['STATUS'], "STATUS = 'A'"))))
+    assert actions['ORDCUST'] == ('Drop', 'Prefix', 'ORDCUSTD')
+    assert actions['ORDSTSA2'] == ('Drop', 'Duplicate', 'ORDSTSA')
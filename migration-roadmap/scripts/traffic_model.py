@@ -0,0 +1,220 @@
+# scripts/traffic_model.py
+import glob
+import re
+
+from lazy_imports import lazy_import
+from window_scheduler import WEEKDAYS, expand_windows
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Interconnect traffic model for Task 0.6 (replaces the sum of per-app averages)
+# Every app's load is laid on a 1-minute grid over one week; the link has to carry the
+# coincident peak of the sum, not the sum of the peaks. A load is a weekly volume times a
+# time pattern (a grid vector summing to 1), so the whole portfolio is one matrix product:
+#   load (apps × minutes, Mbps) = volumes (apps × patterns, Mb/week) @ patterns / 60
+#
+# Patterns come from the change window calendar:
+# - online: the 5250 session profile in the calendar notes (sessions per time of day)
+# - nightly batch: the app's declared run in the job schedule export (JOB_SCHEDULE_GLOB), else
+#   the minutes where sessions drop below NIGHTLY_SESSION_SHARE of the peak - shared by every
+#   unscheduled app, so their coincident peak is the sum of their peaks (no diversity credit)
+# - weekly / monthly batch: the change windows in BATCH_WINDOWS
+# - integrations: their Frequency in the Task 2.1 catalog (real-time, every N min, daily at, ...)
+#
+# Volumes:
+# - File_IO_Daily_GB: BATCH_IO_SHARE in the app's batch window (by Usage_Frequency), the
+#   rest with the online profile; apps without sessions or CICS traffic are batch only
+# - spool written to the archive (Task 0.7 Daily_GB): same split as the app's file I/O
+# - integrations: Monthly_Volume_Calls × Avg_Payload_KB
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES = 7 * MINUTES_PER_DAY  # grid starts Monday 00:00
+
+PROTOCOL_OVERHEAD = 1.2  # 20% for protocol / encryption
+BATCH_IO_SHARE = 0.6  # share of an interactive app's file I/O done by batch (placeholder until I/O traces exist)
+BATCH_IO_SHARES = (0.2, 0.4, 0.6, 0.8)  # sensitivity range of the placeholder
+NIGHTLY_SESSION_SHARE = 0.25
+TRANSFER_MINUTES = 15  # a scheduled file transfer runs this long (or until its next run)
+DAYS_PER_MONTH = 365 / 12
+
+# optional; App_ID, Start_Time (HH:MM), Duration_Hours of each app's nightly batch run
+# (WRKJOBSCDE entries with run times from the job log)
+JOB_SCHEDULE_GLOB = '/mnt/user-data/uploads/job_schedule/*.csv'
+SCHEDULE_COLUMNS = ['App_ID', 'Start_Time', 'Duration_Hours']
+
+# Usage_Frequency → change window its batch runs in (daily: nightly window from the session profile)
+BATCH_WINDOWS = {'weekly': 'CW002', 'monthly': 'CW005'}
+
+# A Monday whose Sunday is the first of the month (Monthly_Patch falls in the week) and
+# without blackouts: the heaviest week of the calendar
+REFERENCE_WEEK = '2025-09-01'
+
+_SESSIONS = re.compile(r'^(\d\d):(\d\d)-(\d\d):(\d\d):\s*(\d+)\s+sessions', re.M)
+
+
+def load_session_profile(path):
+    """
+    Concurrent 5250 sessions per minute of the day from the calendar notes
+    ('06:00-08:00: 2200 sessions (...)'); ranges may wrap past midnight. None if absent.
+    """
+    with open(path) as f:
+        ranges = _SESSIONS.findall(f.read())
+    if not ranges:
+        return None
+    sessions = np.zeros(MINUTES_PER_DAY)
+    for h1, m1, h2, m2, count in ranges:
+        first, last = int(h1) * 60 + int(m1), int(h2) * 60 + int(m2)
+        minutes = np.arange(first, last if last > first else last + MINUTES_PER_DAY) % MINUTES_PER_DAY
+        sessions[minutes] = int(count)
+    return sessions
+
+
+def load_job_schedule(paths=None):
+    """Declared nightly batch runs (SCHEDULE_COLUMNS, last row per app wins); None without an export"""
+    paths = sorted(glob.glob(JOB_SCHEDULE_GLOB)) if paths is None else paths
+    if not paths:
+        return None
+    schedule = pd.concat([pd.read_csv(path, dtype={'App_ID': str, 'Start_Time': str}) for path in paths],
+                         ignore_index=True)
+    missing = [column for column in SCHEDULE_COLUMNS if column not in schedule.columns]
+    if missing:
+        raise ValueError(f"Job schedule is missing columns: {', '.join(missing)}")
+    if not schedule['Start_Time'].str.fullmatch(r'\d\d:\d\d').all():
+        raise ValueError("Job schedule Start_Time must be HH:MM")
+    return schedule.drop_duplicates('App_ID', keep='last')[SCHEDULE_COLUMNS].reset_index(drop=True)
+
+
+def _normalized(mask):
+    mask = np.asarray(mask, dtype=float)
+    return mask / mask.sum()
+
+
+def _runs(starts, minutes):
+    """Grid mask of runs of the given length starting at each minute of starts (wrapping)"""
+    mask = np.zeros(MINUTES, dtype=bool)
+    mask[(np.asarray(starts)[:, None] + np.arange(minutes)) % MINUTES] = True
+    return mask
+
+
+def window_pattern(windows, window_id):
+    """Pattern spread evenly over the reference-week instances of one change window"""
+    mask = np.zeros(MINUTES, dtype=bool)
+    start = pd.Timestamp(REFERENCE_WEEK)
+    for opens, closes, _, wid in expand_windows(windows[windows['Window_ID'] == window_id], start, 1):
+        first = int((pd.Timestamp(opens) - start).total_seconds() // 60)
+        last = int((pd.Timestamp(closes) - start).total_seconds() // 60)
+        mask[first:min(last, MINUTES)] = True
+    if not mask.any():
+        raise ValueError(f"Change window {window_id} has no instance in the reference week {REFERENCE_WEEK}")
+    return _normalized(mask)
+
+
+def frequency_pattern(frequency, online):
+    """
+    Pattern of a 2.1 catalog Frequency: 'Real-time (...)' / 'On-demand (...)' follow the
+    online profile; 'Batch (every N min)', 'Hourly', 'Daily|Nightly (HH:MM)' and
+    'Weekly (<Day>s HH:MM)' are runs of TRANSFER_MINUTES. Unknown entries raise - a
+    silently dropped feed would under-size the link.
+    """
+    if re.match(r'(Real-time|On-demand)\b', frequency):
+        return online
+    if match := re.match(r'Batch \(every (\d+) min\)', frequency):
+        every = int(match.group(1))
+        return _normalized(_runs(np.arange(0, MINUTES, every), min(every, TRANSFER_MINUTES)))
+    if frequency.startswith('Hourly'):
+        return _normalized(_runs(np.arange(0, MINUTES, 60), TRANSFER_MINUTES))
+    if match := re.match(r'(?:Daily|Nightly) \((\d\d):(\d\d)\)', frequency):
+        at = int(match.group(1)) * 60 + int(match.group(2))
+        return _normalized(_runs(np.arange(at, MINUTES, MINUTES_PER_DAY), TRANSFER_MINUTES))
+    if match := re.match(r'Weekly \((\w+?)s? (\d\d):(\d\d)\)', frequency):
+        at = WEEKDAYS[match.group(1)] * MINUTES_PER_DAY + int(match.group(2)) * 60 + int(match.group(3))
+        return _normalized(_runs([at], TRANSFER_MINUTES))
+    raise ValueError(f"Unrecognized integration frequency: {frequency!r}")
+
+
+def load_profiles(inventory, windows, sessions, integrations=None, spool=None, batch_io_share=BATCH_IO_SHARE,
+                  schedule=None):
+    """
+    Per-app load in Mbps on the weekly minute grid: (apps × MINUTES array, components),
+    components being the weekly volume (Mb) per app of Online_IO, Batch_IO, Spool and Integrations.
+
+    inventory: App_ID, Usage_Frequency, File_IO_Daily_GB, Screen_Sessions_Peak, CICS_TPS
+    windows: change window calendar (load_change_windows); sessions: load_session_profile
+    integrations: Task 2.1 catalog (App_ID, Frequency, Avg_Payload_KB, Monthly_Volume_Calls)
+    spool: Task 0.7 spool projection (App_ID, Daily_GB)
+    schedule: declared nightly batch runs (load_job_schedule). A daily app without one is
+    spread over the shared nightly minutes: together those batches peak at the sum of their
+    peaks (an upper bound)
+    """
+    daily = np.ones(MINUTES_PER_DAY) if sessions is None else sessions
+    online = _normalized(np.tile(daily, 7))
+    nightly = _normalized(np.tile(daily < NIGHTLY_SESSION_SHARE * daily.max(), 7))
+    patterns = {'online': online, 'daily': nightly}
+    for usage, window_id in BATCH_WINDOWS.items():
+        patterns[usage] = window_pattern(windows, window_id)
+
+    usage = inventory['Usage_Frequency'].where(inventory['Usage_Frequency'].isin(['daily', *BATCH_WINDOWS]), 'daily')
+    days = usage.map({'daily': 7, 'weekly': 7, 'monthly': DAYS_PER_MONTH}).to_numpy(dtype=float)
+    if schedule is not None:
+        runs = schedule.set_index('App_ID')
+        scheduled = (usage == 'daily') & inventory['App_ID'].isin(runs.index)
+        for app in inventory.loc[scheduled, 'App_ID'].unique():
+            hours, minutes = map(int, runs.at[app, 'Start_Time'].split(':'))
+            length = int(np.clip(round(runs.at[app, 'Duration_Hours'] * 60), 1, MINUTES_PER_DAY))
+            patterns[f"batch {app}"] = _normalized(_runs(np.arange(hours * 60 + minutes, MINUTES, MINUTES_PER_DAY), length))
+        usage = usage.mask(scheduled, 'batch ' + inventory['App_ID'])
+    interactive = (inventory['Screen_Sessions_Peak'] > 0) | (inventory['CICS_TPS'] > 0)
+    batch_share = np.where(interactive, batch_io_share, 1.0)
+    to_mb = 8 * 1024 * days * PROTOCOL_OVERHEAD
+    io_mb = inventory['File_IO_Daily_GB'].to_numpy(dtype=float) * to_mb
+    spool_mb = 0.0
+    if spool is not None:
+        spool_mb = inventory['App_ID'].map(spool.set_index('App_ID')['Daily_GB']).fillna(0).to_numpy(dtype=float) * to_mb
+
+    components = pd.DataFrame({
+        'App_ID': inventory['App_ID'].to_numpy(),
+        'Online_IO': io_mb * (1 - batch_share),
+        'Batch_IO': io_mb * batch_share,
+        'Spool': spool_mb,
+        'Integrations': 0.0,
+    })
+    names = list(patterns)
+    volumes = np.zeros((len(inventory), len(names)))
+    volumes[:, names.index('online')] = (io_mb + spool_mb) * (1 - batch_share)
+    np.add.at(volumes, (np.arange(len(inventory)), usage.map(names.index).to_numpy()), (io_mb + spool_mb) * batch_share)
+
+    if integrations is not None:
+        app = pd.Index(inventory['App_ID']).get_indexer(integrations['App_ID'])
+        codes, frequencies = pd.factorize(integrations['Frequency'])
+        offset = len(names)
+        names += list(frequencies)
+        patterns.update({offset + i: frequency_pattern(f, online) for i, f in enumerate(frequencies)})
+        volumes = np.hstack([volumes, np.zeros((len(inventory), len(frequencies)))])
+        mb = (integrations['Monthly_Volume_Calls'].to_numpy(dtype=float)
+              * integrations['Avg_Payload_KB'].to_numpy(dtype=float) * 8 / 1024
+              * 7 / DAYS_PER_MONTH * PROTOCOL_OVERHEAD)
+        known = app >= 0
+        np.add.at(volumes, (app[known], offset + codes[known]), mb[known])
+        components['Integrations'] = volumes[:, offset:].sum(axis=1)
+
+    grid = np.vstack(list(patterns.values()))
+    return volumes @ grid / 60, components
+
+
+def minute_label(minute):
+    """Grid minute → 'Sat 23:15'"""
+    day, minute = divmod(int(minute), MINUTES_PER_DAY)
+    return f"{list(WEEKDAYS)[day][:3]} {minute // 60:02d}:{minute % 60:02d}"
+
+
+def traffic_summary(load):
+    """Coincident peak, P95 and mean (Mbps) of the summed load, and the peak minute"""
+    total = load.sum(axis=0)
+    peak_minute = int(total.argmax())
+    return {
+        'Peak_Mbps': float(total[peak_minute]),
+        'P95_Mbps': float(np.percentile(total, 95)),
+        'Mean_Mbps': float(total.mean()),
+        'Peak_Minute': peak_minute,
+    }
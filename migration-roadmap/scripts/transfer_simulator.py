@@ -0,0 +1,274 @@
+# scripts/transfer_simulator.py
+import heapq
+import math
+import os
+import time
+from dataclasses import asdict, dataclass
+
+from growth_simulation import DEFAULT_GROWTH_RATE
+from lazy_imports import lazy_import
+from window_scheduler import build_segments, expand_windows
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Bulk-transfer and cutover simulator for Task 0.6 (does the data fit the change windows?)
+# Discrete-event fluid model: tables are copied largest first over `streams` parallel TCP
+# streams that share the link fairly, each capped at its own TCP throughput; wire bytes are
+# data / compression_ratio × (1 + encryption_overhead). Copies run only while a change
+# window is open (contiguous windows merge into one period) and resume in the next period
+# from where they stopped - a copy still running at a period's close is a window overrun.
+#
+# Daily deltas: once a table's copy starts, its changes (journal, Daily_Delta_GB) accrue and
+# are shipped as one catch-up job at the start of every period. After the last table lands,
+# the catch-up of the next period is the cutover: it has to finish inside that period.
+#
+# All active streams run at the same rate, so progress is tracked as one virtual clock
+# (work per stream) and a heap of finish marks: O(log streams) per event, events = tables
+# + periods. Periods are expanded once and shared by every scenario of a sweep.
+
+GB_MEGABITS = 8 * 1024
+
+# Interconnect option (0.6 recommendation) → usable capacity, Gbps
+LINK_OPTIONS = {
+    'Dedicated 10Gbps': 10.0,
+    'Partner 5Gbps': 5.0,
+    'Cloud VPN (multiple tunnels)': 3.0,  # 2 HA VPN tunnels, ~1.5 Gbps effective each with IPsec
+}
+
+HORIZON_WEEKS = 26
+SCENARIOS_PER_SHARD = 256
+
+
+def tcp_stream_mbps(window_kb, rtt_ms, loss=None, mss=1460):
+    """
+    Throughput of one TCP stream: window-limited (window / RTT), and with packet loss the
+    Mathis bound MSS / (RTT · √loss) · 1.22, whichever is lower
+    """
+    rtt = rtt_ms / 1000
+    mbps = window_kb * 1024 * 8 / rtt / 1e6
+    if loss:
+        mbps = min(mbps, mss * 8 / (rtt * math.sqrt(loss)) * 1.22 / 1e6)
+    return mbps
+
+
+@dataclass(frozen=True)
+class Scenario:
+    link_gbps: float
+    streams: int = 16
+    stream_mbps: float = tcp_stream_mbps(window_kb=2048, rtt_ms=20)  # 2 MB window, 20 ms to the region
+    compression_ratio: float = 2.0
+    encryption_overhead: float = 0.05  # TLS / IPsec framing
+    delta_factor: float = 1.0  # changed data per day as a multiple of net growth
+
+
+def transfer_tables(inventory, growth=None, catalog=None, spool=None):
+    """
+    Tables to copy: App_ID, Table, Size_GB, Daily_Delta_GB.
+
+    Physical files of the 1.1 schema catalog where present (plus '(other files)' for the
+    rest of the app's Data_Volume_GB), otherwise one '(all files)' table per app. Daily
+    deltas are the app's Annual_Growth_Rate (0.3 growth_projection, else
+    DEFAULT_GROWTH_RATE) / 365 of the table's size. With the 0.7 spool projection, each
+    app's retained spool is a '(spool archive)' table whose delta is the daily spool.
+    """
+    apps = inventory[['App_ID', 'Data_Volume_GB']]
+    parts = []
+    if catalog is not None:
+        files = catalog.loc[catalog['File_Type'] == 'PF', ['App_ID', 'File_Name', 'Size_GB']]
+        parts.append(files.rename(columns={'File_Name': 'Table'}))
+        listed = files.groupby('App_ID')['Size_GB'].sum()
+        other = apps.assign(Size_GB=apps['Data_Volume_GB'] - apps['App_ID'].map(listed).fillna(0))
+        other['Table'] = np.where(apps['App_ID'].isin(listed.index), '(other files)', '(all files)')
+        parts.append(other[['App_ID', 'Table', 'Size_GB']])
+    else:
+        parts.append(apps.assign(Table='(all files)').rename(columns={'Data_Volume_GB': 'Size_GB'}))
+    tables = pd.concat(parts, ignore_index=True)
+    tables = tables[tables['Size_GB'] > 0].reset_index(drop=True)
+    rate = DEFAULT_GROWTH_RATE
+    if growth is not None:
+        rate = tables['App_ID'].map(growth.set_index('App_ID')['Annual_Growth_Rate']).fillna(DEFAULT_GROWTH_RATE)
+    tables['Daily_Delta_GB'] = tables['Size_GB'] * rate / 365
+    if spool is not None:
+        archives = pd.DataFrame({
+            'App_ID': spool['App_ID'], 'Table': '(spool archive)',
+            'Size_GB': spool['Retained_GB'], 'Daily_Delta_GB': spool['Daily_GB'],
+        })
+        tables = pd.concat([tables, archives[archives['Size_GB'] > 0]], ignore_index=True)
+    return tables
+
+
+def transfer_periods(windows, start, weeks=HORIZON_WEEKS):
+    """
+    Open periods of the change window calendar from start: (opens, closes) arrays in hours
+    since start, and the Window_IDs of each period. Overlapping / back-to-back windows merge.
+    """
+    start = pd.Timestamp(start)
+    opens, closes, ids = [], [], []
+    for seg_start, seg_end, _, window_ids in build_segments(expand_windows(windows, start, weeks)):
+        first = (pd.Timestamp(seg_start) - start).total_seconds() / 3600
+        last = (pd.Timestamp(seg_end) - start).total_seconds() / 3600
+        if opens and first <= closes[-1]:
+            closes[-1] = max(closes[-1], last)
+            ids[-1] = tuple(sorted(set(ids[-1]) | set(window_ids)))
+        else:
+            opens.append(first)
+            closes.append(last)
+            ids.append(window_ids)
+    return np.array(opens), np.array(closes), ids
+
+
+def simulate(sizes_gb, deltas_gb, opens, closes, scenario, detail=False):
+    """
+    One scenario over tables (sizes_gb, deltas_gb, copied in the given order) and periods.
+    Returns a summary dict: Finish_Hours (last table landed, NaN if not within the
+    periods), Periods_Used, Overruns (copies interrupted by a window close),
+    Catchup_Hours / Cutover_Fits (delta catch-up in the period after the last table).
+    With detail, also Completed_Hours per table and the overruns as (table, period, GB left).
+    """
+    link = scenario.link_gbps * 1000
+    # Mbps on the wire → data megabits per hour
+    to_data = 3600 * scenario.compression_ratio / (1 + scenario.encryption_overhead)
+    tables = len(sizes_gb)
+    completed = [math.nan] * tables
+    log = []
+    active = []  # (finish mark on the virtual clock, table; -1 = delta catch-up)
+    clock = 0.0  # megabits sent per active stream since the start
+    next_table = 0
+    accruing = 0.0  # delta megabits per hour of the tables started so far
+    accrued_at = 0.0
+    backlog = 0.0
+    overruns = 0
+    finish = catchup = math.nan
+    periods_used = 0
+
+    for period, (t, close) in enumerate(zip(opens, closes)):
+        backlog += accruing * (t - accrued_at)
+        accrued_at = t
+        if not math.isnan(finish):
+            catchup = backlog / (min(scenario.streams * scenario.stream_mbps, link) * to_data)
+            break
+        periods_used = period + 1
+        if backlog > 0:
+            heapq.heappush(active, (clock + backlog, -1))
+            backlog = 0.0
+        while True:
+            while len(active) < scenario.streams and next_table < tables:
+                delta = deltas_gb[next_table] * GB_MEGABITS * scenario.delta_factor / 24
+                size = sizes_gb[next_table] * GB_MEGABITS + delta * t
+                heapq.heappush(active, (clock + size, next_table))
+                backlog += accruing * (t - accrued_at)
+                accrued_at = t
+                accruing += delta
+                next_table += 1
+            if not active:
+                break
+            rate = min(scenario.stream_mbps, link / len(active)) * to_data
+            mark, table = active[0]
+            step = (mark - clock) / rate
+            if t + step > close:
+                clock += rate * (close - t)
+                overruns += sum(1 for _, table in active if table >= 0)
+                if detail:
+                    log.extend((table, period, (mark - clock) / GB_MEGABITS) for mark, table in active if table >= 0)
+                break
+            t += step
+            clock = mark
+            heapq.heappop(active)
+            if table >= 0:
+                completed[table] = t
+        if next_table == tables and not any(table >= 0 for _, table in active):
+            finish = max(completed) if tables else 0.0
+            backlog += sum(mark - clock for mark, _ in active)  # catch-up cut off by the close
+
+    summary = {
+        'Finish_Hours': finish,
+        'Periods_Used': periods_used,
+        'Overruns': overruns,
+        'Catchup_Hours': catchup,
+        'Cutover_Fits': bool(catchup <= closes[period] - opens[period]) if not math.isnan(catchup) else False,
+    }
+    if detail:
+        summary['Completed_Hours'] = completed
+        summary['Overrun_Log'] = log
+    return summary
+
+
+def transfer_plan(tables, periods, scenario, start):
+    """
+    Per-table result of one scenario: tables (largest first) with Started_Period,
+    Completed (timestamp), Window_Overruns and GB_Left_At_Close (at its first overrun),
+    plus the simulate summary.
+    """
+    opens, closes, _ = periods
+    order = tables.sort_values('Size_GB', ascending=False, kind='stable').reset_index(drop=True)
+    result = simulate(order['Size_GB'].tolist(), order['Daily_Delta_GB'].tolist(), opens, closes, scenario, detail=True)
+    hours = pd.Series(result.pop('Completed_Hours'), dtype=float)
+    order['Completed'] = (pd.Timestamp(start) + pd.to_timedelta(hours, unit='h')).dt.round('min')
+    log = pd.DataFrame(result.pop('Overrun_Log'), columns=['Table', 'Period', 'GB_Left'])
+    order['Window_Overruns'] = log['Table'].value_counts().reindex(order.index, fill_value=0).to_numpy()
+    order['GB_Left_At_Close'] = log.groupby('Table')['GB_Left'].first().reindex(order.index).round(1).to_numpy()
+    return order, result
+
+
+def _run_shard(tables, periods, scenarios):
+    sizes, deltas, opens, closes = tables[0], tables[1], periods[0], periods[1]
+    return [simulate(sizes, deltas, opens, closes, scenario) for scenario in scenarios]
+
+
+def run_scenarios(tables, periods, scenarios, workers=1):
+    """
+    Summary row per scenario (Scenario fields + simulate summary). Scenarios are split into
+    shards of SCENARIOS_PER_SHARD across a process pool when workers > 1.
+    """
+    order = tables.sort_values('Size_GB', ascending=False, kind='stable')
+    data = (order['Size_GB'].tolist(), order['Daily_Delta_GB'].tolist())
+    opens, closes, _ = periods
+    bounds = (opens.tolist(), closes.tolist())
+    scenarios = list(scenarios)
+    if workers == 1 or len(scenarios) <= SCENARIOS_PER_SHARD:
+        results = _run_shard(data, bounds, scenarios)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        shards = [scenarios[i:i + SCENARIOS_PER_SHARD] for i in range(0, len(scenarios), SCENARIOS_PER_SHARD)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = [row for shard in pool.map(_run_shard, [data] * len(shards), [bounds] * len(shards), shards)
+                       for row in shard]
+    return pd.DataFrame([{**asdict(scenario), **result} for scenario, result in zip(scenarios, results)])
+
+
+def scenario_grid(**axes):
+    """Scenario per combination of the given field values, e.g. link_gbps=[5, 10], streams=[8, 16]"""
+    names = list(axes)
+    grid = np.array(np.meshgrid(*axes.values(), indexing='ij'), dtype=object).reshape(len(names), -1).T
+    return [Scenario(**dict(zip(names, values))) for values in grid]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from inventory_snapshot import load_inventory
+    from portfolio_scoring import ASSESSMENT_DATE
+    from window_scheduler import load_change_windows
+
+    parser = argparse.ArgumentParser(description='Benchmark the bulk-transfer simulator on a what-if sweep')
+    parser.add_argument('--calendar', default='/mnt/user-data/uploads/AS400_Change_Window_Calendar.csv')
+    parser.add_argument('--scenarios', type=int, default=5000, help='approximate number of scenarios')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    tables = transfer_tables(load_inventory())
+    periods = transfer_periods(load_change_windows(args.calendar), ASSESSMENT_DATE)
+    side = max(2, round(args.scenarios ** 0.25))
+    scenarios = scenario_grid(
+        link_gbps=np.linspace(1, 20, side), streams=np.unique(np.geomspace(1, 64, side).round().astype(int)),
+        compression_ratio=np.linspace(1, 4, side), delta_factor=np.linspace(1, 10, side),
+    )
+    started = time.perf_counter()
+    results = run_scenarios(tables, periods, scenarios, workers=args.workers)
+    seconds = time.perf_counter() - started
+    print(f"[Scenarios]: {len(results):,} in {seconds:.2f}s ({len(results) / seconds * 60:,.0f} per minute, "
+          f"{args.workers} worker(s), {len(tables)} tables, {len(periods[0])} periods)")
+    print(f"[Bulk copy finished]: {results['Finish_Hours'].notna().mean():.0%}  "
+          f"[Cutover fits]: {results['Cutover_Fits'].mean():.0%}")
@@ -0,0 +1,52 @@
+# scripts/wave_scheduler.py
+import heapq
+
+# Shared wave scheduler for Tasks 0.2 / 2.3
+# Kahn's algorithm with in-degree counters: each node and edge is touched once, so all
+# waves come out of a single O(V + E) pass (previously O(V² · waves), rebuilding
+# set(G.nodes()) - remaining and re-reading predecessors on every pass)
+#
+# Cycle breaking keeps the existing FORCED rule: when no node is ready, the remaining
+# node with the fewest inbound dependencies is migrated alone (requires feature toggle).
+# Ties go to the smallest node name, so the plan is reproducible run to run.
+
+
+def assign_waves(G):
+    """
+    Groups nodes into waves; a node joins a wave once all its predecessors have migrated.
+
+    Returns (waves, forced):
+    - waves: [(wave_num, [node, ...]), ...] in migration order, nodes sorted within a wave
+    - forced: [(wave_num, node), ...] nodes pulled forward to break a cycle
+    """
+    pending = {node: G.in_degree(node) for node in G}  # unmigrated predecessors per node
+    ready = sorted(node for node, count in pending.items() if count == 0)
+
+    # FORCED candidates ordered by total inbound deps (same measure as the original rule)
+    fewest_inbound = [(count, node) for node, count in pending.items()]
+    heapq.heapify(fewest_inbound)
+
+    migrated = set()
+    waves = []
+    forced = []
+
+    while len(migrated) < len(pending):
+        if not ready:
+            while fewest_inbound[0][1] in migrated:
+                heapq.heappop(fewest_inbound)
+            node = heapq.heappop(fewest_inbound)[1]
+            forced.append((len(waves) + 1, node))
+            ready = [node]
+
+        waves.append((len(waves) + 1, ready))
+        migrated.update(ready)
+
+        unlocked = []
+        for node in ready:
+            for succ in G.successors(node):
+                pending[succ] -= 1
+                if pending[succ] == 0 and succ not in migrated:
+                    unlocked.append(succ)
+        ready = sorted(unlocked)
+
+    return waves, forced
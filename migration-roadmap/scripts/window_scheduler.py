@@ -0,0 +1,236 @@
+# scripts/window_scheduler.py
+import heapq
+import io
+import re
+import calendar
+from datetime import date, datetime, timedelta
+
+from dependency_graph import CondensedGraph
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# Resource-constrained migration scheduler for Task 2.3
+# List scheduling (highest remaining critical path first) over the concrete change
+# windows in AS400_Change_Window_Calendar.csv: blackouts removed, risk levels enforced,
+# at most max_concurrent migrations in flight. Circular dependency groups are
+# scheduled as one work item (SCC super-node, see dependency_graph.py).
+
+RISK_LEVELS = ['Low', 'Medium', 'High', 'Critical']
+
+# Effort model (window hours needed to cut an app over, incl. validation + rollback rehearsal)
+# Cutover_Hours = 4 + (SLOC / 10000) × (1 + TDI / 100)
+BASE_CUTOVER_HOURS = 4
+
+WEEKDAYS = {name: i for i, name in enumerate(calendar.day_name)}
+MONTHS = {name: i for i, name in enumerate(calendar.month_abbr) if name}
+MONTHS.update({name: i for i, name in enumerate(calendar.month_name) if name})
+
+
+def load_change_windows(path):
+    """Reads the change window calendar (the export carries trailing notes after the table)"""
+    lines = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip() or line.startswith('```'):
+                break
+            lines.append(line)
+    return pd.read_csv(io.StringIO(''.join(lines)))
+
+
+def _thanksgiving(year):
+    # 4th Thursday of November
+    first = date(year, 11, 1)
+    return first + timedelta(days=(3 - first.weekday()) % 7 + 21)
+
+
+def blackout_ranges(spec, year):
+    """
+    Blackout_Periods → [(first_day, last_day), ...] for one calendar year.
+    Supports 'Never', 'December', 'Dec 15-31', 'Jul 4', 'Thanksgiving week',
+    'Black Friday weekend'. Unknown entries raise - a silently dropped blackout
+    would put a cutover on Black Friday.
+    """
+    ranges = []
+    for part in str(spec).split(','):
+        part = part.strip()
+        if part in ('', 'Never'):
+            continue
+        if part in MONTHS:
+            month = MONTHS[part]
+            ranges.append((date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])))
+        elif part == 'Thanksgiving week':
+            thursday = _thanksgiving(year)
+            ranges.append((thursday - timedelta(days=3), thursday + timedelta(days=3)))
+        elif part == 'Black Friday weekend':
+            friday = _thanksgiving(year) + timedelta(days=1)
+            ranges.append((friday, friday + timedelta(days=2)))
+        elif re.fullmatch(r'[A-Za-z]{3} \d{1,2}(-\d{1,2})?', part):
+            month, days = part.split(' ')
+            first, _, last = days.partition('-')
+            ranges.append((date(year, MONTHS[month], int(first)), date(year, MONTHS[month], int(last or first))))
+        else:
+            raise ValueError(f"Unrecognized blackout period: {part!r}")
+    return ranges
+
+
+def _window_days(day_spec, day):
+    """True if a window with Day_of_Week=day_spec opens on this date"""
+    if day_spec == 'Mon-Fri':
+        return day.weekday() < 5
+    if day_spec.startswith('First '):
+        return day.weekday() == WEEKDAYS[day_spec[len('First '):]] and day.day <= 7
+    return day.weekday() == WEEKDAYS[day_spec]
+
+
+def expand_windows(windows, start, weeks):
+    """
+    Concrete window instances [(open, close, risk_level_idx, Window_ID), ...] from start
+    for the given number of weeks. 'Any' windows (emergency hotfix) have no fixed slot and
+    are not plannable; instances opening on a blackout day are dropped.
+    """
+    instances = []
+    start = pd.Timestamp(start).to_pydatetime()
+    for _, w in windows.iterrows():
+        if w['Day_of_Week'] == 'Any' or w['Start_Time'] == 'Any':
+            continue
+        level = RISK_LEVELS.index(w['Allowed_Risk_Level'])
+        hh, mm = map(int, w['Start_Time'].split(':'))
+        blackouts = {}
+        for offset in range(weeks * 7):
+            day = start.date() + timedelta(days=offset)
+            if not _window_days(w['Day_of_Week'], day):
+                continue
+            if day.year not in blackouts:
+                blackouts[day.year] = blackout_ranges(w['Blackout_Periods'], day.year)
+            if any(first <= day <= last for first, last in blackouts[day.year]):
+                continue
+            opens = datetime(day.year, day.month, day.day, hh, mm)
+            if opens >= start:
+                instances.append((opens, opens + timedelta(hours=float(w['Duration_Hours'])), level, w['Window_ID']))
+    return sorted(instances)
+
+
+def build_segments(instances):
+    """
+    Sweeps overlapping window instances into disjoint segments
+    [(open, close, max_risk_level_idx, (Window_ID, ...)), ...] so the concurrency cap
+    applies to wall-clock time, not per window (CW005 overlaps CW002/CW003).
+    """
+    events = sorted({t for opens, closes, _, _ in instances for t in (opens, closes)})
+    segments = []
+    open_windows = []
+    i = 0
+    for seg_start, seg_end in zip(events, events[1:]):
+        while i < len(instances) and instances[i][0] <= seg_start:
+            open_windows.append(instances[i])
+            i += 1
+        open_windows = [w for w in open_windows if w[1] > seg_start]
+        if open_windows:
+            segments.append((seg_start, seg_end,
+                             max(w[2] for w in open_windows),
+                             tuple(sorted({w[3] for w in open_windows}))))
+    return segments
+
+
+def estimate_effort(inventory):
+    """
+    Per-app Cutover_Hours and Risk_Level from SLOC, Technical_Debt_Index (Task 0.1) and
+    Critical_Business_Function:
+    - High: critical + TDI > 20 (REFACTOR class)
+    - Medium: critical
+    - Low: everything else
+    """
+    critical = inventory['Critical_Business_Function'] == 'Y'
+    tdi = inventory['Technical_Debt_Index']
+    return pd.DataFrame({
+        'App_ID': inventory['App_ID'],
+        'Cutover_Hours': BASE_CUTOVER_HOURS + (inventory['SLOC'] / 10000) * (1 + tdi / 100),
+        'Risk_Level': (critical & (tdi > 20)).map({True: 'High', False: 'Medium'}).where(critical, 'Low'),
+    }).set_index('App_ID')
+
+
+def schedule_migrations(G, effort, windows, start, max_concurrent=5, horizon_weeks=260):
+    """
+    Time-phased plan for dependency graph G (edge u → v: u migrates before v).
+
+    effort: DataFrame indexed by app with Cutover_Hours, Risk_Level (estimate_effort)
+    windows: change window calendar (load_change_windows)
+
+    A work item runs only in segments whose allowed risk level covers it, holds one of
+    max_concurrent slots until done (possibly across several windows), and starts no
+    earlier than the segment after its last predecessor finishes. Ready items are picked
+    by bottom level (remaining critical-path hours). Returns one row per work item;
+    items that do not fit in horizon_weeks have Start/Finish = NaT. Windows lists only the
+    windows the item's risk level may use. Every app in G needs an effort row (ValueError).
+    """
+    missing = [app for app in G if app not in effort.index]
+    if missing:
+        raise ValueError(f"No effort estimate for {len(missing)} apps: {', '.join(map(str, sorted(missing)))}")
+    cg = CondensedGraph(G)
+    dag = cg.dag
+    window_level = dict(zip(windows['Window_ID'], windows['Allowed_Risk_Level'].map(RISK_LEVELS.index)))
+    app_hours = effort['Cutover_Hours'].to_dict()
+    app_level = effort['Risk_Level'].map(RISK_LEVELS.index).to_dict()
+    hours = {scc: sum(app_hours[app] for app in cg.members(scc)) for scc in dag}
+    level = {scc: max(app_level[app] for app in cg.members(scc)) for scc in dag}
+
+    # Bottom level: longest remaining chain of cutover hours, computed in reverse topological order
+    bottom = {}
+    for scc in reversed(cg.topological_order()):
+        bottom[scc] = hours[scc] + max((bottom[s] for s in dag.successors(scc)), default=0)
+
+    pending = {scc: dag.in_degree(scc) for scc in dag}
+    ready = [[] for _ in RISK_LEVELS]  # one heap per risk level: O(levels · log n) per pick
+
+    def release(scc):
+        heapq.heappush(ready[level[scc]], (-bottom[scc], cg.label(scc), scc))
+
+    for scc in dag:
+        if pending[scc] == 0:
+            release(scc)
+
+    active = {}  # scc -> remaining hours
+    started, finished, used = {}, {}, {scc: set() for scc in dag}
+
+    for seg_start, seg_end, seg_level, window_ids in build_segments(expand_windows(windows, start, horizon_weeks)):
+        if len(finished) == len(dag):
+            break
+
+        while len(active) < max_concurrent:
+            heads = [ready[lvl][0] for lvl in range(seg_level + 1) if ready[lvl]]
+            if not heads:
+                break
+            scc = heapq.heappop(ready[level[min(heads)[2]]])[2]
+            active[scc] = hours[scc]
+            started[scc] = seg_start
+
+        seg_hours = (seg_end - seg_start).total_seconds() / 3600
+        done = []
+        for scc in list(active):
+            if level[scc] > seg_level:
+                continue
+            work = min(active[scc], seg_hours)
+            active[scc] -= work
+            used[scc].update(w for w in window_ids if window_level[w] >= level[scc])
+            if active[scc] <= 1e-9:
+                finished[scc] = seg_start + timedelta(hours=work)
+                del active[scc]
+                done.append(scc)
+
+        # Released after the segment: dependents start in a later segment
+        for scc in done:
+            for succ in dag.successors(scc):
+                pending[succ] -= 1
+                if pending[succ] == 0:
+                    release(succ)
+
+    plan = pd.DataFrame({
+        'Work_Item': [cg.label(scc) for scc in dag],
+        'Risk_Level': [RISK_LEVELS[level[scc]] for scc in dag],
+        'Cutover_Hours': [round(hours[scc], 1) for scc in dag],
+        'Start': pd.to_datetime([started.get(scc) for scc in dag]),
+        'Finish': pd.to_datetime([finished.get(scc) for scc in dag]).round('min'),
+        'Windows': [', '.join(sorted(used[scc])) for scc in dag],
+    })
+    return plan.sort_values(['Start', 'Work_Item'], na_position='last').reset_index(drop=True)